@@ -0,0 +1,222 @@
+# akilli_sikistirma/analysis_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Analiz önbelleğinin varsayılan SQLite veritabanı.
+DEFAULT_ANALYSIS_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "akilli_sikistirma", "analysis.sqlite3")
+
+# Diskte tutulacak en fazla kayıt; aşılınca en uzun süredir kullanılmayanlar silinir.
+DEFAULT_MAX_ENTRIES = 100000
+
+# Süreç içi bellek katmanındaki en fazla kayıt.
+DEFAULT_MEMORY_ENTRIES = 4096
+
+# İçerik özeti kipinde dosya bu boyutta parçalarla okunur.
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    analysis TEXT NOT NULL,
+    decisions TEXT NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+def _json_safe(analysis_results: Dict[str, Any]) -> Dict[str, Any]:
+    """Analiz sonuçlarını JSON'a yazılabilir hale getirir (histogram dizi/numpy dizisi olabilir)."""
+    results = dict(analysis_results)
+    if results.get('byte_histogram') is not None:
+        results['byte_histogram'] = [int(count) for count in results['byte_histogram']]
+    return results
+
+class AnalysisCache:
+    """
+    Dosya analiz sonuçlarını ve seçicinin kararlarını diskte (SQLite) saklar;
+    değişmemiş dosyalar yeniden okunup analiz edilmez.
+
+    Anahtar varsayılan olarak dosyanın kimliğidir: aygıt, inode, boyut, mtime_ns ve yol.
+    Dosyaya yazılması bunlardan en az birini değiştirir. content_hash True ise anahtar
+    dosya içeriğinin BLAKE2 özeti ve uzantısıdır; kopyalanan veya yalnızca zaman damgası
+    değişen dosyalar da eşleşir, fakat özet için dosyanın tamamı okunur.
+
+    Seçici kararları bağlama göre (strateji, hedef, profil, sözlük) ayrı tutulur.
+    En sık kullanılan kayıtlar ayrıca süreç içi bir LRU bellek katmanında tutulur.
+    Disk katmanı max_entries kayıtla sınırlıdır; en uzun süredir kullanılmayanlar silinir.
+    """
+    def __init__(self, path: str = DEFAULT_ANALYSIS_CACHE, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 content_hash: bool = False, memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.content_hash = content_hash
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._connection = None
+        self._entry_count = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            # Önbellek kaybı yalnızca yeniden analiz demektir; her yazmada fsync gerekmez.
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(_SCHEMA)
+            # Kayıt sayısı bir kez okunur, sonra eklemelerle yaklaşık olarak izlenir.
+            self._entry_count = self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return self._connection
+
+    def file_key(self, filepath: str) -> str:
+        """Dosyanın önbellek anahtarını üretir."""
+        if self.content_hash:
+            digest = hashlib.blake2b(digest_size=20)
+            with open(filepath, 'rb') as f:
+                while True:
+                    chunk = f.read(_HASH_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+            return f"hash:{digest.hexdigest()}:{os.path.splitext(filepath)[1].lower()}"
+        stat = os.stat(filepath)
+        return f"stat:{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}:{os.path.realpath(filepath)}"
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, filepath: str, key: str = None) -> Optional[Dict[str, Any]]:
+        """
+        Dosyanın önbellekteki kaydını döndürür; yoksa None.
+
+        Returns:
+            dict or None: 'analysis' (analiz sonuçları) ve 'decisions' (bağlam -> karar) anahtarları.
+        """
+        key = key or self.file_key(filepath)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return entry
+
+            connection = self._connect()
+            row = connection.execute("SELECT analysis, decisions FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with connection:
+                connection.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+            entry = {'analysis': json.loads(row[0]), 'decisions': json.loads(row[1])}
+            self._remember(key, entry)
+            self.hits += 1
+            return entry
+
+    def put(self, filepath: str, analysis_results: Dict[str, Any], context: str = None,
+            decision: Dict[str, Any] = None, key: str = None):
+        """
+        Dosyanın analiz sonuçlarını ve (varsa) verilen bağlamdaki seçici kararını kaydeder.
+        Aynı dosyanın diğer bağlamlardaki kararları korunur.
+        """
+        key = key or self.file_key(filepath)
+        with self._lock:
+            entry = self._memory.get(key)
+            decisions = dict(entry['decisions']) if entry is not None else {}
+            exists = entry is not None
+            if entry is None:
+                row = self._connect().execute("SELECT decisions FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    decisions = json.loads(row[0])
+                    exists = True
+            if context is not None and decision is not None:
+                decisions[context] = decision
+
+            entry = {'analysis': _json_safe(analysis_results), 'decisions': decisions}
+            connection = self._connect()
+            with connection:
+                connection.execute("INSERT OR REPLACE INTO entries (key, analysis, decisions, last_used) VALUES (?, ?, ?, ?)",
+                                   (key, json.dumps(entry['analysis']), json.dumps(decisions), time.time()))
+            self._remember(key, entry)
+
+            if not exists:
+                self._entry_count += 1
+                if self._entry_count > self.max_entries:
+                    self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection):
+        # Diğer süreçler de yazmış olabileceğinden gerçek sayı okunur. Sınır aşıldığında
+        # her eklemede tek kayıt silmemek için %10 pay bırakılır.
+        count = connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if count > self.max_entries:
+            with connection:
+                connection.execute("DELETE FROM entries WHERE key IN "
+                                   "(SELECT key FROM entries ORDER BY last_used LIMIT ?)",
+                                   (count - int(self.max_entries * 0.9),))
+            count = int(self.max_entries * 0.9)
+        self._entry_count = count
+
+    def stats(self) -> Dict[str, Any]:
+        """İsabet/ıska sayaçlarını döndürür."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'memory_hits': self.memory_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+if __name__ == "__main__":
+    import tempfile
+    from .data_analyzer import analyze_file_properties
+
+    print("--- analysis_cache.py Modül Testleri ---")
+
+    work_dir = tempfile.mkdtemp()
+    cache = AnalysisCache(os.path.join(work_dir, "cache.sqlite3"), max_entries=150, memory_entries=16)
+    paths = []
+    for i in range(200):
+        path = os.path.join(work_dir, f"dosya_{i}.txt")
+        with open(path, 'wb') as f:
+            f.write(f"deneme satiri {i}\n".encode() * 5000)
+        paths.append(path)
+
+    start = time.perf_counter()
+    for path in paths:
+        if cache.get(path) is None:
+            cache.put(path, analyze_file_properties(path), "rules", {'codec': 'zstandard', 'params': {'level': 3}})
+    cold = time.perf_counter() - start
+
+    cache = AnalysisCache(cache.path, max_entries=150, memory_entries=16)
+    start = time.perf_counter()
+    for path in paths:
+        cache.get(path)
+    warm = time.perf_counter() - start
+    print(f"  Soğuk: {cold * 1000:.1f} ms, sıcak: {warm * 1000:.1f} ms, sayaçlar: {cache.stats()}")
+
+    with open(paths[0], 'ab') as f:
+        f.write(b"degisiklik")
+    print(f"  Değişen dosya ıska: {'BAŞARILI' if cache.get(paths[0]) is None else 'HATA'}")
+    print(f"  LRU sınırı: {cache._connect().execute('SELECT COUNT(*) FROM entries').fetchone()[0]} kayıt (sınır {cache.max_entries})")
+
+    for path in paths:
+        os.remove(path)
+    cache.close()
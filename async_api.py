@@ -0,0 +1,328 @@
+# akilli_sikistirma/async_api.py
+
+import asyncio
+import contextlib
+import os
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterable, AsyncIterator, Dict, Any, Optional
+
+from .block_container import DEFAULT_BLOCK_SIZE
+from .compressor_selector import CompressorSelector
+from .compressors import Compressor, DEFAULT_CHUNK_SIZE
+from .dictionary_store import DictionaryStore
+from .file_format import CONTAINER_STREAM, original_filename, read_header
+from .main import compress_steps, create_selector, decompress_file as _decompress_file_sync
+from .profiles import DEFAULT_PROFILE
+
+class _CompressJob:
+    """
+    Bir dosyanın sıkıştırma durumu: main.compress_steps üreteci. Adımlar yürütücüde sırayla
+    (asla eşzamanlı değil) çalışır; çıktı compress_file ile aynıdır (filtre, bellek sınırı, blok kipi).
+    """
+    def __init__(self, filepath: str, output_dir: str, options: Dict[str, Any], chunk_size: int):
+        # Parça parça adım bırakmak için basit G/Ç motoru kullanılır; seçici her çağrıda yeniden oluşturulur.
+        self.steps = compress_steps(filepath, output_dir, io_engine='simple', chunk_size=chunk_size, **options)
+        self.output_path = None
+
+    def step(self) -> bool:
+        """Bir adımı (analiz ve başlık ya da bir parça) yürütür. Dosya bittiyse True döner."""
+        try:
+            next(self.steps)
+            return False
+        except StopIteration as stop:
+            self.output_path = stop.value
+            return True
+
+    def abort(self):
+        """Üreteci kapatır; dosyalar kapatılır ve yarım kalan çıktı silinir."""
+        self.steps.close()
+
+class _DecompressJob:
+    """Akış kapsayıcılı bir .comp dosyasının açma durumu."""
+    def __init__(self, filepath: str, output_dir: str, header: Dict[str, Any], selector: CompressorSelector,
+                 chunk_size: int):
+        self.chunk_size = chunk_size
+        self.header = header
+        compressor = selector.compressor_from_header(header['codec'], header['params'])
+        self.stream = compressor._new_bounded_decompressor(chunk_size)
+        self.src = open(filepath, 'rb')
+        self.src.seek(header['header_size'])
+        self.output_path = os.path.join(output_dir, original_filename(filepath, header['codec']))
+        self.dst = open(self.output_path, 'wb')
+        self.bytes_out = 0
+        self.crc = 0
+
+    def step(self) -> bool:
+        """Bir parçayı açıp yazar. Dosya bittiyse boyutu ve sağlamayı doğrulayıp True döner."""
+        chunk = self.src.read(self.chunk_size)
+        if chunk:
+            for out in self.stream.decompress(chunk):
+                self.dst.write(out)
+                self.bytes_out += len(out)
+                self.crc = zlib.crc32(out, self.crc)
+            return False
+        self.close()
+        if not self.stream.eof:
+            raise ValueError(f"{self.header['codec']}: sıkıştırılmış veri beklenmedik şekilde sona erdi.")
+        if self.bytes_out != self.header['original_size']:
+            raise ValueError(f"Boyut uyuşmazlığı: beklenen {self.header['original_size']}B, açılan {self.bytes_out}B")
+        if self.crc != self.header['checksum']:
+            raise ValueError("Sağlama (CRC32) uyuşmazlığı: dosya bozulmuş olabilir.")
+        return True
+
+    def close(self):
+        self.src.close()
+        self.dst.close()
+
+    def abort(self):
+        self.close()
+        with contextlib.suppress(OSError):
+            os.remove(self.output_path)
+
+class AsyncCompressor:
+    """
+    asyncio hizmetlerine gömmek için sıkıştırma API'si. Dosya G/Ç'si ve sıkıştırma,
+    olay döngüsünü bloke etmemesi için sınırlı bir iş parçacığı yürütücüsünde çalışır.
+
+    - Geri basınç: aynı anda en fazla max_concurrency işlem (dosya veya akış) çalışır;
+      fazlası bir semafor üzerinde bekler. Yürütücüde de o kadar iş parçacığı vardır.
+    - Adil paylaşım: her dosya parça parça (chunk_size) işlenir ve her parçadan sonra
+      iş parçacığını bırakır; büyük dosyalar küçük isteklerin gecikmesini artırmaz.
+    - İptal: görev iptal edildiğinde işlenmekte olan parça bitirilir, dosyalar kapatılır,
+      yarım kalan çıktı silinir ve CancelledError yeniden yükseltilir.
+
+    Hatalar (CLI işlevlerinden farklı olarak) istisna olarak yükseltilir. Dosyalar
+    main.compress_steps ile sıkıştırılır; filtre (filter_mode), bellek sınırı (memory_limit) ve
+    blok kipi (block_mode, block_size) compress_file'daki gibi uygulanır. Blok kipinde bloklar işin
+    kendi iş parçacığında sırayla sıkıştırılır ve sıkıştırma tek adımdır. Açarken akış kapsayıcısı
+    dışındaki veya filtreli dosyalar yürütücüde tek seferde açılır (bu dosyalarda iptal, işlem
+    bitince etkili olur). Seçiciler değiştirilebilir durum tuttuğu için her çağrıda yeniden oluşturulur.
+    """
+    def __init__(self, max_concurrency: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 strategy: str = 'rules', objective: str = 'ratio', dictionary_store: DictionaryStore = None,
+                 profile: str = DEFAULT_PROFILE, codec_overrides: dict = None, learning_db: str = None,
+                 filter_mode: str = 'auto', memory_limit: int = None, block_mode: bool = False,
+                 block_size: int = DEFAULT_BLOCK_SIZE):
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.dictionary_store = dictionary_store
+        self.selector_options = {'strategy': strategy, 'objective': objective, 'dictionary_store': dictionary_store,
+                                 'profile': profile, 'codec_overrides': codec_overrides, 'learning_db': learning_db}
+        self.compress_options = dict(self.selector_options, filter_mode=filter_mode, memory_limit=memory_limit,
+                                     block_mode=block_mode, block_size=block_size, workers=1)
+        self._executor = ThreadPoolExecutor(self.max_concurrency, thread_name_prefix="akilli_sikistirma")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def create_selector(self) -> CompressorSelector:
+        """Kurucudaki ayarlarla yeni bir seçici oluşturur."""
+        return create_selector(**self.selector_options)
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Semafor, çalışan olay döngüsüne bağlanabilmesi için ilk kullanımda oluşturulur.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _run(self, func, *args):
+        """
+        İşlevi yürütücüde çalıştırır. Görev iptal edilirse iş parçacığı durdurulamayacağı için
+        işlevin bitmesi beklenir; böylece çağıran dosyaları güvenle kapatabilir.
+        """
+        future = asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            with contextlib.suppress(Exception):
+                await future
+            raise
+
+    async def _drive(self, job) -> None:
+        try:
+            while not await self._run(job.step):
+                pass
+        except BaseException:
+            await self._run(job.abort)
+            raise
+
+    async def compress_file(self, filepath: str, output_dir: str = '.') -> str:
+        """
+        Dosyayı analiz edip en uygun algoritmayla sıkıştırır ve .comp dosyasının yolunu döndürür.
+        Analiz tek geçişlidir (prefix); çıktı, CLI ile sıkıştırılmış dosyalarla aynı biçimdedir.
+        """
+        async with self.semaphore:
+            job = _CompressJob(filepath, output_dir, self.compress_options, self.chunk_size)
+            await self._drive(job)
+            return job.output_path
+
+    async def decompress_file(self, filepath: str, output_dir: str = '.') -> str:
+        """.comp dosyasını açar ve açılan dosyanın yolunu döndürür; boyut ve sağlama doğrulanır."""
+        async with self.semaphore:
+            header = await self._run(_read_header_from_path, filepath)
+            if header is None or header['container'] != CONTAINER_STREAM or header['params'].get('filter'):
+                output_path = await self._run(_decompress_file_sync, filepath, output_dir, 1, self.dictionary_store)
+                if output_path is None:
+                    raise ValueError(f"'{filepath}' açılamadı.")
+                return output_path
+            job = await self._run(_DecompressJob, filepath, output_dir, header, CompressorSelector(self.dictionary_store),
+                                  self.chunk_size)
+            await self._drive(job)
+            return job.output_path
+
+    async def compress_stream(self, chunks: AsyncIterable[bytes], codec: str = "zstandard") -> AsyncIterator[bytes]:
+        """
+        Asenkron bir bayt kaynağını (ör. aiohttp istek gövdesi) sıkıştırarak parça parça verir.
+        Çıktı başlıksız, ham algoritma akışıdır; açmak için aynı algoritma adı decompress_stream'e verilir.
+        Akış tüketildiği sürece bir eşzamanlılık hakkı tutar.
+        """
+        compressor = self.create_selector().create_compressor(codec)
+        if getattr(compressor, 'threads', 0):
+            compressor.threads = 0
+        stream = compressor._new_stream_compressor()
+        async with self.semaphore:
+            async for chunk in chunks:
+                out = await self._run(stream.compress, chunk)
+                if out:
+                    yield out
+            out = await self._run(stream.flush)
+            if out:
+                yield out
+
+    async def decompress_stream(self, chunks: AsyncIterable[bytes], codec: str = "zstandard",
+                                params: Dict[str, Any] = None) -> AsyncIterator[bytes]:
+        """compress_stream çıktısını (veya başlıksız bir algoritma akışını) açarak parça parça verir."""
+        compressor: Compressor = CompressorSelector(self.dictionary_store).compressor_from_header(codec, params or {})
+        stream = compressor._new_bounded_decompressor()
+        async with self.semaphore:
+            async for chunk in chunks:
+                # Çıktı sınırlı parçalar halinde üretilir; her parça ayrı bir işte açılır.
+                pieces = stream.decompress(chunk)
+                while True:
+                    out = await self._run(next, pieces, None)
+                    if out is None:
+                        break
+                    yield out
+        if not stream.eof:
+            raise ValueError(f"{codec}: sıkıştırılmış veri beklenmedik şekilde sona erdi.")
+
+    def close(self):
+        """Yürütücüyü kapatır; çalışan işlerin bitmesini bekler."""
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+def _read_header_from_path(filepath: str) -> Optional[Dict[str, Any]]:
+    with open(filepath, 'rb') as f:
+        return read_header(f)
+
+async def compress_file(filepath: str, output_dir: str = '.', **options) -> str:
+    """Tek seferlik kullanım için AsyncCompressor.compress_file kısayolu (seçenekler kurucuya aktarılır)."""
+    async with AsyncCompressor(**options) as compressor:
+        return await compressor.compress_file(filepath, output_dir)
+
+async def decompress_file(filepath: str, output_dir: str = '.', **options) -> str:
+    """Tek seferlik kullanım için AsyncCompressor.decompress_file kısayolu."""
+    async with AsyncCompressor(**options) as compressor:
+        return await compressor.decompress_file(filepath, output_dir)
+
+if __name__ == "__main__":
+    import contextlib as _contextlib
+    import io
+    import random
+    import tempfile
+
+    print("--- async_api.py Modül Testleri ---")
+
+    work_dir = tempfile.mkdtemp()
+    large_path = os.path.join(work_dir, "buyuk.log")
+    rng = random.Random(3)
+    with open(large_path, 'wb') as f:
+        for _ in range(20):
+            f.write("".join(f"{rng.randint(0, 10 ** 6)} INFO istek tamamlandi sure={rng.random():.5f}\n"
+                            for _ in range(20000)).encode())
+
+    async def measure_loop_lag(stop: asyncio.Event) -> float:
+        """Olay döngüsünün 1 ms'lik uykulardan ne kadar geç uyandığını ölçer (en kötü durum)."""
+        worst = 0.0
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            worst = max(worst, time.perf_counter() - start - 0.001)
+        return worst
+
+    async def demo():
+        from .main import compress_file as compress_file_sync
+
+        # 1. Eşzamanlı API'yi doğrudan olay döngüsünde çağırmak döngüyü durdurur.
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(measure_loop_lag(stop))
+        await asyncio.sleep(0.01)
+        with _contextlib.redirect_stdout(io.StringIO()):
+            compress_file_sync(large_path, work_dir)
+        stop.set()
+        print(f"  Eşzamanlı compress_file: en kötü döngü gecikmesi {await lag_task * 1000:.1f} ms")
+
+        # 2. Asenkron API ile döngü yanıt vermeye devam eder.
+        async with AsyncCompressor(max_concurrency=2) as compressor:
+            stop = asyncio.Event()
+            lag_task = asyncio.create_task(measure_loop_lag(stop))
+            with _contextlib.redirect_stdout(io.StringIO()):
+                output = await compressor.compress_file(large_path, work_dir)
+            stop.set()
+            print(f"  Asenkron compress_file: en kötü döngü gecikmesi {await lag_task * 1000:.1f} ms")
+
+            restored_dir = os.path.join(work_dir, "acilan")
+            os.makedirs(restored_dir)
+            restored = await compressor.decompress_file(output, restored_dir)
+            with open(restored, 'rb') as a, open(large_path, 'rb') as b:
+                print(f"  Asenkron açma: {'BAŞARILI' if a.read() == b.read() else 'HATA'}")
+
+            # Filtre seçimi eşzamanlı API ile aynıdır: CSV dosyası iki yolla da aynı boyuta sıkıştırılır.
+            csv_path = os.path.join(work_dir, "olcum.csv")
+            with open(csv_path, 'w') as f:
+                f.writelines(f"{i},{20 + rng.random():.3f},{rng.randint(900, 1100)}\n" for i in range(100000))
+            sync_dir, async_dir = os.path.join(work_dir, "eszamanli"), os.path.join(work_dir, "asenkron")
+            os.makedirs(sync_dir)
+            os.makedirs(async_dir)
+            with _contextlib.redirect_stdout(io.StringIO()):
+                sync_output = compress_file_sync(csv_path, sync_dir, io_engine='simple')
+                async_output = await compressor.compress_file(csv_path, async_dir)
+            header = _read_header_from_path(async_output)
+            print(f"  CSV: eşzamanlı {os.path.getsize(sync_output)}B, asenkron {os.path.getsize(async_output)}B, "
+                  f"filtre: {header['params'].get('filter')}")
+
+            # 3. İptal: yarım kalan çıktı silinmelidir.
+            os.remove(output)
+            with _contextlib.redirect_stdout(io.StringIO()):
+                task = asyncio.create_task(compressor.compress_file(large_path, work_dir))
+                await asyncio.sleep(0.05)
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            leftovers = [name for name in os.listdir(work_dir) if name.endswith(".comp")]
+            print(f"  İptal sonrası yarım çıktı kalmadı: {'BAŞARILI' if not leftovers else 'HATA'}")
+
+            # 4. Akış API'si.
+            async def source():
+                for i in range(100):
+                    yield f"satir {i}\n".encode() * 100
+
+            compressed = [piece async for piece in compressor.compress_stream(source(), "zstandard")]
+
+            async def replay():
+                for piece in compressed:
+                    yield piece
+
+            restored_stream = b"".join([piece async for piece in compressor.decompress_stream(replay(), "zstandard")])
+            expected = b"".join([f"satir {i}\n".encode() * 100 for i in range(100)])
+            print(f"  Akış API'si: {'BAŞARILI' if restored_stream == expected else 'HATA'}")
+
+    asyncio.run(demo())
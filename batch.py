@@ -0,0 +1,249 @@
+# akilli_sikistirma/batch.py
+
+import contextlib
+import glob
+import io
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Tuple
+
+from .analysis_cache import AnalysisCache
+from .dedup_store import ChunkStore
+from .dictionary_store import DictionaryStore
+from .profiles import DEFAULT_PROFILE
+from .file_format import sniff
+from .memory_budget import format_memory
+from .main import compress_file, create_selector
+
+# Her işçi süreç kendi seçicisini, analiz önbelleğini ve parça deposunu bir kez oluşturur
+# ve tüm dosyalarda yeniden kullanır.
+_worker_selector = None
+_worker_cache = None
+_worker_chunk_store = None
+
+def _init_worker(dictionary_dir: str = None, selector_options: Dict[str, Any] = None,
+                 cache_options: Dict[str, Any] = None, chunk_store_path: str = None):
+    global _worker_selector, _worker_cache, _worker_chunk_store
+    _worker_cache = AnalysisCache(**cache_options) if cache_options else None
+    _worker_chunk_store = ChunkStore(chunk_store_path) if chunk_store_path else None
+    # Sözlük deposu da işçi başına bir kez açılır; yüklenen sözlük ve bağlamlar tüm dosyalarda paylaşılır.
+    _worker_selector = create_selector(dictionary_store=DictionaryStore(dictionary_dir) if dictionary_dir else None,
+                                       **(selector_options or {}))
+
+def has_glob_pattern(path: str) -> bool:
+    """Yolun glob joker karakterleri içerip içermediğini döndürür."""
+    return any(char in path for char in "*?[")
+
+def _glob_root(pattern: str) -> str:
+    """Glob ifadesinin joker karakter içermeyen baştaki dizin kısmını döndürür."""
+    root_parts = []
+    for part in pattern.split(os.sep):
+        if has_glob_pattern(part):
+            break
+        root_parts.append(part)
+    return os.sep.join(root_parts) or "."
+
+def collect_files(paths: List[str], recursive: bool = False) -> List[Tuple[str, str]]:
+    """
+    Verilen dosya, dizin ve glob ifadelerinden sıkıştırılacak dosyaları toplar.
+    Dizinlerde recursive True ise alt dizinlere de inilir. Zaten sıkıştırılmış
+    .comp dosyaları atlanır.
+
+    Returns:
+        List[Tuple[str, str]]: (dosya yolu, çıktı dizinine göre göreli alt dizin) çiftleri.
+                               Göreli alt dizin, dizin yapısının çıktıda korunması içindir.
+    """
+    collected = []
+    seen = set()
+
+    def add(filepath: str, relative_dir: str, explicit: bool = False):
+        # Açıkça verilen dosyalar bulunamasa da listeye alınır; raporda hata olarak görünürler.
+        real_path = os.path.realpath(filepath)
+        if real_path in seen or filepath.endswith(".comp") or (not explicit and not os.path.isfile(filepath)):
+            return
+        seen.add(real_path)
+        collected.append((filepath, relative_dir))
+
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                relative_dir = os.path.relpath(dirpath, path)
+                for filename in filenames:
+                    add(os.path.join(dirpath, filename), "" if relative_dir == "." else relative_dir)
+                if not recursive:
+                    break
+        elif has_glob_pattern(path):
+            root = _glob_root(path)
+            for filepath in glob.glob(path, recursive=recursive):
+                relative_dir = os.path.relpath(os.path.dirname(filepath), root)
+                add(filepath, "" if relative_dir == "." else relative_dir)
+        else:
+            add(path, "", explicit=True)
+    return collected
+
+def disambiguate_outputs(files: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """
+    Çıktıları aynı yola düşecek dosyaları (ör. ayrı dizinlerden aynı adlı iki dosya) ayırır:
+    çakışan dosyaların göreli alt dizinine, dizinlerinin ortak atadan sonraki kısmı eklenir
+    ('a/x.txt', 'b/x.txt' -> 'a/x.txt.*.comp', 'b/x.txt.*.comp'). Çakışmayan dosyalar değişmez.
+    """
+    groups: Dict[Tuple[str, str], List[int]] = {}
+    for index, (filepath, relative_dir) in enumerate(files):
+        groups.setdefault((relative_dir, os.path.basename(filepath)), []).append(index)
+    resolved = list(files)
+    for (relative_dir, _), indices in groups.items():
+        if len(indices) < 2:
+            continue
+        directories = [os.path.dirname(os.path.abspath(files[index][0])) for index in indices]
+        common = os.path.commonpath(directories)
+        for index, directory in zip(indices, directories):
+            resolved[index] = (files[index][0], os.path.join(relative_dir, os.path.relpath(directory, common)))
+    return resolved
+
+def is_up_to_date(filepath: str, output_dir: str) -> bool:
+    """
+    Çıktı dizininde bu dosyanın güncel bir .comp çıktısı varsa True döner.
+    Çıktı, kaynaktan daha yeni olmalı ve başlığındaki orijinal boyut kaynağınkiyle eşleşmelidir.
+    Desen başka dosyaların çıktılarını da (ör. 'log' için 'log.1.lzma.comp') yakaladığından
+    adın tam olarak '<dosya>.<başlıktaki algoritma>.comp' olması gerekir.
+    """
+    source_stat = os.stat(filepath)
+    base_name = os.path.basename(filepath)
+    pattern = os.path.join(glob.escape(output_dir), glob.escape(base_name) + ".*.comp")
+    for candidate in glob.glob(pattern):
+        header = sniff(candidate)
+        if (header is not None and os.path.basename(candidate) == f"{base_name}.{header['codec']}.comp"
+                and header['original_size'] == source_stat.st_size
+                and os.stat(candidate).st_mtime_ns >= source_stat.st_mtime_ns):
+            return True
+    return False
+
+def _compress_one(filepath: str, output_dir: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """İşçi süreçte tek bir dosyayı sıkıştırır; çıktıları sonuç sözlüğüne toplar."""
+    result = {'path': filepath, 'output': None, 'codec': None, 'bytes_in': 0,
+              'bytes_out': 0, 'seconds': 0.0, 'error': None, 'cache_hit': False, 'dedup_new_bytes': 0}
+    cache_hits = _worker_cache.hits if _worker_cache is not None else 0
+    new_bytes, stored_bytes = ((_worker_chunk_store.new_bytes, _worker_chunk_store.stored_bytes)
+                               if _worker_chunk_store is not None else (0, 0))
+    start = time.perf_counter()
+    log = io.StringIO()
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        # compress_file ayrıntılı bilgileri yazdırır; paralel süreçlerin çıktısı
+        # karışmasın diye yakalanır ve yalnızca hata durumunda rapora eklenir.
+        with contextlib.redirect_stdout(log):
+            output = compress_file(filepath, output_dir, selector=_worker_selector,
+                                   analysis_cache=_worker_cache, chunk_store=_worker_chunk_store, **options)
+        result['cache_hit'] = _worker_cache is not None and _worker_cache.hits > cache_hits
+        if output is None:
+            log_lines = log.getvalue().strip().splitlines()
+            result['error'] = log_lines[-1].strip() if log_lines else "bilinmeyen hata"
+        else:
+            header = sniff(output)
+            result.update({'output': output, 'codec': header['codec'],
+                           'bytes_in': header['original_size'], 'bytes_out': os.path.getsize(output)})
+            if _worker_chunk_store is not None:
+                # Depoya eklenen parçalar da dosyanın çıktısına sayılır.
+                result['bytes_out'] += _worker_chunk_store.stored_bytes - stored_bytes
+                result['dedup_new_bytes'] = _worker_chunk_store.new_bytes - new_bytes
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+def compress_batch(paths: List[str], output_dir: str = '.', recursive: bool = False,
+                   jobs: int = None, force: bool = False, dictionary_dir: str = None,
+                   profile: str = DEFAULT_PROFILE, codec_overrides: dict = None, learning_db: str = None,
+                   cache_options: Dict[str, Any] = None, chunk_store_path: str = None,
+                   **options) -> Dict[str, Any]:
+    """
+    Birden çok dosyayı bir süreç havuzunda paralel sıkıştırır.
+    Büyük dosyalar önce zamanlanır ki sona kalan tek bir büyük dosya
+    diğer işçiler boştayken işi uzatmasın. Güncel çıktısı olan dosyalar
+    (force False ise) atlanır. dictionary_dir verilirse küçük dosyalar bu depodaki
+    etkin sözlükle sıkıştırılır. profile, codec_overrides ve learning_db (ile 'strategy',
+    'objective' seçenekleri) her işçinin seçicisini oluşturur. cache_options verilirse her işçi
+    bu ayarlarla bir analiz önbelleği açar (bkz. AnalysisCache). chunk_store_path verilirse dosyalar
+    tekilleştirme kipinde bu parça deposuna sıkıştırılır; tüm işçiler aynı depoyu paylaşır.
+    Ek seçenekler compress_file'a aktarılır; 'memory_limit' verilirse tüm işlerin toplam sınırıdır ve
+    eşzamanlı çalışan işçi sayısına bölünür.
+
+    Returns:
+        dict: 'files', 'skipped', 'failures', 'bytes_in', 'bytes_out', 'codec_counts',
+              'seconds', 'throughput_mb_s' ve 'memory_limit_per_job' anahtarlarını içeren özet rapor.
+    """
+    start = time.perf_counter()
+    # Aynı çıktı yoluna düşen dosyalar birbirinin çıktısının üzerine yazmasın diye ayrılır.
+    files = disambiguate_outputs(collect_files(paths, recursive))
+
+    tasks = []
+    skipped = 0
+    missing = []
+    for filepath, relative_dir in files:
+        if not os.path.isfile(filepath):
+            missing.append((filepath, "Dosya bulunamadı"))
+            continue
+        target_dir = os.path.join(output_dir, relative_dir)
+        if not force and is_up_to_date(filepath, target_dir):
+            skipped += 1
+            continue
+        tasks.append((os.path.getsize(filepath), filepath, target_dir))
+    tasks.sort(reverse=True)
+
+    selector_options = dict(strategy=options.get('strategy', 'rules'), objective=options.get('objective', 'ratio'),
+                            profile=profile, codec_overrides=codec_overrides, learning_db=learning_db)
+    jobs = jobs or os.cpu_count() or 1
+    if options.get('memory_limit') is not None and tasks:
+        # İşçi süreçler aynı makinede eşzamanlı çalışır; her dosya sınırın kendi payıyla sıkıştırılır.
+        options = dict(options, memory_limit=options['memory_limit'] // min(jobs, len(tasks)))
+    results = []
+    if tasks:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(dictionary_dir, selector_options, cache_options,
+                                           chunk_store_path)) as pool:
+            futures = [pool.submit(_compress_one, filepath, target_dir, options) for _, filepath, target_dir in tasks]
+            for future in as_completed(futures):
+                results.append(future.result())
+
+    succeeded = [result for result in results if result['error'] is None]
+    seconds = time.perf_counter() - start
+    bytes_in = sum(result['bytes_in'] for result in succeeded)
+    return {
+        'files': len(succeeded),
+        'skipped': skipped,
+        'failures': missing + [(result['path'], result['error']) for result in results if result['error'] is not None],
+        'bytes_in': bytes_in,
+        'bytes_out': sum(result['bytes_out'] for result in succeeded),
+        'codec_counts': dict(Counter(result['codec'] for result in succeeded)),
+        'cache_hits': sum(result['cache_hit'] for result in results) if cache_options else None,
+        'cache_misses': sum(not result['cache_hit'] for result in results) if cache_options else None,
+        'dedup_new_bytes': sum(result['dedup_new_bytes'] for result in succeeded) if chunk_store_path else None,
+        'memory_limit_per_job': options.get('memory_limit'),
+        'seconds': seconds,
+        'throughput_mb_s': bytes_in / seconds / 1e6 if seconds > 0 else 0.0
+    }
+
+def print_batch_report(report: Dict[str, Any]):
+    """Toplu sıkıştırma özet raporunu yazdırır."""
+    print("\n--- Toplu Sıkıştırma Özeti ---")
+    print(f"  Sıkıştırılan: {report['files']} dosya, Atlanan (güncel): {report['skipped']}, Başarısız: {len(report['failures'])}")
+    print(f"  Toplam Giriş: {report['bytes_in']}B, Toplam Çıkış: {report['bytes_out']}B")
+    if report['bytes_out'] > 0:
+        print(f"  Toplam Oran: {report['bytes_in'] / report['bytes_out']:.2f}x")
+    print(f"  Süre: {report['seconds']:.2f} s, Toplam Hız: {report['throughput_mb_s']:.1f} MB/s")
+    if report.get('dedup_new_bytes') is not None:
+        if report['dedup_new_bytes'] > 0:
+            print(f"  Tekilleştirme Oranı: {report['bytes_in'] / report['dedup_new_bytes']:.2f}x "
+                  f"(depoya eklenen: {report['dedup_new_bytes']}B)")
+        else:
+            print("  Tekilleştirme: Tüm parçalar depoda zaten mevcut.")
+    if report.get('memory_limit_per_job') is not None:
+        print(f"  Bellek Sınırı: iş başına {format_memory(report['memory_limit_per_job'])}")
+    if report.get('cache_hits') is not None:
+        print(f"  Analiz Önbelleği: {report['cache_hits']} isabet, {report['cache_misses']} ıska")
+    for codec, count in sorted(report['codec_counts'].items(), key=lambda item: -item[1]):
+        print(f"    {codec:<10} {count} dosya")
+    for path, error in report['failures']:
+        print(f"  HATA: '{path}': {error}")
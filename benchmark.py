@@ -0,0 +1,595 @@
+# akilli_sikistirma/benchmark.py
+
+import argparse
+import array
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from .codec_registry import default_registry
+from .compressor_selector import CompressorSelector
+from .data_analyzer import STRUCTURE_SAMPLE_SIZE, analyze_file_properties, analyze_prefix, analyze_sample, detect_structure
+from .filters import DefilteringWriter, FilteringReader
+from .profiles import PROFILE_NAMES
+from .utils import parse_size
+
+# Sentetik derlemdeki veri sınıfları ve dosya uzantıları. İkili sınıflarda nötr
+# uzantılar kullanılır ki seçici uzantıya değil analize göre karar versin.
+DATA_CLASSES = {
+    'text': '.txt',
+    'logs': '.log',
+    'json': '.json',
+    'random': '.bin',
+    'zeros': '.bin',
+    'compressed': '.dat',
+    'mixed': '.dat'
+}
+DEFAULT_SIZES = (64 * 1024, 1024 * 1024)
+DEFAULT_REPEAT = 3
+DEFAULT_SEED = 42
+
+# Karşılaştırmada gerileme sayılan göreli değişimler.
+DEFAULT_THRESHOLD = 0.10       # Hız, bellek ve analiz süresi
+RATIO_THRESHOLD = 0.01         # Sıkıştırma oranı
+ACCURACY_THRESHOLD = 0.01      # Seçici doğruluğu (mutlak)
+
+SAMPLE_TEXT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_text.txt")
+
+_WORDS = ("ve bir bu da ile için olarak daha çok gibi kadar sonra veri dosya sıkıştırma algoritma "
+          "analiz sonuç boyut hız oran blok akış başlık seçici profil entropi örnek deneme sistem "
+          "kullanıcı işlem zaman bellek disk ağ sunucu istemci istek yanıt hata uyarı bilgi").split()
+
+def _size_label(size: int) -> str:
+    for unit, factor in (("M", 1024 * 1024), ("K", 1024)):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{unit}"
+    return str(size)
+
+def _text(rng: random.Random, size: int) -> bytes:
+    # Kelimeler Zipf benzeri bir dağılımla seçilir; gerçek metne yakın bir entropi verir.
+    weights = [1.0 / (rank + 1) for rank in range(len(_WORDS))]
+    parts, length = [], 0
+    while length < size:
+        sentence = " ".join(rng.choices(_WORDS, weights, k=rng.randint(6, 18))).capitalize() + ".\n"
+        parts.append(sentence)
+        length += len(sentence.encode())
+    return "".join(parts).encode()[:size]
+
+def _logs(rng: random.Random, size: int) -> bytes:
+    levels = ("INFO", "INFO", "INFO", "DEBUG", "WARN", "ERROR")
+    modules = ("api", "db", "cache", "auth", "worker")
+    lines, length, timestamp = [], 0, 1700000000.0
+    while length < size:
+        timestamp += rng.expovariate(50)
+        line = (f"{datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec='milliseconds')} {rng.choice(levels)} "
+                f"[{rng.choice(modules)}] user={rng.randint(1, 5000)} latency={rng.randint(1, 900)}ms "
+                f"path=/api/v1/{rng.choice(_WORDS)}/{rng.randint(1, 10**6)}\n")
+        lines.append(line)
+        length += len(line)
+    return "".join(lines).encode()[:size]
+
+def _json(rng: random.Random, size: int) -> bytes:
+    lines, length = [], 0
+    while length < size:
+        record = {"id": rng.randint(1, 10**9), "kullanici": f"kullanici{rng.randint(1, 2000)}",
+                  "olay": rng.choice(("giris", "cikis", "satin_alma", "hata")), "tutar": round(rng.uniform(0, 1000), 2),
+                  "etiketler": rng.sample(_WORDS, 3), "basarili": rng.random() > 0.1}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        lines.append(line)
+        length += len(line.encode())
+    return "".join(lines).encode()[:size]
+
+def _compressed(rng: random.Random, size: int) -> bytes:
+    parts, length = [], 0
+    while length < size:
+        part = zlib.compress(_text(rng, 256 * 1024), 9)
+        parts.append(part)
+        length += len(part)
+    return b"".join(parts)[:size]
+
+def _mixed(rng: random.Random, size: int) -> bytes:
+    # Metin, rastgele, JSON ve sıfır blokları dönüşümlü olarak art arda eklenir.
+    generators = (_text, lambda rng, size: rng.randbytes(size), _json, lambda rng, size: bytes(size))
+    parts, length, index = [], 0, 0
+    while length < size:
+        part = generators[index % len(generators)](rng, min(64 * 1024, size - length))
+        parts.append(part)
+        length += len(part)
+        index += 1
+    return b"".join(parts)
+
+_GENERATORS = {
+    'text': _text,
+    'logs': _logs,
+    'json': _json,
+    'random': lambda rng, size: rng.randbytes(size),
+    'zeros': lambda rng, size: bytes(size),
+    'compressed': _compressed,
+    'mixed': _mixed
+}
+
+def build_corpus(directory: str, sizes=DEFAULT_SIZES, seed: int = DEFAULT_SEED,
+                 include_sample_text: bool = True) -> List[Dict[str, Any]]:
+    """
+    Sentetik derlemi dizine yazar. Aynı tohum her zaman aynı baytları üretir.
+
+    Returns:
+        List[dict]: Her dosya için 'case', 'data_class', 'size' ve 'path' anahtarları.
+    """
+    os.makedirs(directory, exist_ok=True)
+    corpus = []
+    for data_class, extension in DATA_CLASSES.items():
+        for size in sizes:
+            # Her dosya kendi tohumundan üretilir; bir sınıf veya boyut eklemek diğerlerini değiştirmez.
+            rng = random.Random(f"{seed}-{data_class}-{size}")
+            case = f"{data_class}_{_size_label(size)}"
+            path = os.path.join(directory, case + extension)
+            with open(path, 'wb') as f:
+                f.write(_GENERATORS[data_class](rng, size))
+            corpus.append({'case': case, 'data_class': data_class, 'size': size, 'path': path})
+    if include_sample_text and os.path.exists(SAMPLE_TEXT_PATH):
+        corpus.append({'case': 'sample_text', 'data_class': 'text',
+                       'size': os.path.getsize(SAMPLE_TEXT_PATH), 'path': SAMPLE_TEXT_PATH})
+    return corpus
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss Linux'ta KB, macOS'ta bayt cinsindendir.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def measure_codec(path: str, codec_name: str, profile: str, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """
+    Bir dosyayı verilen algoritma ve profille akış API'si üzerinden sıkıştırıp açar.
+    Süreler 'repeat' denemenin en iyisidir. Tepe bellek (RSS) sürecin ömrü boyuncaki
+    en yüksek değerdir; anlamlı olması için her ölçüm ayrı bir süreçte yapılmalıdır.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    with contextlib.redirect_stdout(io.StringIO()):
+        compressor = CompressorSelector(profile=profile).create_compressor(codec_name)
+    baseline_rss = _peak_rss_mb()
+
+    compress_seconds = decompress_seconds = float("inf")
+    compressed = b""
+    for _ in range(repeat):
+        output = io.BytesIO()
+        start = time.perf_counter()
+        compressor.compress_stream(io.BytesIO(data), output)
+        compress_seconds = min(compress_seconds, time.perf_counter() - start)
+        compressed = output.getvalue()
+
+        restored = io.BytesIO()
+        start = time.perf_counter()
+        compressor.decompress_stream(io.BytesIO(compressed), restored)
+        decompress_seconds = min(decompress_seconds, time.perf_counter() - start)
+        if restored.getvalue() != data:
+            raise ValueError(f"{codec_name}/{profile}: açılan veri orijinalle eşleşmiyor ({path}).")
+
+    peak_rss = _peak_rss_mb()
+    size_mb = len(data) / 1e6
+    return {
+        'codec': codec_name,
+        'profile': profile,
+        'params': compressor.get_params(),
+        'original_size': len(data),
+        'compressed_size': len(compressed),
+        'ratio': len(data) / len(compressed) if compressed else 0.0,
+        'compress_mb_s': size_mb / max(compress_seconds, 1e-9),
+        'decompress_mb_s': size_mb / max(decompress_seconds, 1e-9),
+        'peak_rss_mb': peak_rss,
+        'rss_growth_mb': peak_rss - baseline_rss
+    }
+
+def measure_analysis(path: str) -> Dict[str, Any]:
+    """Üç analiz kipinin süresini ve seçicinin bu dosya için seçtiği algoritmayı ölçer."""
+    timings = {}
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        results, prefix = analyze_prefix(f, path)
+    timings['prefix'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        analyze_sample(f, path)
+    timings['sample'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyze_file_properties(path)
+    timings['full'] = time.perf_counter() - start
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        selected = CompressorSelector().select_compressor(results, sample=prefix).get_name()
+    return {'analysis_seconds': timings, 'entropy': results['entropy'], 'selected_codec': selected}
+
+def _selector_accuracy(cases: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Seçicinin kararını, 'balanced' profilde en yüksek oranı veren algoritmayla karşılaştırır.
+    ratio_loss, en iyi oranın seçilen algoritmanın oranına bölümüdür (1.0 = kayıp yok).
+    Sıfır dolu gibi uç dosyalar ortalamayı bozmasın diye kayıpların geometrik ortalaması alınır.
+    """
+    decisions = []
+    for case in cases:
+        balanced = {result['codec']: result for result in case['results']
+                    if result['profile'] == 'balanced' or result['codec'] == 'stored'}
+        selected = case['analysis']['selected_codec']
+        if selected not in balanced:
+            continue
+        best = max(balanced.values(), key=lambda result: result['ratio'])
+        decisions.append({
+            'case': case['case'],
+            'selected': selected,
+            'best': best['codec'],
+            'ratio_loss': best['ratio'] / balanced[selected]['ratio'] if balanced[selected]['ratio'] else 0.0
+        })
+    if not decisions:
+        return {'accuracy': None, 'geomean_ratio_loss': None, 'decisions': []}
+    return {
+        'accuracy': sum(decision['selected'] == decision['best'] for decision in decisions) / len(decisions),
+        'geomean_ratio_loss': math.exp(sum(math.log(max(decision['ratio_loss'], 1e-9)) for decision in decisions) / len(decisions)),
+        'decisions': decisions
+    }
+
+def run_benchmark(sizes=DEFAULT_SIZES, codecs: Optional[List[str]] = None, profiles=PROFILE_NAMES,
+                  repeat: int = DEFAULT_REPEAT, seed: int = DEFAULT_SEED, isolate: bool = True,
+                  corpus_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Derlemi oluşturur ve her dosya/algoritma/profil üçlüsünü ölçer.
+    isolate True ise her ölçüm yeni bir süreçte yapılır; tepe bellek değerleri
+    böylece birbirini etkilemez. 'stored' profilden bağımsız olduğundan yalnızca bir kez ölçülür.
+
+    Returns:
+        dict: 'meta', 'cases' ve 'selector' anahtarlarını içeren, JSON'a yazılabilir sonuç.
+    """
+    codecs = list(codecs or CompressorSelector().available_compressors)
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        corpus = build_corpus(corpus_dir or temporary_dir, sizes, seed)
+        jobs = [(entry['path'], codec, profile, repeat)
+                for entry in corpus for codec in codecs for profile in profiles
+                if codec != "stored" or profile == profiles[0]]
+
+        if isolate:
+            # 'spawn' ile her görev temiz bir süreçte başlar; maxtasksperchild=1 süreci yeniden kullandırmaz.
+            with multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+                measurements = pool.starmap(measure_codec, jobs, chunksize=1)
+        else:
+            measurements = [measure_codec(*job) for job in jobs]
+
+        cases = []
+        for entry in corpus:
+            results = [measurement for job, measurement in zip(jobs, measurements) if job[0] == entry['path']]
+            cases.append({'case': entry['case'], 'data_class': entry['data_class'], 'size': entry['size'],
+                          'analysis': measure_analysis(entry['path']), 'results': results})
+
+    versions = {entry['name']: entry['version'] for entry in default_registry.availability_report()}
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'zstandard': versions.get('zstandard') or "?",
+            'brotli': versions.get('brotli') or "?",
+            'seed': seed,
+            'sizes': list(sizes),
+            'repeat': repeat,
+            'isolated': isolate
+        },
+        'cases': cases,
+        'selector': _selector_accuracy(cases)
+    }
+
+def compare_runs(baseline: Dict[str, Any], current: Dict[str, Any],
+                 threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    İki çalıştırmayı eşleşen dosya/algoritma/profil üçlüleri üzerinden karşılaştırır.
+    Hız düşüşü, oran kaybı, bellek artışı, analiz süresi artışı ve seçici doğruluğu
+    düşüşü için gerileme açıklamalarının listesini döndürür.
+    """
+    regressions = []
+    baseline_cases = {case['case']: case for case in baseline['cases']}
+    for case in current['cases']:
+        old_case = baseline_cases.get(case['case'])
+        if old_case is None:
+            continue
+        old_results = {(result['codec'], result['profile']): result for result in old_case['results']}
+        for result in case['results']:
+            old = old_results.get((result['codec'], result['profile']))
+            if old is None:
+                continue
+            label = f"{case['case']} {result['codec']}/{result['profile']}"
+            for key in ('compress_mb_s', 'decompress_mb_s'):
+                if result[key] < old[key] * (1 - threshold):
+                    regressions.append(f"{label}: {key} {old[key]:.1f} -> {result[key]:.1f} "
+                                       f"({result[key] / old[key] - 1:+.0%})")
+            if result['ratio'] < old['ratio'] * (1 - RATIO_THRESHOLD):
+                regressions.append(f"{label}: ratio {old['ratio']:.3f} -> {result['ratio']:.3f}")
+            # Çok küçük bellek değişimleri gürültüdür; en az 1 MB artış aranır.
+            if result['peak_rss_mb'] > old['peak_rss_mb'] * (1 + threshold) and result['peak_rss_mb'] - old['peak_rss_mb'] > 1:
+                regressions.append(f"{label}: peak_rss_mb {old['peak_rss_mb']:.1f} -> {result['peak_rss_mb']:.1f}")
+
+        for mode, seconds in case['analysis']['analysis_seconds'].items():
+            old_seconds = old_case['analysis']['analysis_seconds'].get(mode)
+            if old_seconds is not None and seconds > old_seconds * (1 + threshold) and seconds - old_seconds > 0.001:
+                regressions.append(f"{case['case']} analiz/{mode}: {old_seconds * 1000:.2f} ms -> {seconds * 1000:.2f} ms")
+
+    old_accuracy = baseline['selector'].get('accuracy')
+    new_accuracy = current['selector'].get('accuracy')
+    if old_accuracy is not None and new_accuracy is not None and new_accuracy < old_accuracy - ACCURACY_THRESHOLD:
+        regressions.append(f"seçici doğruluğu: {old_accuracy:.0%} -> {new_accuracy:.0%}")
+    return regressions
+
+def print_summary(report: Dict[str, Any]):
+    """Sonuçları dosya başına okunabilir bir tablo olarak yazdırır."""
+    for case in report['cases']:
+        analysis = case['analysis']
+        print(f"\n{case['case']} ({case['size']}B, entropi {analysis['entropy']:.2f}, seçilen: {analysis['selected_codec']}, "
+              f"analiz prefix/sample/full: " + "/".join(f"{analysis['analysis_seconds'][mode] * 1000:.1f}"
+                                                         for mode in ('prefix', 'sample', 'full')) + " ms)")
+        for result in sorted(case['results'], key=lambda result: -result['ratio']):
+            print(f"  {result['codec']:<10} {result['profile']:<9} oran={result['ratio']:7.2f}x "
+                  f"sıkıştırma={result['compress_mb_s']:8.1f} MB/s açma={result['decompress_mb_s']:8.1f} MB/s "
+                  f"RSS={result['peak_rss_mb']:6.1f} MB")
+    selector = report['selector']
+    if selector['accuracy'] is not None:
+        print(f"\nSeçici doğruluğu: {selector['accuracy']:.0%} (geometrik ortalama oran kaybı {selector['geomean_ratio_loss']:.3f}x)")
+
+# Başlangıç ölçümünde yüklenip yüklenmediği raporlanan ağır modüller.
+STARTUP_HEAVY_MODULES = ('zstandard', 'brotli', 'lzma', 'bz2', 'numpy', 'sqlite3', 'asyncio', 'importlib.metadata')
+
+def measure_startup(module: str = "main", repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """
+    Paketin bir modülünün içe aktarma süresini 'python -X importtime' ile, her seferinde yeni bir
+    süreçte ölçer (en iyi değer alınır). İçe aktarma süreleri mikrosaniyedir; sonuçlar ms'dir.
+
+    Returns:
+        dict: 'import_ms' (modülün toplam içe aktarma süresi), 'process_ms' (yorumlayıcının
+              başlatılması dahil duvar süresi), 'top_modules' (kendi süresi en yüksek 10 modül) ve
+              'loaded_heavy_modules' (STARTUP_HEAVY_MODULES içinden yüklenenler).
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    target = f"{__package__}.{module}"
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {target}"],
+                                   cwd=os.path.dirname(package_dir), capture_output=True, text=True)
+        process_ms = (time.perf_counter() - start) * 1000
+        if completed.returncode != 0:
+            raise RuntimeError(f"'{target}' içe aktarılamadı:\n{completed.stderr[-2000:]}")
+        modules = {}
+        for line in completed.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        result = {
+            'module': target,
+            'import_ms': modules[target][1] / 1000,
+            'process_ms': process_ms,
+            'top_modules': [(name, self_us / 1000) for name, (self_us, _) in
+                            sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:10]],
+            'loaded_heavy_modules': [name for name in STARTUP_HEAVY_MODULES if name in modules],
+        }
+        if best is None or result['import_ms'] < best['import_ms']:
+            best = result
+    return best
+
+def print_startup(result: Dict[str, Any]):
+    print(f"'{result['module']}' içe aktarma: {result['import_ms']:.1f} ms "
+          f"(yorumlayıcı dahil süreç: {result['process_ms']:.1f} ms)")
+    print(f"Yüklenen ağır modüller: {', '.join(result['loaded_heavy_modules']) or 'yok'}")
+    print("En pahalı modüller (kendi süresi):")
+    for name, self_ms in result['top_modules']:
+        print(f"  {name:<40} {self_ms:7.2f} ms")
+
+# Filtre ölçümünün veri kümeleri: analizcinin yapı bulması beklenen sayısal, ayraçlı ve çalıştırılabilir
+# veriler ile filtre seçilmemesi gereken bir kontrol kümesi (günlük metni).
+FILTER_DATASETS = ('counters', 'signal', 'csv', 'tsv', 'executable', 'logs')
+DEFAULT_FILTER_SIZE = 4 * 1024 * 1024
+DEFAULT_FILTER_CODECS = ('zstandard', 'lzma', 'zlib')
+
+def _counters(rng: random.Random, size: int) -> bytes:
+    # Yavaş artan uint32 sayaçlar (ör. zaman damgaları, kimlikler).
+    values = array.array('I', (1000000 + index * 3 + rng.randint(0, 2) for index in range(size // 4)))
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+def _signal(rng: random.Random, size: int) -> bytes:
+    # Gürültülü bir sinüs dalgasının int16 örnekleri (ör. ses, sensör kaydı).
+    values = array.array('h', (int(12000 * math.sin(index / 50) + rng.gauss(0, 40)) for index in range(size // 2)))
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+def _delimited(rng: random.Random, size: int, delimiter: str) -> bytes:
+    lines = [delimiter.join(("zaman", "sensor", "sicaklik", "nem", "durum"))]
+    length, index = len(lines[0]), 0
+    while length < size:
+        line = delimiter.join((datetime.fromtimestamp(1700000000 + index, timezone.utc).isoformat(), f"s{index % 16:02d}",
+                               f"{20 + rng.random() * 5:.2f}", str(40 + rng.randint(0, 20)), "OK" if index % 50 else "UYARI"))
+        lines.append(line)
+        length += len(line) + 1
+        index += 1
+    return ("\n".join(lines) + "\n").encode()
+
+def _executable(rng: random.Random, size: int) -> bytes:
+    # Paylaşımlı libpython (yoksa yorumlayıcının kendisi) gerçek bir çalıştırılabilir dosya örneğidir.
+    import sysconfig
+    library = os.path.join(sysconfig.get_config_var('LIBDIR') or "", sysconfig.get_config_var('INSTSONAME') or "")
+    with open(library if os.path.isfile(library) else sys.executable, 'rb') as f:
+        return f.read(size)
+
+_FILTER_GENERATORS = {
+    'counters': _counters,
+    'signal': _signal,
+    'csv': lambda rng, size: _delimited(rng, size, ","),
+    'tsv': lambda rng, size: _delimited(rng, size, "\t"),
+    'executable': _executable,
+    'logs': _logs
+}
+
+def _measure_roundtrip(data: bytes, compressor, data_filter, repeat: int) -> Dict[str, Any]:
+    """Veriyi (varsa filtreden geçirerek) akış API'si ile sıkıştırıp açar; süreler filtre dahildir."""
+    compress_seconds = decompress_seconds = float("inf")
+    compressed = b""
+    for _ in range(repeat):
+        output = io.BytesIO()
+        start = time.perf_counter()
+        source = io.BytesIO(data)
+        compressor.compress_stream(FilteringReader(source, data_filter) if data_filter else source, output)
+        compress_seconds = min(compress_seconds, time.perf_counter() - start)
+        compressed = output.getvalue()
+
+        restored = io.BytesIO()
+        start = time.perf_counter()
+        writer = DefilteringWriter(restored, data_filter) if data_filter else restored
+        compressor.decompress_stream(io.BytesIO(compressed), writer)
+        if data_filter:
+            writer.finish()
+        decompress_seconds = min(decompress_seconds, time.perf_counter() - start)
+        if restored.getvalue() != data:
+            raise ValueError(f"{compressor.get_name()}: açılan veri orijinalle eşleşmiyor.")
+
+    size_mb = len(data) / 1e6
+    return {
+        'compressed_size': len(compressed),
+        'ratio': len(data) / len(compressed) if compressed else 0.0,
+        'compress_mb_s': size_mb / max(compress_seconds, 1e-9),
+        'decompress_mb_s': size_mb / max(decompress_seconds, 1e-9)
+    }
+
+def run_filter_benchmark(size: int = DEFAULT_FILTER_SIZE, codecs=DEFAULT_FILTER_CODECS,
+                         datasets=FILTER_DATASETS, repeat: int = DEFAULT_REPEAT,
+                         seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """
+    Her veri kümesi ve algoritma için filtresiz ve filtreli sıkıştırmayı karşılaştırır.
+    Filtre, seçicinin analiz edilen yapıya göre seçtiği filtredir (örnek denemesi yapılmadan);
+    lzma ile çalıştırılabilir dosyalarda lzma'nın kendi BCJ filtresi kullanılır.
+
+    Returns:
+        List[dict]: Her veri kümesi/algoritma için 'dataset', 'codec', 'structure', 'filter',
+                    'plain' ve 'filtered' (filtre yoksa None) ölçümleri.
+    """
+    results = []
+    for dataset in datasets:
+        data = _FILTER_GENERATORS[dataset](random.Random(f"{seed}-{dataset}-{size}"), size)
+        structure = detect_structure(data[:STRUCTURE_SAMPLE_SIZE])
+        for codec_name in codecs:
+            with contextlib.redirect_stdout(io.StringIO()):
+                selector = CompressorSelector()
+                plain = _measure_roundtrip(data, selector.create_compressor(codec_name), None, repeat)
+                compressor = selector.create_compressor(codec_name)
+                data_filter = selector.select_filter({'structure': structure}, compressor)
+            native = compressor.get_params().get('bcj')
+            filtered = None
+            if data_filter is not None or native:
+                filtered = _measure_roundtrip(data, compressor, data_filter, repeat)
+            results.append({
+                'dataset': dataset,
+                'size': len(data),
+                'codec': codec_name,
+                'structure': structure,
+                'filter': data_filter.describe() if data_filter else (f"bcj={native} (lzma)" if native else None),
+                'plain': plain,
+                'filtered': filtered
+            })
+    return results
+
+def print_filter_summary(results: List[Dict[str, Any]]):
+    """Filtre ölçümlerini veri kümesi başına filtresiz/filtreli satırlar olarak yazdırır."""
+    dataset = None
+    for result in results:
+        if result['dataset'] != dataset:
+            dataset = result['dataset']
+            structure = result['structure']
+            print(f"\n{dataset} ({result['size']}B, yapı: {structure['kind'] if structure else 'yok'})")
+        plain, filtered = result['plain'], result['filtered']
+        print(f"  {result['codec']:<10} filtresiz   oran={plain['ratio']:7.2f}x sıkıştırma={plain['compress_mb_s']:8.1f} MB/s "
+              f"açma={plain['decompress_mb_s']:8.1f} MB/s")
+        if filtered is None:
+            print(f"  {'':<10} filtre seçilmedi")
+            continue
+        print(f"  {'':<10} {result['filter']:<11} oran={filtered['ratio']:7.2f}x sıkıştırma={filtered['compress_mb_s']:8.1f} MB/s "
+              f"açma={filtered['decompress_mb_s']:8.1f} MB/s ({filtered['ratio'] / max(plain['ratio'], 1e-9):.2f}x kazanç)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Akıllı Sıkıştırıcı performans ölçüm aracı.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Derlemi oluşturup ölçümleri çalıştırır.")
+    run_parser.add_argument('-o', '--output', type=str, default=None, help="Sonuçların yazılacağı JSON dosyası.")
+    run_parser.add_argument('--sizes', type=lambda value: [parse_size(size) for size in value.split(",")],
+                            default=list(DEFAULT_SIZES), help="Virgülle ayrılmış dosya boyutları (ör. 64K,1M,8M).")
+    run_parser.add_argument('--codecs', type=lambda value: value.split(","), default=None,
+                            help="Virgülle ayrılmış algoritmalar. Varsayılan: tümü.")
+    run_parser.add_argument('--profiles', type=lambda value: value.split(","), default=list(PROFILE_NAMES),
+                            help="Virgülle ayrılmış profiller. Varsayılan: tümü.")
+    run_parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Ölçüm başına tekrar sayısı (en iyisi alınır).")
+    run_parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Derlem tohumu.")
+    run_parser.add_argument('--no-isolate', action='store_true',
+                            help="Ölçümleri ayrı süreçler yerine bu süreçte yapar (daha hızlı; tepe bellek anlamsızlaşır).")
+    run_parser.add_argument('--corpus-dir', type=str, default=None, help="Derlemin yazılacağı dizin. Varsayılan: geçici dizin.")
+
+    compare_parser = subparsers.add_parser('compare', help="İki sonuç dosyasını karşılaştırıp gerilemeleri listeler.")
+    compare_parser.add_argument('baseline', type=str, help="Temel alınan sonuç dosyası.")
+    compare_parser.add_argument('current', type=str, help="Yeni sonuç dosyası.")
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help="Hız, bellek ve analiz süresinde gerileme sayılan göreli değişim. Varsayılan: 0.10.")
+    startup_parser = subparsers.add_parser('startup', help="Bir modülün başlangıç (içe aktarma) süresini ölçer.")
+    startup_parser.add_argument('--module', type=str, default="main", help="Ölçülecek modül. Varsayılan: main.")
+    startup_parser.add_argument('--repeat', type=int, default=5, help="Ölçüm sayısı (en iyisi alınır).")
+    filters_parser = subparsers.add_parser('filters', help="Ön işleme filtrelerinin oran ve hızını filtresiz sıkıştırmayla karşılaştırır.")
+    filters_parser.add_argument('-o', '--output', type=str, default=None, help="Sonuçların yazılacağı JSON dosyası.")
+    filters_parser.add_argument('--size', type=parse_size, default=DEFAULT_FILTER_SIZE, help="Veri kümesi boyutu. Varsayılan: 4M.")
+    filters_parser.add_argument('--codecs', type=lambda value: value.split(","), default=list(DEFAULT_FILTER_CODECS),
+                                help="Virgülle ayrılmış algoritmalar. Varsayılan: zstandard,lzma,zlib.")
+    filters_parser.add_argument('--datasets', type=lambda value: value.split(","), default=list(FILTER_DATASETS),
+                                help=f"Virgülle ayrılmış veri kümeleri ({','.join(FILTER_DATASETS)}).")
+    filters_parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Ölçüm başına tekrar sayısı (en iyisi alınır).")
+    filters_parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Veri kümesi tohumu.")
+    args = parser.parse_args()
+
+    if args.command == 'startup':
+        print_startup(measure_startup(args.module, args.repeat))
+    elif args.command == 'filters':
+        results = run_filter_benchmark(args.size, args.codecs, args.datasets, args.repeat, args.seed)
+        print_filter_summary(results)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+            print(f"\nSonuçlar kaydedildi: '{args.output}'")
+    elif args.command == 'run':
+        report = run_benchmark(args.sizes, args.codecs, tuple(args.profiles), args.repeat, args.seed,
+                               isolate=not args.no_isolate, corpus_dir=args.corpus_dir)
+        print_summary(report)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            print(f"\nSonuçlar kaydedildi: '{args.output}'")
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        regressions = compare_runs(baseline, current, args.threshold)
+        for regression in regressions:
+            print(f"  GERİLEME: {regression}")
+        print(f"\n{len(regressions)} gerileme bulundu.")
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+# akilli_sikistirma/block_container.py
+
+import os
+import struct
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, List, Optional, Tuple
+
+from .compressor_selector import CompressorSelector
+from .compressors import Compressor
+from .file_format import CODEC_IDS, CODEC_NAMES
+from .filters import Filter
+from .level_tuning import LevelController
+
+# Blok kapsayıcı düzeni (.comp başlığından sonra, bkz. file_format):
+#   Çerçeve: algoritma kimliği (1 bayt) | orijinal boyut (4 bayt) | sıkıştırılmış boyut (4 bayt) | veri
+#   Son:     algoritma kimliği END_OF_BLOCKS olan boş bir çerçeve
+#   Dizin:   her blok için orijinal konum (8) | çerçevenin dosyadaki konumu (8) |
+#            orijinal boyut (4) | sıkıştırılmış boyut (4)
+#   Kuyruk:  dizinin dosyadaki konumu (8) | blok sayısı (4) | INDEX_MAGIC (4)
+# Bir filtre kullanılıyorsa (bkz. filters) her blok sıkıştırılmadan önce tek başına filtrelenir;
+# çerçevedeki ve dizindeki orijinal boyut filtrelenmemiş verinin boyutudur.
+# Bloklar farklı algoritma ve seviyelerle sıkıştırılabilir (uyarlamalı kip, hedefli seviye ayarı);
+# açmak için çerçevedeki algoritma kimliği yeterlidir.
+# Her blok bağımsız sıkıştırıldığı için bloklar paralel sıkıştırılıp açılabilir;
+# dosya sonundaki dizin sayesinde istenen bayt aralığı yalnızca ilgili bloklar
+# açılarak okunabilir (bkz. seekable_reader).
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+
+_FRAME = struct.Struct("<BII")
+END_OF_BLOCKS = 0xFF
+
+INDEX_MAGIC = b"SIDX"
+_INDEX_ENTRY = struct.Struct("<QQII")
+_INDEX_TRAILER = struct.Struct("<QI4s")
+
+def _compress_block(block: bytes, compressor: Compressor, selector: Optional[CompressorSelector],
+                    data_filter: Optional[Filter] = None) -> Tuple[int, bytes]:
+    """
+    Tek bir bloğu (varsa önce filtreleyip) sıkıştırır ve (algoritma kimliği, veri) döndürür.
+    Uyarlamalı kipte (selector verilmişse) algoritma blok için ayrıca seçilir ve
+    sıkıştırma kazanç sağlamazsa blok sıkıştırılmadan (stored) saklanır.
+    """
+    if data_filter is not None:
+        block = data_filter.encode(block)
+    if selector is not None:
+        compressor = selector.select_block_compressor(block, compressor)
+    compressed = compressor.compress(block)
+    if selector is not None and len(compressed) >= len(block):
+        return CODEC_IDS["stored"], bytes(block)
+    return CODEC_IDS[compressor.get_name()], compressed
+
+def compress_blocks(src: BinaryIO, dst: BinaryIO, compressor: Compressor,
+                    block_size: int = DEFAULT_BLOCK_SIZE, workers: Optional[int] = None,
+                    adaptive: bool = False, block_stats: Optional[Counter] = None,
+                    data_filter: Optional[Filter] = None,
+                    level_controller: Optional[LevelController] = None,
+                    selector: Optional[CompressorSelector] = None) -> Tuple[int, int]:
+    """
+    Girdiyi sabit boyutlu bloklara bölüp bir iş parçacığı havuzunda paralel sıkıştırır
+    ve blokları sırasıyla çerçeveli kapsayıcıya yazar (başlık çağıran tarafından yazılır).
+    C tabanlı sıkıştırıcılar çalışırken GIL'i bıraktığı için verim çekirdek sayısıyla ölçeklenir.
+    Bellekte aynı anda en fazla 2 * workers blok bulunur.
+
+    adaptive True ise her blok için algoritma bloğun entropisine göre ayrıca seçilir (bkz.
+    CompressorSelector.select_block_compressor); karışık içerikli dosyalarda
+    sıkıştırılamaz bölümler 'stored' olarak saklanır. Seçim 'selector' ile yapılır (verilmezse
+    varsayılan seçici); böylece çağıranın profili, geçersiz kılmaları ve bellek bütçesi blok
+    algoritmalarına da uygulanır. Her bloğun algoritması çerçevesine yazıldığı için açma
+    tarafında ek bilgi gerekmez.
+    block_stats verilirse algoritma adı başına blok sayıları buraya eklenir.
+    data_filter verilirse her blok sıkıştırılmadan önce bu filtreden geçirilir; aynı filtre
+    açarken decompress_blocks'a verilmelidir.
+    level_controller verilirse her bloğun sıkıştırıcısı ondan alınır ve yazılan bloklar ona
+    bildirilir; denetleyici ölçülen hıza göre seviyeyi blokların arasında değiştirir (bkz. level_tuning).
+
+    Returns:
+        Tuple[int, int]: (okunan bayt sayısı, yazılan bayt sayısı)
+    """
+    if compressor.get_name() not in CODEC_IDS:
+        raise ValueError(f"Blok kipi yalnızca yerleşik algoritmaları destekler; '{compressor.get_name()}' "
+                         f"akış kipinde kullanılabilir.")
+    selector = (selector or CompressorSelector()) if adaptive else None
+    bytes_in = 0
+    bytes_out = 0
+    start_offset = dst.tell()
+    index = []
+
+    def write_frame(raw_size: int, codec_id: int, compressed: bytes):
+        raw_offset = index[-1][0] + index[-1][2] if index else 0
+        index.append((raw_offset, start_offset + bytes_out, raw_size, len(compressed)))
+        if block_stats is not None:
+            block_stats[CODEC_NAMES[codec_id]] += 1
+        dst.write(_FRAME.pack(codec_id, raw_size, len(compressed)))
+        dst.write(compressed)
+        if level_controller is not None:
+            level_controller.record(raw_size)
+        return _FRAME.size + len(compressed)
+
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        max_pending = 2 * workers
+        pending = deque()
+        while True:
+            block = src.read(block_size)
+            if not block:
+                break
+            bytes_in += len(block)
+            block_compressor = level_controller.next_compressor() if level_controller is not None else compressor
+            pending.append((len(block), pool.submit(_compress_block, block, block_compressor, selector, data_filter)))
+            if len(pending) >= max_pending:
+                raw_size, future = pending.popleft()
+                bytes_out += write_frame(raw_size, *future.result())
+        while pending:
+            raw_size, future = pending.popleft()
+            bytes_out += write_frame(raw_size, *future.result())
+
+    dst.write(_FRAME.pack(END_OF_BLOCKS, 0, 0))
+    bytes_out += _FRAME.size
+    bytes_out += write_index(dst, index, start_offset + bytes_out)
+    return bytes_in, bytes_out
+
+def write_index(dst: BinaryIO, index: List[Tuple[int, int, int, int]], index_offset: int) -> int:
+    """Blok dizinini ve kuyruğunu yazar; yazılan bayt sayısını döndürür."""
+    for entry in index:
+        dst.write(_INDEX_ENTRY.pack(*entry))
+    dst.write(_INDEX_TRAILER.pack(index_offset, len(index), INDEX_MAGIC))
+    return len(index) * _INDEX_ENTRY.size + _INDEX_TRAILER.size
+
+def read_index(f: BinaryIO) -> List[Tuple[int, int, int, int]]:
+    """
+    Dosyanın sonundaki blok dizinini okur. Yalnızca kuyruk ve dizin okunur, bloklar okunmaz.
+
+    Returns:
+        List[Tuple[int, int, int, int]]: Her blok için (orijinal konum, çerçeve konumu,
+                                         orijinal boyut, sıkıştırılmış boyut)
+    """
+    f.seek(0, os.SEEK_END)
+    file_size = f.tell()
+    if file_size < _INDEX_TRAILER.size:
+        raise ValueError("Dosyada blok dizini bulunamadı.")
+    f.seek(file_size - _INDEX_TRAILER.size)
+    index_offset, block_count, magic = _INDEX_TRAILER.unpack(f.read(_INDEX_TRAILER.size))
+    if magic != INDEX_MAGIC:
+        raise ValueError("Dosyada blok dizini bulunamadı.")
+    f.seek(index_offset)
+    data = _read_exact(f, block_count * _INDEX_ENTRY.size)
+    return [entry for entry in _INDEX_ENTRY.iter_unpack(data)]
+
+def _decompress_block(compressor: Compressor, payload: bytes, data_filter: Optional[Filter]) -> bytes:
+    data = compressor.decompress(payload)
+    return data_filter.decode(data) if data_filter is not None else data
+
+def read_block(f: BinaryIO, entry: Tuple[int, int, int, int], compressors: dict,
+               data_filter: Optional[Filter] = None) -> bytes:
+    """
+    Dizin girdisindeki tek bir bloğu okuyup açar (ve varsa filtresini çözer).
+    'compressors' kimliğe göre önbellektir.
+    """
+    _raw_offset, frame_offset, raw_size, compressed_size = entry
+    f.seek(frame_offset)
+    codec_id, frame_raw_size, frame_compressed_size = _FRAME.unpack(_read_exact(f, _FRAME.size))
+    if (frame_raw_size, frame_compressed_size) != (raw_size, compressed_size):
+        raise ValueError("Blok dizini ile çerçeve başlığı uyuşmuyor.")
+    if codec_id not in compressors:
+        if codec_id not in CODEC_NAMES:
+            raise ValueError(f"Bilinmeyen algoritma kimliği: {codec_id}")
+        compressors[codec_id] = CompressorSelector().available_compressors[CODEC_NAMES[codec_id]]()
+    data = _decompress_block(compressors[codec_id], _read_exact(f, compressed_size), data_filter)
+    if len(data) != raw_size:
+        raise ValueError("Açılan blok boyutu çerçevedeki boyutla eşleşmiyor.")
+    return data
+
+def _read_exact(f: BinaryIO, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("Blok kapsayıcı beklenmedik şekilde sona erdi.")
+    return data
+
+def decompress_blocks(src: BinaryIO, dst: BinaryIO, workers: Optional[int] = None,
+                      compressor: Optional[Compressor] = None, data_filter: Optional[Filter] = None) -> Tuple[int, int]:
+    """
+    Blok kapsayıcıdaki blokları paralel açar ve sırasıyla hedefe yazar.
+    Okuma konumu başlıktan sonraki ilk çerçevede olmalıdır.
+    Her bloğun algoritması çerçevesinden okunur. 'compressor' verilirse aynı
+    algoritmadaki bloklar bu örnekle açılır (ör. başlıktaki sözlükle yapılandırılmış zstd).
+    'data_filter' verilirse (başlıktaki filtre) her bloğun filtresi açıldıktan sonra çözülür.
+
+    Returns:
+        Tuple[int, int]: (okunan bayt sayısı, yazılan bayt sayısı)
+    """
+    available_compressors = CompressorSelector().available_compressors
+    compressors = {}
+    if compressor is not None:
+        compressors[CODEC_IDS[compressor.get_name()]] = compressor
+    bytes_in = 0
+    bytes_out = 0
+
+    def write_block(raw_size: int, future):
+        data = future.result()
+        if len(data) != raw_size:
+            raise ValueError("Açılan blok boyutu çerçevedeki boyutla eşleşmiyor.")
+        dst.write(data)
+        return raw_size
+
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        max_pending = 2 * workers
+        pending = deque()
+        while True:
+            codec_id, raw_size, compressed_size = _FRAME.unpack(_read_exact(src, _FRAME.size))
+            bytes_in += _FRAME.size
+            if codec_id == END_OF_BLOCKS:
+                break
+            if codec_id not in compressors:
+                if codec_id not in CODEC_NAMES:
+                    raise ValueError(f"Bilinmeyen algoritma kimliği: {codec_id}")
+                compressors[codec_id] = available_compressors[CODEC_NAMES[codec_id]]()
+            payload = _read_exact(src, compressed_size)
+            bytes_in += compressed_size
+            pending.append((raw_size, pool.submit(_decompress_block, compressors[codec_id], payload, data_filter)))
+            if len(pending) >= max_pending:
+                bytes_out += write_block(*pending.popleft())
+        while pending:
+            bytes_out += write_block(*pending.popleft())
+
+    return bytes_in, bytes_out
+
+if __name__ == "__main__":
+    import io
+    import time
+
+    print("--- block_container.py Modül Testleri ---")
+
+    original_data = (b"Bu bir deneme metnidir. Tekrar eden kelimeler icermektedir. " * 40000) + os.urandom(512 * 1024)
+    selector = CompressorSelector()
+
+    for name, compressor_class in selector.available_compressors.items():
+        compressed = io.BytesIO()
+        start = time.perf_counter()
+        compress_blocks(io.BytesIO(original_data), compressed, compressor_class(), block_size=256 * 1024)
+        elapsed = time.perf_counter() - start
+        compressed.seek(0)
+        restored = io.BytesIO()
+        decompress_blocks(compressed, restored)
+        status = "BAŞARILI" if restored.getvalue() == original_data else "HATA"
+        print(f"  {name:<10} {len(original_data)}B -> {len(compressed.getvalue())}B "
+              f"({len(original_data) / elapsed / 1e6:.1f} MB/s) Açma: {status}")
+
+    # Uyarlamalı kip: metin ve rastgele bölümler karışık bir dosyada blok başına seçim
+    mixed_data = b"".join((b"zaman=12:00 seviye=INFO mesaj=tamam\n" * 15000)[:512 * 1024] if i % 2 == 0
+                          else os.urandom(512 * 1024) for i in range(6))
+    for adaptive in (False, True):
+        compressed = io.BytesIO()
+        block_stats = Counter()
+        start = time.perf_counter()
+        compress_blocks(io.BytesIO(mixed_data), compressed, selector.available_compressors["lzma"](),
+                        block_size=256 * 1024, adaptive=adaptive, block_stats=block_stats)
+        elapsed = time.perf_counter() - start
+        compressed.seek(0)
+        restored = io.BytesIO()
+        decompress_blocks(compressed, restored)
+        status = "BAŞARILI" if restored.getvalue() == mixed_data else "HATA"
+        print(f"  Karışık veri, lzma, uyarlamalı={adaptive}: {len(mixed_data)}B -> {len(compressed.getvalue())}B "
+              f"({len(mixed_data) / elapsed / 1e6:.1f} MB/s) Bloklar: {dict(block_stats)} Açma: {status}")
+
+    # Çağıranın seçicisi ('max' profili, 16 MB bellek bütçesi) blok algoritmalarına da uygulanır.
+    # Yüksek entropili fakat sıkıştırılabilir bloklar brotli yerine Zstandard ile sıkıştırılır.
+    # (Rastgele bir havuzdan tekrarlanan parçalar: entropi yüksek, fakat uzak eşleşmeler var.)
+    import random
+    rng = random.Random(5)
+    pool = os.urandom(128 * 1024)
+    mixed_data += b"".join(pool[offset:offset + 4096] for offset in
+                           (rng.randrange(len(pool) - 4096) for _ in range(128)))
+    budget_selector = CompressorSelector(profile='max')
+    budget_selector.set_memory_budget(16 * 1024 * 1024, 256 * 1024)
+    for adaptive in (False, True):
+        compressed = io.BytesIO()
+        block_stats = Counter()
+        start = time.perf_counter()
+        compress_blocks(io.BytesIO(mixed_data), compressed, budget_selector.create_compressor("brotli"),
+                        block_size=256 * 1024, adaptive=adaptive, block_stats=block_stats, selector=budget_selector)
+        elapsed = time.perf_counter() - start
+        compressed.seek(0)
+        restored = io.BytesIO()
+        decompress_blocks(compressed, restored)
+        status = "BAŞARILI" if restored.getvalue() == mixed_data else "HATA"
+        print(f"  Karışık veri, brotli ('max', 16 MB), uyarlamalı={adaptive}: {len(mixed_data)}B -> "
+              f"{len(compressed.getvalue())}B ({len(mixed_data) / elapsed / 1e6:.1f} MB/s) "
+              f"Bloklar: {dict(block_stats)} Açma: {status}")
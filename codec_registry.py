@@ -0,0 +1,223 @@
+# akilli_sikistirma/codec_registry.py
+
+import importlib
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+from .compressors import (BrotliCompressor, BZ2Compressor, Compressor, LzmaCompressor, StoredCompressor,
+                          ZlibCompressor, ZstandardCompressor)
+from .utils import lazy_import
+
+# Ek algoritmaların kaydedildiği entry point grubu. Bir paket, pyproject.toml'da
+#   [project.entry-points."akilli_sikistirma.codecs"]
+#   lz4 = "paket.modul:Lz4Compressor"
+# ile bir Compressor alt sınıfı bildirir; entry point adı algoritmanın adıdır.
+ENTRY_POINT_GROUP = "akilli_sikistirma.codecs"
+
+# Yerleşik algoritmalar, seçicinin tercih sırasıyla.
+BUILTIN_CODECS: Dict[str, Type[Compressor]] = {
+    "zlib": ZlibCompressor,
+    "lzma": LzmaCompressor,
+    "bz2": BZ2Compressor,
+    "brotli": BrotliCompressor,
+    "zstandard": ZstandardCompressor,
+    "stored": StoredCompressor,
+}
+
+# Seçilen algoritmanın kütüphanesi kurulu değilse sırayla denenecek yedekler. zlib ve 'stored'
+# her Python kurulumunda bulunur.
+FALLBACK_CODECS = ("zstandard", "zlib", "stored")
+
+class CodecRegistry(Mapping):
+    """
+    Algoritma adından Compressor sınıfına eşleme (CompressorSelector.available_compressors).
+    Yalnızca kullanılabilir algoritmaları içerir: yerleşik algoritmalarda gereken kütüphanenin
+    kurulu olup olmadığı içe aktarmadan kontrol edilir, kütüphane ilk kullanımda yüklenir.
+    Entry point'lerle bildirilen ek algoritmalar, yerleşik olmayan bir ad ilk kez sorulduğunda
+    veya tüm algoritmalar listelendiğinde bulunur; sınıfları ilk kullanımda yüklenir.
+    """
+    def __init__(self, codecs: Dict[str, Type[Compressor]] = None, discover: bool = True):
+        self._codecs: Dict[str, Type[Compressor]] = dict(BUILTIN_CODECS if codecs is None else codecs)
+        self._available: Dict[str, bool] = {}
+        self._entry_points: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        self._discovered = not discover
+        self._lock = threading.Lock()
+
+    def _discover(self):
+        """Entry point grubundaki algoritmaları (yüklemeden) bulur."""
+        if self._discovered:
+            return
+        with self._lock:
+            if self._discovered:
+                return
+            try:
+                # importlib.metadata yalnızca keşif gerektiğinde yüklenir; başlangıç süresine eklenmez.
+                from importlib.metadata import entry_points
+                found = entry_points()
+                group = found.select(group=ENTRY_POINT_GROUP) if hasattr(found, 'select') else found.get(ENTRY_POINT_GROUP, [])
+                for entry_point in group:
+                    if entry_point.name not in self._codecs:
+                        self._entry_points.setdefault(entry_point.name, entry_point)
+            except Exception as e:
+                self._errors['<keşif>'] = str(e)
+            self._discovered = True
+
+    def register(self, name: str, compressor_class: Type[Compressor]):
+        """Bir algoritmayı programdan kaydeder (entry point gerektirmez)."""
+        with self._lock:
+            self._codecs[name] = compressor_class
+            self._entry_points.pop(name, None)
+            self._available.pop(name, None)
+            self._errors.pop(name, None)
+
+    def _load(self, name: str) -> Optional[Type[Compressor]]:
+        """Adın sınıfını döndürür; entry point'ler burada yüklenir. Bilinmeyen adlarda None."""
+        compressor_class = self._codecs.get(name)
+        if compressor_class is not None:
+            return compressor_class
+        if name not in self._entry_points:
+            self._discover()
+        entry_point = self._entry_points.get(name)
+        if entry_point is None:
+            return None
+        with self._lock:
+            if name in self._codecs:
+                return self._codecs[name]
+            try:
+                compressor_class = entry_point.load()
+                if not (isinstance(compressor_class, type) and issubclass(compressor_class, Compressor)):
+                    raise TypeError(f"'{entry_point.value}' bir Compressor alt sınıfı değil")
+            except Exception as e:
+                self._errors[name] = f"{type(e).__name__}: {e}"
+                self._available[name] = False
+                self._entry_points.pop(name)
+                self._codecs[name] = None
+                return None
+            self._codecs[name] = compressor_class
+            return compressor_class
+
+    def is_available(self, name: str) -> bool:
+        """Algoritma biliniyor ve gereken kütüphanesi kuruluysa True (kütüphaneyi yüklemez)."""
+        available = self._available.get(name)
+        if available is None:
+            compressor_class = self._load(name)
+            if compressor_class is None:
+                available = False
+            else:
+                requires = compressor_class.requires
+                available = requires is None or lazy_import(requires) is not None
+                if not available:
+                    self._errors[name] = f"'{requires}' modülü kurulu değil"
+            self._available[name] = available
+        return available
+
+    def is_known(self, name: str) -> bool:
+        """Algoritma adı yerleşik veya bir entry point ile bildirilmişse True (kurulu olmasa da)."""
+        if name in self._codecs:
+            return True
+        self._discover()
+        return name in self._entry_points
+
+    def missing_reason(self, name: str) -> str:
+        """Algoritmanın neden kullanılamadığını açıklayan mesaj."""
+        if not self.is_known(name):
+            return f"Bilinmeyen sıkıştırma algoritması adı '{name}'."
+        self.is_available(name)
+        return f"'{name}' algoritması kullanılamıyor: {self._errors.get(name, 'bilinmeyen hata')}."
+
+    def fallback(self, name: str) -> str:
+        """Algoritma kullanılabilirse adını, değilse ilk kullanılabilir yedeği döndürür."""
+        if self.is_available(name):
+            return name
+        return next(candidate for candidate in FALLBACK_CODECS if self.is_available(candidate))
+
+    def _names(self) -> List[str]:
+        """Yerleşik, kayıtlı ve entry point algoritmalarının adları (yüklenen entry point'ler bir kez)."""
+        return list(dict.fromkeys(list(self._codecs) + list(self._entry_points)))
+
+    def availability_report(self) -> List[Dict[str, Any]]:
+        """
+        Bilinen tüm algoritmaların durumu: ad, kaynak (yerleşik veya entry point), kullanılabilirlik,
+        kütüphane sürümü ve hata. Kütüphaneler gerçekten içe aktarılır; kurulu görünen fakat
+        yüklenemeyen (ör. bozuk C eklentisi) kütüphaneler de burada yakalanır.
+        """
+        self._discover()
+        report = []
+        for name in self._names():
+            entry_point = self._entry_points.get(name)
+            source = f"entry point ({entry_point.value})" if entry_point is not None else "yerleşik"
+            if name not in BUILTIN_CODECS and entry_point is None:
+                source = "kayıtlı" if self._codecs.get(name) is not None else "entry point"
+            available = self.is_available(name)
+            version = None
+            if available and self._codecs[name].requires is not None:
+                try:
+                    module = importlib.import_module(self._codecs[name].requires)
+                    version = getattr(module, 'ZLIB_RUNTIME_VERSION', None) or getattr(module, '__version__', None)
+                except Exception as e:
+                    available = self._available[name] = False
+                    self._errors[name] = f"{type(e).__name__}: {e}"
+            report.append({'name': name, 'source': source, 'available': available,
+                           'requires': self._codecs[name].requires if self._codecs.get(name) is not None else None,
+                           'version': version, 'error': None if available else self._errors.get(name)})
+        return report
+
+    def __getitem__(self, name: str) -> Type[Compressor]:
+        if not self.is_available(name):
+            raise KeyError(name)
+        return self._codecs[name]
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.is_available(name)
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover()
+        for name in self._names():
+            if self.is_available(name):
+                yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+# Süreç genelinde paylaşılan kayıt defteri.
+default_registry = CodecRegistry()
+
+def print_availability_report(registry: CodecRegistry = None):
+    """Algoritmaların kullanılabilirlik raporunu yazdırır."""
+    for entry in (registry or default_registry).availability_report():
+        status = "kullanılabilir" if entry['available'] else f"YOK ({entry['error']})"
+        version = f" {entry['version']}" if entry['version'] else ""
+        print(f"  {entry['name']:<10} {status}{version} [{entry['source']}]")
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    print("--- codec_registry.py Modül Testleri ---")
+
+    start = time.perf_counter()
+    names = list(default_registry)
+    print(f"  Kullanılabilir algoritmalar: {', '.join(names)} ({(time.perf_counter() - start) * 1000:.1f} ms)")
+    print(f"  Listeleme kütüphaneleri yüklemedi: "
+          f"{'BAŞARILI' if 'zstandard' not in sys.modules and '_brotli' not in sys.modules else 'HATA'}")
+
+    data = b"tembel yukleme " * 1000
+    for name in names:
+        compressor = default_registry[name]()
+        assert compressor.decompress(compressor.compress(data)) == data
+    print(f"  Tüm algoritmalar ilk kullanımda yüklendi ve geri açıldı: {'BAŞARILI' if 'zstandard' in sys.modules else 'HATA'}")
+
+    # Kurulu olmayan bir kütüphaneye ihtiyaç duyan algoritma listede görünmez, yedeğe düşülür.
+    class _MissingCompressor(ZlibCompressor):
+        requires = "bu_modul_kurulu_degil"
+
+    registry = CodecRegistry(discover=False)
+    registry.register("eksik", _MissingCompressor)
+    print(f"  Eksik kütüphane: listede yok={'eksik' not in registry}, yedek={registry.fallback('eksik')}")
+    print(f"  Mesaj: {registry.missing_reason('eksik')}")
+    print(f"  Bilinmeyen ad: {registry.missing_reason('lz4')}")
+
+    print("\n  Kullanılabilirlik raporu:")
+    print_availability_report()
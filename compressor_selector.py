@@ -1,57 +1,483 @@
 # akilli_sikistirma/compressor_selector.py
 
-from .compressors import ZlibCompressor, LzmaCompressor, BZ2Compressor, BrotliCompressor, ZstandardCompressor, Compressor
-from typing import Dict, Any, Type
+from .compressors import Compressor
+from .codec_registry import CodecRegistry, default_registry
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+import time
+
+from .data_analyzer import block_entropy
+from .dictionary_store import DictionaryStore
+from .filters import BCJFilter, DeltaFilter, Filter, TransposeFilter
+from .memory_budget import MEMORY_FALLBACK, fit_compressor, format_memory
+from .level_tuning import (CALIBRATION_CUTOFF, CALIBRATION_GROWTH, CALIBRATION_LEVELS, CALIBRATION_SAMPLE_SIZE, PARALLEL_EFFICIENCY,
+                           TARGET_HEADROOM, LevelController, ThroughputTarget, build_ladder, setting_label)
+from .profiles import DEFAULT_PROFILE, codec_params
+
+# Deneme sıkıştırmasında kazananı belirleyen hedefler:
+#   'ratio':         En yüksek sıkıştırma oranı.
+#   'speed':         En yüksek sıkıştırma hızı (MB/CPU-saniye).
+#   'ratio_per_cpu': CPU saniyesi başına düşen sıkıştırma oranı.
+TRIAL_OBJECTIVES = ('ratio', 'speed', 'ratio_per_cpu')
+
+# Deneme sıkıştırması için dosyadan örneklenecek blok sayısı.
+TRIAL_SAMPLE_BLOCKS = 8
+
+# Hızlı deneme sıkıştırmasında oran bu değerin altında kalırsa veri
+# sıkıştırılamaz kabul edilir ve 'stored' (sıkıştırmasız) saklanır.
+INCOMPRESSIBLE_RATIO_THRESHOLD = 1.05
+
+# Blok başına seçimde daha sıkı eşik: yalnızca neredeyse hiç kazanç sağlamayan
+# bloklar saklanır, kısmen sıkıştırılabilir bloklarda oran kaybedilmez.
+BLOCK_INCOMPRESSIBLE_RATIO_THRESHOLD = 1.01
+
+# Eğitilmiş bir sözlük varsa bu boyuta kadar olan dosyalar sözlükle sıkıştırılır.
+# Sözlüğün kazancı küçük dosyalarda büyüktür; dosya büyüdükçe kendi içeriği bağlam sağlar.
+DICTIONARY_FILE_SIZE_LIMIT = 64 * 1024
+
+# Sıkıştırılamazlık kontrolünde denenecek en fazla örnek boyutu.
+INCOMPRESSIBLE_CHECK_SIZE = 1024 * 1024
+
+# Analizin önerdiği filtre, örnek üzerinde en az bu göreli kazancı sağlamazsa uygulanmaz.
+FILTER_MIN_GAIN = 0.03
+
+# Filtre denemesinde kullanılan en fazla örnek boyutu.
+FILTER_PROBE_SIZE = 256 * 1024
+
+# Genellikle zaten sıkıştırılmış içerik taşıyan dosya uzantıları.
+COMPRESSED_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.mp3', '.mp4', '.mkv',
+                         '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.br', '.7z', '.rar', '.comp']
 
 class CompressorSelector:
     """
     Dosya analiz sonuçlarına göre en uygun sıkıştırma algoritmasını seçer.
-    Kural tabanlı bir seçim yapar.
+    Varsayılan olarak kural tabanlı bir seçim yapar; select_compressor_by_trial
+    ise örnek bloklar üzerinde tüm algoritmaları deneyerek seçim yapar.
+    select_compressor_for_target, bir hız veya son tarih hedefi için algoritma ve seviyeyi
+    örnek üzerinde kalibre ederek seçer (bkz. level_tuning).
+
+    dictionary_store verilirse ve depoda etkin bir sözlük varsa küçük dosyalar
+    bu sözlükle Zstandard'a yönlendirilir (bkz. dictionary_store).
+
+    profile ('fast', 'balanced', 'max') seçilen algoritmanın seviye, pencere ve iş parçacığı
+    ayarlarını belirler; codec_overrides algoritma başına bu ayarları geçersiz kılar
+    (ör. {'zstandard': {'level': 12}}). Bkz. profiles.
+
+    memory_limit verilirse (bayt) oluşturulan her sıkıştırıcının seviyesi, penceresi (lzma'da sözlük
+    boyutu) ve zstd iş parçacıkları tahmini sıkıştırma ve açma belleği sınıra sığacak şekilde ayarlanır;
+    algoritma en küçük ayarlarıyla da sığmıyorsa yedeklerinden sığan ilki kullanılır (bkz. memory_budget).
+
+    Son seçimin gerekçesi last_decision_reason'da, filtre seçiminin gerekçesi
+    last_filter_reason'da tutulur (bkz. instrumentation).
+
+    available_compressors, kurulu algoritmaların kayıt defteridir (bkz. codec_registry); kuralların
+    seçtiği algoritmanın kütüphanesi kurulu değilse kurulu bir yedek kullanılır.
     """
-    def __init__(self):
-        self.available_compressors: Dict[str, Type[Compressor]] = {
-            "zlib": ZlibCompressor,
-            "lzma": LzmaCompressor,
-            "bz2": BZ2Compressor,
-            "brotli": BrotliCompressor,
-            "zstandard": ZstandardCompressor
-        }
+    def __init__(self, dictionary_store: DictionaryStore = None, profile: str = DEFAULT_PROFILE,
+                 codec_overrides: Dict[str, Dict[str, int]] = None, memory_limit: Optional[int] = None):
+        self.dictionary_store = dictionary_store
+        self.dict_id = dictionary_store.current_id() if dictionary_store is not None else None
+        self.profile = profile
+        self.codec_overrides = codec_overrides or {}
+        self.last_decision_reason: Optional[str] = None
+        self.last_filter_reason: Optional[str] = None
+        self.memory_limit = memory_limit
+        self.memory_data_size: Optional[int] = None
+        codec_params(profile, "zstandard", self.codec_overrides)  # Geçersiz profil adı burada yakalanır.
+        self.available_compressors: CodecRegistry = default_registry
+
+    def set_memory_budget(self, memory_limit: Optional[int], data_size: Optional[int] = None):
+        """
+        Bundan sonra oluşturulan sıkıştırıcıların bellek sınırını (bayt, None: sınırsız) ayarlar.
+        data_size, tek seferde sıkıştırılacak en büyük veri (ör. blok boyutu); pencere bundan büyük tutulmaz.
+        """
+        self.memory_limit = memory_limit
+        self.memory_data_size = data_size
+
+    def fit_memory(self, compressor: Compressor) -> Compressor:
+        """
+        Sıkıştırıcıyı bellek sınırına sığdırır (bkz. memory_budget.fit_compressor); sınır yoksa
+        olduğu gibi döndürür. Algoritma sığmıyorsa MEMORY_FALLBACK yedeklerinden sığan ilki döner.
+        """
+        if self.memory_limit is None:
+            return compressor
+        fitted = fit_compressor(compressor, self.memory_limit, self.memory_data_size)
+        if fitted is not None:
+            return fitted
+        for name in MEMORY_FALLBACK:
+            if name != compressor.get_name() and name in self.available_compressors:
+                fitted = fit_compressor(self._new_compressor(name), self.memory_limit, self.memory_data_size)
+                if fitted is not None:
+                    print(f"  Uyarı: {compressor.get_name()} bellek sınırına ({format_memory(self.memory_limit)}) "
+                          f"sığmıyor. Yerine {name} kullanılıyor.")
+                    return fitted
+        return self._new_compressor("stored")
+
+    def fits_memory(self, name: str) -> bool:
+        """Algoritmanın (en küçük ayarlarıyla) bellek sınırına sığıp sığmadığını döndürür."""
+        return (self.memory_limit is None
+                or fit_compressor(self._new_compressor(name), self.memory_limit, self.memory_data_size) is not None)
+
+    def _new_compressor(self, name: str, **kwargs) -> Compressor:
+        params = codec_params(self.profile, name, self.codec_overrides)
+        return self.available_compressors[name].from_params(params, **kwargs)
+
+    def create_compressor(self, name: str, **kwargs) -> Compressor:
+        """
+        Algoritmayı profilin ve geçersiz kılmaların parametreleriyle oluşturur ve bellek sınırı
+        varsa ona sığdırır. Algoritmanın kütüphanesi kurulu değilse kurulu ilk yedek
+        (bkz. codec_registry) oluşturulur.
+        """
+        fallback = self.available_compressors.fallback(name)
+        if fallback != name:
+            print(f"  Uyarı: {self.available_compressors.missing_reason(name)} Yerine {fallback} kullanılıyor.")
+            name = fallback
+        return self.fit_memory(self._new_compressor(name, **kwargs))
+
+    def compressor_from_header(self, name: str, params: Dict[str, Any]) -> Compressor:
+        """
+        Açma için, .comp başlığında kayıtlı algoritma adı ve parametrelerden sıkıştırıcı oluşturur.
+        Başlıkta sözlük kimliği varsa sözlük seçicinin deposundan (yoksa varsayılan depodan) yüklenir.
+        """
+        compressor_class = self.available_compressors.get(name)
+        if compressor_class is None:
+            raise ValueError(self.available_compressors.missing_reason(name))
+        if params.get('dict_id') is not None:
+            return compressor_class.from_params(params, dictionary_store=self.dictionary_store or DictionaryStore())
+        return compressor_class.from_params(params)
+
+    def _report_decision(self, reason: str):
+        """Seçim gerekçesini yazdırır ve ölçüm olaylarına eklenmek üzere saklar."""
+        self.last_decision_reason = reason
+        print(f"  [Seçim]: {reason}")
+
+    def _report_filter(self, reason: str):
+        """Filtre seçiminin gerekçesini yazdırır ve saklar."""
+        self.last_filter_reason = reason
+        print(f"  [Filtre]: {reason}")
+
+    def select_filter(self, analysis_results: Dict[str, Any], compressor: Compressor,
+                      sample: Optional[bytes] = None, min_throughput_mb_s: Optional[float] = None) -> Optional[Filter]:
+        """
+        Analizin bulduğu yapıya (bkz. data_analyzer.detect_structure) göre sıkıştırmadan önce
+        uygulanacak filtreyi seçer: sayısal dizilere delta, CSV/TSV'ye sütun dönüşümü (transpose),
+        x86 çalıştırılabilir dosyalara BCJ. Seçilen algoritma lzma ise çalıştırılabilir dosyalarda
+        ayrı bir filtre yerine lzma'nın kendi BCJ filtresi algoritmanın parametrelerine eklenir.
+
+        sample verilirse filtre önce örnek üzerinde hızlı bir algoritmayla denenir ve
+        FILTER_MIN_GAIN kadar kazanç sağlamazsa uygulanmaz. min_throughput_mb_s verilirse (hedefli seviye
+        ayarı) örnekte ölçülen filtre hızı bu değerin altında kalan filtre de uygulanmaz.
+
+        Returns:
+            Filter or None: Uygulanacak filtre; filtre gerekmiyorsa None.
+        """
+        self.last_filter_reason = None
+        structure = analysis_results.get('structure')
+        if structure is None or compressor.get_name() == "stored" or getattr(compressor, 'dict_id', None) is not None:
+            return None
 
-    def select_compressor(self, analysis_results: Dict[str, Any]) -> Compressor:
+        kind = structure['kind']
+        if kind == 'executable':
+            if compressor.get_name() == "lzma":
+                compressor.bcj = structure['arch']
+                self._report_filter(f"Çalıştırılabilir dosya ({structure['arch']}). lzma'nın BCJ filtresi eklendi.")
+                return None
+            if structure['arch'] != "x86":
+                return None
+            data_filter, description = BCJFilter(), f"Çalıştırılabilir dosya ({structure['arch']})"
+        elif kind == 'delimited':
+            data_filter, description = TransposeFilter(structure['delimiter']), f"Ayraçlı metin ({structure['delimiter']!r})"
+        elif kind == 'numeric':
+            data_filter, description = DeltaFilter(structure['stride']), f"Sayısal dizi (adım {structure['stride']} bayt)"
+        else:
+            return None
+
+        if not sample:
+            self._report_filter(f"{description}. {data_filter.describe()} filtresi seçildi.")
+            return data_filter
+        sample = sample[:FILTER_PROBE_SIZE]
+        probe = self.available_compressors[self.available_compressors.fallback("zstandard")]()
+        raw_size = len(probe.compress(sample))
+        start = time.thread_time()
+        filtered = data_filter.encode(sample)
+        filter_mb_s = len(sample) / max(time.thread_time() - start, 1e-9) / 1e6
+        if min_throughput_mb_s is not None and filter_mb_s < min_throughput_mb_s:
+            self._report_filter(f"{description}, fakat {data_filter.describe()} filtresi hedef hız için yavaş "
+                                f"({filter_mb_s:.1f} MB/s < {min_throughput_mb_s:.1f} MB/s). Filtre uygulanmadı.")
+            return None
+        filtered_size = len(probe.compress(filtered))
+        if filtered_size > raw_size * (1 - FILTER_MIN_GAIN):
+            self._report_filter(f"{description}, fakat {data_filter.describe()} filtresi örnekte kazanç sağlamadı "
+                                f"({raw_size}B -> {filtered_size}B). Filtre uygulanmadı.")
+            return None
+        self._report_filter(f"{description}. {data_filter.describe()} filtresi seçildi "
+                            f"(örnekte {raw_size}B -> {filtered_size}B).")
+        return data_filter
+
+    def is_incompressible(self, sample: bytes, threshold: float = INCOMPRESSIBLE_RATIO_THRESHOLD) -> bool:
+        """
+        Örnek veriyi hızlı bir algoritmayla deneyerek sıkıştırılamaz olup olmadığını
+        kontrol eder. Oran eşik değerin altında kalırsa True döner.
+        """
+        sample = sample[:INCOMPRESSIBLE_CHECK_SIZE]
+        if not sample:
+            return False
+        probe = self.available_compressors.fallback("zstandard")
+        compressed_size = len(self.available_compressors[probe]().compress(sample))
+        return len(sample) / compressed_size < threshold
+
+    def select_block_compressor(self, block: bytes, default: Compressor) -> Compressor:
+        """
+        Tek bir blok için bloğun kendi entropisine göre algoritma seçer (blok kapsayıcıda blok
+        başına seçim); kural select_compressor'ın yüksek entropi kuralıdır. Yüksek entropili bloklar
+        hızlıca denenir: sıkıştırılamazsa 'stored', sıkıştırılabilirse Zstandard seçilir (ör. lzma
+        seçilmiş bir dosyanın sıkıştırılmış bölümlerinde lzma yalnızca CPU yakar). Diğer bloklar dosya
+        için seçilen 'default' algoritmayla sıkıştırılır. Algoritmalar profilin ve geçersiz kılmaların
+        parametreleriyle oluşturulur ve bellek sınırına sığdırılır (bkz. create_compressor); blok
+        kipinde bloklar zaten paralel sıkıştırıldığından kendi iş parçacıkları kapatılır.
+        Blok başına çıktı yazdırılmaz ve seçicinin durumu değişmez; seçici blokları sıkıştıran
+        iş parçacıkları arasında paylaşılabilir.
+        """
+        if block_entropy(block) <= 7.5:
+            return default
+        name = "stored" if self.is_incompressible(block, BLOCK_INCOMPRESSIBLE_RATIO_THRESHOLD) else "zstandard"
+        if name == default.get_name():
+            return default
+        compressor = self.create_compressor(name)
+        if getattr(compressor, 'threads', 0):
+            compressor.threads = 0
+        return compressor
+
+    def select_compressor(self, analysis_results: Dict[str, Any], sample: Optional[bytes] = None) -> Compressor:
         """
         Analiz sonuçlarına göre en uygun sıkıştırma algoritmasını seçer.
+
+        Args:
+            analysis_results (dict): data_analyzer tarafından üretilen analiz sonuçları.
+            sample (bytes, optional): Dosyadan bir örnek. Verilirse yüksek entropili veya
+                                      zaten sıkıştırılmış görünen dosyalarda hızlı bir deneme
+                                      sıkıştırması yapılır ve sıkıştırılamaz veri 'stored' ile saklanır.
         """
         file_size = analysis_results.get('file_size', 0)
         entropy = analysis_results.get('entropy', 0.0)
         file_extension = analysis_results.get('file_extension', '')
         
         # Güncellenmiş Kural Seti:
+        if (self.dict_id is not None and file_size <= DICTIONARY_FILE_SIZE_LIMIT and entropy <= 7.5
+                and "zstandard" in self.available_compressors):
+            self._report_decision(f"Küçük dosya ({file_size}B). Eğitilmiş sözlükle ({self.dict_id}) Zstandard seçildi.")
+            # Sözlüklü sıkıştırmada profilden yalnızca seviye kullanılır.
+            level = codec_params(self.profile, "zstandard", self.codec_overrides).get('level', 3)
+            return self.fit_memory(self.available_compressors["zstandard"](level=level, dict_id=self.dict_id,
+                                                                           dictionary_store=self.dictionary_store))
+
         if file_size < 1000: # 1KB'tan küçük dosyalar
-            print(f"  [Seçim]: Çok küçük dosya ({file_size}B). Hızlı Zstandard seçildi.")
-            return self.available_compressors["zstandard"]()
+            self._report_decision(f"Çok küçük dosya ({file_size}B). Hızlı Zstandard seçildi.")
+            return self.create_compressor("zstandard")
 
-        if entropy > 7.5: # Yüksek entropili dosyalar
-            print(f"  [Seçim]: Yüksek entropili dosya ({entropy:.2f} bit/bayt). LZMA deneniyor (maksimum sıkıştırma).")
-            return self.available_compressors["lzma"]()
+        # Yüksek entropili veya zaten sıkıştırılmış görünen dosyalar: LZMA burada
+        # yalnızca CPU yakar. Örnek üzerinde hızlı bir deneme yapılır ve kazanç
+        # yoksa veri olduğu gibi saklanır.
+        if entropy > 7.5 or file_extension in COMPRESSED_EXTENSIONS:
+            if (analysis_results.get('structure') or {}).get('kind') == 'numeric':
+                # Gürültülü sayısal diziler (ör. ses örnekleri) ham haliyle sıkıştırılamaz görünür;
+                # kazancı delta filtresi sağlar (bkz. select_filter).
+                self._report_decision(f"Yüksek entropili sayısal dizi ({entropy:.2f} bit/bayt). Delta filtresiyle denenmek üzere Zstandard seçildi.")
+                return self.create_compressor("zstandard")
+            if sample is not None:
+                if self.is_incompressible(sample):
+                    self._report_decision(f"Sıkıştırılamaz veri ({entropy:.2f} bit/bayt). Sıkıştırmasız saklama (stored) seçildi.")
+                    return self.create_compressor("stored")
+                self._report_decision(f"Yüksek entropili fakat sıkıştırılabilir veri ({entropy:.2f} bit/bayt). Zstandard seçildi.")
+                return self.create_compressor("zstandard")
+            if file_extension in COMPRESSED_EXTENSIONS:
+                self._report_decision(f"Zaten sıkıştırılmış dosya tipi ({file_extension}). Sıkıştırmasız saklama (stored) seçildi.")
+                return self.create_compressor("stored")
+            self._report_decision(f"Yüksek entropili dosya ({entropy:.2f} bit/bayt). Hızlı Zstandard seçildi.")
+            return self.create_compressor("zstandard")
+
+        structure = analysis_results.get('structure') or {}
+        if structure.get('kind') == 'executable':
+            # Makine kodu için en iyi oran lzma ve BCJ filtresiyle elde edilir (bkz. select_filter).
+            self._report_decision(f"Çalıştırılabilir dosya ({structure['arch']}). LZMA seçildi.")
+            return self.create_compressor("lzma")
 
         if file_extension in ['.html', '.css', '.js', '.json', '.xml']:
-            print(f"  [Seçim]: Web veya yapısal metin dosyası ({file_extension}). Brotli seçildi.")
-            return self.available_compressors["brotli"]()
+            self._report_decision(f"Web veya yapısal metin dosyası ({file_extension}). Brotli seçildi.")
+            return self.create_compressor("brotli")
         
         if file_extension in ['.txt', '.log', '.csv', '.py', '.md']:
-            print(f"  [Seçim]: Genel metin/kod dosyası ({file_extension}). Zstandard (hız ve oran dengesi) seçildi.")
-            return self.available_compressors["zstandard"]()
+            self._report_decision(f"Genel metin/kod dosyası ({file_extension}). Zstandard (hız ve oran dengesi) seçildi.")
+            return self.create_compressor("zstandard")
 
         if entropy < 4.0: # Çok düşük entropili (çok tekrar eden) veriler
-            print(f"  [Seçim]: Çok düşük entropili dosya ({entropy:.2f} bit/bayt). LZMA (yüksek sıkıştırma oranı) seçildi.")
-            return self.available_compressors["lzma"]()
+            self._report_decision(f"Çok düşük entropili dosya ({entropy:.2f} bit/bayt). LZMA (yüksek sıkıştırma oranı) seçildi.")
+            return self.create_compressor("lzma")
 
         # Varsayılan veya bilinmeyen dosya tipleri için Zstandard iyi bir genel çözümdür.
-        print(f"  [Seçim]: Genel dosya tipi. Zstandard varsayılan olarak seçildi.")
-        return self.available_compressors["zstandard"]()
+        self._report_decision(f"Genel dosya tipi. Zstandard varsayılan olarak seçildi.")
+        return self.create_compressor("zstandard")
+
+    def record_outcome(self, analysis_results: Dict[str, Any], codec_name: str, original_size: int,
+                       compressed_size: int, cpu_seconds: float):
+        """
+        Bir dosyanın sıkıştırma sonucunu bildirir. Kural tabanlı seçici sonuçları kullanmaz;
+        öğrenen seçici (bkz. learned_selector) bunları modeline ekler.
+        """
+
+    def _trial_compress(self, name: str, samples: List[bytes], level: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Örnek blokları tek bir algoritmayla sıkıştırır ve ölçümleri döndürür.
+        CPU süresi iş parçacığına özgü ölçülür (time.thread_time), böylece
+        paralel çalışan diğer denemeler sonuçları bozmaz. level verilirse profilin
+        seviyesi yerine bu seviye kullanılır.
+        """
+        compressor = self.create_compressor(name)
+        if level is not None:
+            compressor.level = level
+            compressor = self.fit_memory(compressor)
+        # CPU süresi yalnızca bu iş parçacığında ölçüldüğünden algoritmanın kendi
+        # iş parçacıkları (zstd threads) denemede kapatılır.
+        if getattr(compressor, 'threads', 0):
+            compressor.threads = 0
+        original_size = sum(len(sample) for sample in samples)
+
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        compressed_size = sum(len(compressor.compress(sample)) for sample in samples)
+        cpu_time = max(time.thread_time() - cpu_start, 1e-9)
+        wall_time = max(time.perf_counter() - wall_start, 1e-9)
+
+        ratio = original_size / compressed_size if compressed_size > 0 else 0.0
+        return {
+            'name': name,
+            'level': getattr(compressor, 'level', None),
+            'original_size': original_size,
+            'compressed_size': compressed_size,
+            'ratio': ratio,
+            'cpu_time': cpu_time,
+            'wall_time': wall_time,
+            'throughput_mb_s': original_size / cpu_time / 1e6,
+            'ratio_per_cpu_second': ratio / cpu_time
+        }
+
+    def select_compressor_by_trial(self, samples: List[bytes], objective: str = 'ratio',
+                                   max_workers: Optional[int] = None) -> Tuple[Compressor, List[Dict[str, Any]]]:
+        """
+        Örnek blokları kayıtlı tüm algoritmalarla eşzamanlı olarak sıkıştırır ve
+        seçilen hedefe göre en iyisini döndürür. C tabanlı sıkıştırıcılar GIL'i
+        bıraktığı için denemeler bir iş parçacığı havuzunda paralel çalışır.
+
+        Args:
+            samples (List[bytes]): Dosyadan alınmış örnek bloklar (bkz. data_analyzer.read_sample_blocks).
+            objective (str): 'ratio', 'speed' veya 'ratio_per_cpu'.
+            max_workers (int, optional): Havuzdaki iş parçacığı sayısı. Varsayılan: algoritma sayısı.
+
+        Returns:
+            Tuple[Compressor, List[dict]]: (seçilen sıkıştırıcı, tüm deneme sonuçları;
+                                           en iyiden en kötüye sıralı)
+        """
+        if objective not in TRIAL_OBJECTIVES:
+            raise ValueError(f"Bilinmeyen hedef '{objective}'. Geçerli hedefler: {', '.join(TRIAL_OBJECTIVES)}")
+
+        # 'stored' denemeye katılmaz; hız hedefinde her zaman kazanırdı. Bellek sınırına sığmayan
+        # algoritmalar da denenmez.
+        names = [name for name in self.available_compressors if name != "stored" and self.fits_memory(name)]
+        with ThreadPoolExecutor(max_workers=max_workers or len(names)) as pool:
+            trial_results = list(pool.map(lambda name: self._trial_compress(name, samples), names))
+
+        score_key = {
+            'ratio': 'ratio',
+            'speed': 'throughput_mb_s',
+            'ratio_per_cpu': 'ratio_per_cpu_second'
+        }[objective]
+        trial_results.sort(key=lambda result: result[score_key], reverse=True)
+
+        best = trial_results[0]
+        if max(result['ratio'] for result in trial_results) < INCOMPRESSIBLE_RATIO_THRESHOLD:
+            self._report_decision(f"Deneme sıkıştırmasında hiçbir algoritma kazanç sağlamadı. Sıkıştırmasız saklama (stored) seçildi.")
+            return self.create_compressor("stored"), trial_results
+        self._report_decision(f"Deneme sıkıştırması ({objective}) sonucu {best['name']} seçildi "
+                              f"(oran {best['ratio']:.2f}x, {best['throughput_mb_s']:.1f} MB/s).")
+        return self.create_compressor(best['name']), trial_results
+
+    def select_compressor_for_target(self, samples: List[bytes], target: ThroughputTarget,
+                                     parallelism: int = 1) -> Tuple[Compressor, LevelController]:
+        """
+        Hız veya son tarih hedefi için algoritma ve seviye seçer. Her algoritmanın seviyeleri
+        (bkz. level_tuning.CALIBRATION_LEVELS) örnek üzerinde paralel ve hedefin süresiyle orantılı bir
+        süre sınırı içinde kalibre edilir (bkz. ThroughputTarget.calibration_seconds); tahmini hızı
+        (tek çekirdek hızı x parallelism x PARALLEL_EFFICIENCY) gereken hızı TARGET_HEADROOM payıyla
+        karşılayan en güçlü ayar seçilir. Hiçbir ayar hedefi karşılamıyorsa en hızlı ayar seçilir.
+        Son tarih hedefinde gereken hız, kalibrasyonun harcadığı süre düşülerek hesaplanır.
+
+        Args:
+            samples (List[bytes]): Dosyadan örnek bloklar; en fazla CALIBRATION_SAMPLE_SIZE bayt kullanılır.
+            target (ThroughputTarget): Hız veya son tarih hedefi.
+            parallelism (int): Dosyayı sıkıştıracak iş parçacığı sayısı (blok kipi).
+
+        Returns:
+            Tuple[Compressor, LevelController]: (seçilen sıkıştırıcı, sıkıştırma sırasında seviyeyi
+                                                ayarlayacak denetleyici; kalibrasyon sonuçlarını taşır)
+        """
+        calibration_samples, size = [], 0
+        for sample in samples:
+            if size >= CALIBRATION_SAMPLE_SIZE:
+                break
+            if sample:
+                calibration_samples.append(sample[:CALIBRATION_SAMPLE_SIZE - size])
+                size += len(calibration_samples[-1])
+        if not calibration_samples:
+            # Boş dosya: kalibre edilecek veri yok; tek basamaklı merdiven 'stored'.
+            stored = self._trial_compress("stored", [])
+            controller = LevelController(self, [stored], 0, target, parallelism, [stored])
+            self._report_decision("Boş dosya; kalibrasyon atlandı. Sıkıştırmasız saklama (stored) seçildi.")
+            return controller.compressor(), controller
+        scale = parallelism * PARALLEL_EFFICIENCY
+        required = target.required_mb_s()
+        calibration_deadline = time.perf_counter() + target.calibration_seconds()
+
+        def calibrate(name: str) -> List[Dict[str, Any]]:
+            # Kütüphanenin ilk çağrıdaki hazırlık maliyeti (bağlam, tablolar) ilk seviyenin ölçümüne katılmaz.
+            self._trial_compress(name, [calibration_samples[0][:64 * 1024]], CALIBRATION_LEVELS[name][0])
+            results = []
+            for level in CALIBRATION_LEVELS[name]:
+                result = self._trial_compress(name, calibration_samples, level)
+                if results and result['level'] <= results[-1]['level']:
+                    # Bellek sınırı daha yüksek seviyeleri zaten denenmiş bir seviyeye indiriyor.
+                    break
+                results.append(result)
+                if (results[-1]['throughput_mb_s'] * scale < required * CALIBRATION_CUTOFF
+                        or time.perf_counter() + results[-1]['wall_time'] * CALIBRATION_GROWTH > calibration_deadline):
+                    break
+            return results
+
+        names = [name for name in CALIBRATION_LEVELS if name in self.available_compressors and self.fits_memory(name)]
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            calibration = [result for results in pool.map(calibrate, names) for result in results]
+        # 'stored' her zaman en hızlı ayardır: son tarih başka türlü tutturulamıyorsa merdivenin son basamağı.
+        calibration.append(self._trial_compress("stored", calibration_samples))
+        calibration.sort(key=lambda result: result['ratio'], reverse=True)
+
+        ladder = build_ladder(calibration)
+        required = target.required_mb_s()
+        feasible = [index for index, result in enumerate(ladder)
+                    if result['throughput_mb_s'] * scale >= required * TARGET_HEADROOM]
+        index = feasible[-1] if feasible else 0
+        controller = LevelController(self, ladder, index, target, parallelism, calibration)
+        chosen = ladder[index]
+        if feasible:
+            self._report_decision(f"Hedef {target.describe()} (gereken {required:.1f} MB/s, {parallelism} iş parçacığı): "
+                                  f"{setting_label(chosen)} seçildi (örnekte oran {chosen['ratio']:.2f}x, "
+                                  f"tahmini {chosen['throughput_mb_s'] * scale:.1f} MB/s).")
+        else:
+            self._report_decision(f"Hedef {target.describe()} (gereken {required:.1f} MB/s) hiçbir ayarla karşılanamıyor. "
+                                  f"En hızlı ayar {setting_label(chosen)} seçildi "
+                                  f"(tahmini {chosen['throughput_mb_s'] * scale:.1f} MB/s).")
+        return controller.compressor(), controller
 
 if __name__ == "__main__":
-    from .data_analyzer import analyze_file_properties # Bu satır, paketin içinden doğru import için gerekli
+    from .data_analyzer import analyze_file_properties, read_sample_blocks # Bu satır, paketin içinden doğru import için gerekli
     import os
 
     print("--- compressor_selector.py Modül Testleri ---")
@@ -64,7 +490,8 @@ if __name__ == "__main__":
         "low_entropy_binary.bin": b'\x00' * 5000 + b'\xFF' * 5000,
         "small_file.txt": "kisa metin",
         "web_page.html": "<html><body><h1>Merhaba Dünya</h1><p>Bu bir deneme HTML sayfasıdır. Sayfa içeriği.</p></body></html>" * 20,
-        "javascript.js": "function greet(name) { console.log('Hello, ' + name + '!'); } greet('World');" * 30
+        "javascript.js": "function greet(name) { console.log('Hello, ' + name + '!'); } greet('World');" * 30,
+        "random_binary.bin": os.urandom(20000)
     }
 
     for filename, content in test_files.items():
@@ -80,9 +507,20 @@ if __name__ == "__main__":
         analysis = analyze_file_properties(file_path)
         if analysis:
             print(f"  Boyut: {analysis['file_size']}B, Entropi: {analysis['entropy']:.2f}, Uzantı: {analysis['file_extension']}")
-            selected_compressor = selector.select_compressor(analysis)
+            with open(file_path, 'rb') as f:
+                samples = read_sample_blocks(f, TRIAL_SAMPLE_BLOCKS)
+            selected_compressor = selector.select_compressor(analysis, sample=b"".join(samples))
             print(f"  Seçilen Algoritma: {selected_compressor.get_name()}")
+
+            trial_compressor, trial_results = selector.select_compressor_by_trial(samples, objective='ratio')
+            for result in trial_results:
+                print(f"    {result['name']:<10} oran={result['ratio']:.2f}x hız={result['throughput_mb_s']:.1f} MB/s")
         
         os.remove(file_path)
     
-    print("\nTest dosyaları temizlendi.")
\ No newline at end of file
+    print("\nTest dosyaları temizlendi.")
+    # Hedefli seçim boş dosyada (örnek yok) kalibrasyonu atlar ve 'stored' seçer.
+    from .level_tuning import ThroughputTarget
+    print("\nBoş dosya, hedefli seçim:")
+    empty_compressor, empty_controller = selector.select_compressor_for_target([], ThroughputTarget(0, deadline=5.0))
+    print(f"  Seçilen Algoritma: {empty_compressor.get_name()}, merdiven: {[setting_label(result) for result in empty_controller.ladder]}")
@@ -1,15 +1,41 @@
 # akilli_sikistirma/compressors.py
 
+import functools
+import os
 import zlib
-import lzma
-import bz2
-import brotli
-import zstandard
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from .utils import lazy_import
+
+# Algoritma kütüphaneleri ilk kullanımda yüklenir; kurulu olmayanlar None olur ve kayıt defteri
+# (bkz. codec_registry) bu algoritmaları kullanılamaz olarak bildirir.
+lzma = lazy_import("lzma")
+bz2 = lazy_import("bz2")
+brotli = lazy_import("brotli")
+zstandard = lazy_import("zstandard")
+
+# Akış (streaming) modunda her seferinde okunacak parça boyutu.
+# Bellek kullanımı dosya boyutundan bağımsız olarak bu değerle sınırlı kalır.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Açmada tek bir çağrının ürettiği en büyük çıktı. Sıkıştırma oranı çok yüksek olsa da (ör. 1 GB
+# sıfır 33 KB'a iner) bellek, girdi parçası ve bu değerle sınırlı kalır (bkz. _BoundedDecompressor).
+DECOMPRESS_OUTPUT_SIZE = DEFAULT_CHUNK_SIZE
+
+@functools.lru_cache(maxsize=None)
+def _accepted_params(cls) -> frozenset:
+    """Kurucunun parametre adları; inspect.signature her çağrıda pahalı olduğundan sınıf başına önbelleklenir."""
+    import inspect  # Yalnızca başlıktan açarken gerekir; başlangıçta yüklenmez.
+    return frozenset(inspect.signature(cls.__init__).parameters)
 
 class Compressor:
     """
     Farklı sıkıştırma algoritmaları için temel bir arayüz sağlar.
+    'requires', algoritmanın ihtiyaç duyduğu modülün adıdır; kayıt defteri algoritmanın
+    kullanılabilir olup olmadığını buna göre belirler.
     """
+    requires: Optional[str] = None
+
     def __init__(self, name: str):
         self.name = name
 
@@ -25,47 +51,529 @@ class Compressor:
         """Kompresörün adını döndürür."""
         return self.name
 
-class ZlibCompressor(Compressor):
+    def get_params(self) -> dict:
+        """Sıkıştırma parametrelerini döndürür (.comp başlığına yazılır)."""
+        return {}
+
+    def effective_window_log(self) -> Optional[int]:
+        """Kullanılan pencerenin (sözlüğün) 2 tabanında logaritması; window_log verilmemişse kütüphane varsayılanı."""
+        return None
+
+    def compression_memory(self) -> int:
+        """Bir sıkıştırma akışının yaklaşık bellek kullanımı (bayt). Bilinmiyorsa 0 (bkz. memory_budget)."""
+        return 0
+
+    def decompression_memory(self) -> int:
+        """Bir açma akışının yaklaşık bellek kullanımı (bayt). Bilinmiyorsa 0."""
+        return 0
+
+    @classmethod
+    def from_params(cls, params: dict, **kwargs) -> "Compressor":
+        """
+        Başlıktaki parametrelerden (bkz. get_params) sıkıştırıcıyı yeniden oluşturur.
+        Kurucunun kabul etmediği anahtarlar (ör. 'block_size') yok sayılır.
+        """
+        accepted = _accepted_params(cls)
+        return cls(**{key: value for key, value in params.items() if key in accepted}, **kwargs)
+
+    def _new_stream_compressor(self):
+        """Artımlı sıkıştırma nesnesi döndürür (compress() ve flush() metotları olan)."""
+        raise NotImplementedError("Bu metodun alt sınıflarda uygulanması gerekir.")
+
+    def _new_stream_decompressor(self):
+        """Artımlı açma nesnesi döndürür (decompress() metodu ve eof özelliği olan)."""
+        raise NotImplementedError("Bu metodun alt sınıflarda uygulanması gerekir.")
+
+    def _new_bounded_decompressor(self, output_size: int = DECOMPRESS_OUTPUT_SIZE) -> "_BoundedDecompressor":
+        """Çıktısı parça başına 'output_size' bayt ile sınırlı artımlı açma nesnesi döndürür."""
+        return _BoundedDecompressor(self._new_stream_decompressor(), output_size)
+
+    def compress_stream(self, src: BinaryIO, dst: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[int, int]:
+        """
+        Kaynak akışı parça parça okuyup sıkıştırarak hedef akışa yazar.
+        Tüm dosya hiçbir zaman belleğe alınmaz.
+
+        Returns:
+            Tuple[int, int]: (okunan bayt sayısı, yazılan bayt sayısı)
+        """
+        stream = self._new_stream_compressor()
+        bytes_in = bytes_out = 0
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            bytes_in += len(chunk)
+            out = stream.compress(chunk)
+            if out:
+                dst.write(out)
+                bytes_out += len(out)
+        out = stream.flush()
+        if out:
+            dst.write(out)
+            bytes_out += len(out)
+        return bytes_in, bytes_out
+
+    def decompress_stream(self, src: BinaryIO, dst: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[int, int]:
+        """
+        Sıkıştırılmış kaynak akışı parça parça açarak hedef akışa yazar.
+        Bellek kullanımı sıkıştırma oranından bağımsızdır (bkz. DECOMPRESS_OUTPUT_SIZE).
+
+        Returns:
+            Tuple[int, int]: (okunan bayt sayısı, yazılan bayt sayısı)
+        """
+        stream = self._new_bounded_decompressor()
+        bytes_in = bytes_out = 0
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            bytes_in += len(chunk)
+            for out in stream.decompress(chunk):
+                dst.write(out)
+                bytes_out += len(out)
+        if not stream.eof:
+            raise ValueError(f"{self.name}: sıkıştırılmış veri beklenmedik şekilde sona erdi.")
+        return bytes_in, bytes_out
+
+def _with_optional(params: dict, **optional) -> dict:
+    """None olmayan isteğe bağlı parametreleri sözlüğe ekler (varsayılanlar başlığa yazılmaz)."""
+    params.update((key, value) for key, value in optional.items() if value is not None)
+    return params
+
+class _BrotliStreamCompressor:
+    """brotli.Compressor nesnesini diğer kütüphanelerin compress()/flush() arayüzüne uyarlar."""
+    def __init__(self, quality: int, lgwin: int = 22):
+        self._compressor = brotli.Compressor(quality=quality, lgwin=lgwin)
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+class _BoundedDecompressor:
+    """
+    Artımlı açma nesnesini, her çıktı parçası en fazla 'output_size' bayt olacak şekilde sarar.
+    zlib'de unconsumed_tail, bz2/lzma'da (ve aynı arayüzü sağlayan brotli ve zstd uyarlayıcılarında)
+    needs_input ile girdi bitene kadar sınırlı çağrılar yapılır. Çıktı sınırı olmayan akışlar
+    (ör. 'stored') olduğu gibi açılır.
+    """
+    def __init__(self, stream, output_size: int):
+        self._stream = stream
+        self.output_size = output_size
+
+    @property
+    def eof(self) -> bool:
+        return self._stream.eof
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        """Girdi parçasını açar; çıktıyı sınırlı parçalar halinde verir."""
+        stream, limit = self._stream, self.output_size
+        if hasattr(stream, 'unconsumed_tail'):
+            while True:
+                out = stream.decompress(data, limit)
+                if out:
+                    yield out
+                data = stream.unconsumed_tail
+                if stream.eof or (not data and len(out) < limit):
+                    return
+        elif hasattr(stream, 'needs_input'):
+            out = stream.decompress(data, limit)
+            if out:
+                yield out
+            while not stream.eof and not stream.needs_input:
+                out = stream.decompress(b"", limit)
+                if out:
+                    yield out
+        else:
+            out = stream.decompress(data)
+            if out:
+                yield out
+
+class _BrotliStreamDecompressor:
+    """
+    brotli.Decompressor nesnesini decompress()/eof arayüzüne uyarlar. Çıktı sınırı (max_length)
+    brotli 1.1 ve sonrasında desteklenir; eski sürümlerde yok sayılır. brotli tamponu sınıra
+    ulaştıktan sonra büyütmeyi bıraktığından parçalar sınırın iki katına kadar çıkabilir.
+    """
     def __init__(self):
+        self._decompressor = brotli.Decompressor()
+        self._bounded = hasattr(self._decompressor, 'can_accept_more_data')
+        self._output_full = False
+    def decompress(self, data: bytes, max_length: int = -1) -> bytes:
+        if max_length < 0 or not self._bounded:
+            return self._decompressor.process(data)
+        out = self._decompressor.process(data, output_buffer_limit=max_length)
+        self._output_full = len(out) >= max_length
+        return out
+    @property
+    def needs_input(self) -> bool:
+        # can_accept_more_data() bekleyen çıktı varken de True dönebilir; tampon dolduysa çıktı beklenir.
+        return not self._bounded or (self._decompressor.can_accept_more_data() and not self._output_full)
+    @property
+    def eof(self) -> bool:
+        return self._decompressor.is_finished()
+
+class ZlibCompressor(Compressor):
+    """window_log, zlib'in wbits değeridir (9-15)."""
+    requires = "zlib"
+    def __init__(self, level: int = 6, window_log: int = None):
         super().__init__("zlib")
+        self.level = level
+        self.window_log = window_log
+    def get_params(self) -> dict:
+        return _with_optional({"level": self.level}, window_log=self.window_log)
+    def effective_window_log(self) -> int:
+        return self.window_log or zlib.MAX_WBITS
+    def compression_memory(self) -> int:
+        # zlib.h: (1 << (windowBits + 2)) + (1 << (memLevel + 9)), varsayılan memLevel 8.
+        return (1 << (self.effective_window_log() + 2)) + (1 << 17)
+    def decompression_memory(self) -> int:
+        return (1 << self.effective_window_log()) + 7 * 1024
     def compress(self, data: bytes) -> bytes:
-        return zlib.compress(data)
+        if self.window_log is None:
+            return zlib.compress(data, self.level)
+        stream = self._new_stream_compressor()
+        return stream.compress(data) + stream.flush()
     def decompress(self, data: bytes) -> bytes:
         return zlib.decompress(data)
+    def _new_stream_compressor(self):
+        return zlib.compressobj(self.level, zlib.DEFLATED, self.window_log or zlib.MAX_WBITS)
+    def _new_stream_decompressor(self):
+        return zlib.decompressobj()
+
+# lzma ön ayarlarının (0-9) varsayılan sözlük boyutları (2 tabanında logaritma): 256 KiB ... 64 MiB.
+LZMA_PRESET_WINDOW_LOGS = (18, 20, 21, 22, 22, 23, 23, 24, 25, 26)
+
+# lzma'nın mimariye özgü BCJ filtreleri (lzma modülündeki sabit adları; modül tembel yüklendiği için ad olarak).
+LZMA_BCJ_FILTERS = {
+    "x86": "FILTER_X86",
+    "arm": "FILTER_ARM",
+    "armthumb": "FILTER_ARMTHUMB",
+    "powerpc": "FILTER_POWERPC",
+    "ia64": "FILTER_IA64",
+    "sparc": "FILTER_SPARC",
+}
 
 class LzmaCompressor(Compressor):
-    def __init__(self):
+    """
+    window_log verilirse LZMA2 sözlük boyutu 2**window_log bayt olur.
+    bcj verilirse ('x86', 'arm', 'armthumb', 'powerpc', 'ia64', 'sparc') veri önce lzma'nın o mimari
+    için dal dönüştürücü (BCJ) filtresinden geçirilir; çalıştırılabilir dosyalarda oranı artırır.
+    Filtre zinciri .xz akışına yazıldığından açarken ek bilgi gerekmez.
+    """
+    requires = "lzma"
+    def __init__(self, level: int = 6, window_log: int = None, bcj: str = None):
         super().__init__("lzma")
+        if bcj is not None and bcj not in LZMA_BCJ_FILTERS:
+            raise ValueError(f"Bilinmeyen BCJ mimarisi '{bcj}'. Geçerli mimariler: {', '.join(LZMA_BCJ_FILTERS)}")
+        self.level = level
+        self.window_log = window_log
+        self.bcj = bcj
+    def get_params(self) -> dict:
+        return _with_optional({"level": self.level}, window_log=self.window_log, bcj=self.bcj)
+    def effective_window_log(self) -> int:
+        return self.window_log or LZMA_PRESET_WINDOW_LOGS[self.level]
+    def compression_memory(self) -> int:
+        # xz(1) ön ayar tablosuna göre: 0-3 ön ayarlarının hash zinciri (hc) eşleştiricisi sözlüğün
+        # ~7.5 katı, 4-9'un ikili ağaç (bt4) eşleştiricisi ~11 katı bellek kullanır.
+        dict_size = 1 << self.effective_window_log()
+        if self.level <= 3:
+            return dict_size * 15 // 2 + (2 << 20)
+        return dict_size * 11 + (4 << 20)
+    def decompression_memory(self) -> int:
+        return (1 << self.effective_window_log()) + (1 << 20)
+    def _filters(self):
+        if self.window_log is None and self.bcj is None:
+            return None
+        lzma2 = {"id": lzma.FILTER_LZMA2, "preset": self.level}
+        if self.window_log is not None:
+            lzma2["dict_size"] = 1 << self.window_log
+        if self.bcj is None:
+            return [lzma2]
+        return [{"id": getattr(lzma, LZMA_BCJ_FILTERS[self.bcj])}, lzma2]
     def compress(self, data: bytes) -> bytes:
-        return lzma.compress(data)
+        filters = self._filters()
+        if filters is None:
+            return lzma.compress(data, preset=self.level)
+        return lzma.compress(data, filters=filters)
     def decompress(self, data: bytes) -> bytes:
         return lzma.decompress(data)
+    def _new_stream_compressor(self):
+        filters = self._filters()
+        if filters is None:
+            return lzma.LZMACompressor(preset=self.level)
+        return lzma.LZMACompressor(filters=filters)
+    def _new_stream_decompressor(self):
+        return lzma.LZMADecompressor()
 
 class BZ2Compressor(Compressor):
-    def __init__(self):
+    requires = "bz2"
+    def __init__(self, level: int = 9):
         super().__init__("bz2")
+        self.level = level
+    def get_params(self) -> dict:
+        return {"level": self.level}
+    def compression_memory(self) -> int:
+        # bzip2(1): sıkıştırma 400k + 8 x blok boyutu, açma 100k + 4 x blok boyutu (blok: seviye x 100k).
+        return 400_000 + 8 * 100_000 * self.level
+    def decompression_memory(self) -> int:
+        return 100_000 + 4 * 100_000 * self.level
     def compress(self, data: bytes) -> bytes:
-        return bz2.compress(data)
+        return bz2.compress(data, self.level)
     def decompress(self, data: bytes) -> bytes:
         return bz2.decompress(data)
+    def _new_stream_compressor(self):
+        return bz2.BZ2Compressor(self.level)
+    def _new_stream_decompressor(self):
+        return bz2.BZ2Decompressor()
 
 class BrotliCompressor(Compressor):
-    def __init__(self):
+    """window_log, brotli'nin lgwin değeridir (10-24, varsayılan 22)."""
+    requires = "brotli"
+    def __init__(self, level: int = 8, window_log: int = None):
         super().__init__("brotli")
+        self.level = level
+        self.window_log = window_log
+    def get_params(self) -> dict:
+        return _with_optional({"level": self.level}, window_log=self.window_log)
+    def effective_window_log(self) -> int:
+        return self.window_log or 22
+    def compression_memory(self) -> int:
+        # Akış kipinde ölçülen kullanımdan: 0-1 kaliteleri sabit ve küçük; 2-3 kaliteleri pencerenin
+        # ~2 katı; 4 ve üstünde halka tampon ve üst blok tamponları pencereyle (büyük pencerede daha
+        # yavaş) büyür, kovalı eşleşme tablosu kaliteyle büyür; 10-11 kalitelerinde ikili ağaç pencere
+        # başına 8 bayt ekler.
+        window = 1 << self.effective_window_log()
+        if self.level <= 1:
+            return 2 << 20
+        if self.level <= 3:
+            return 2 * window + (1 << 20)
+        buffers = min(10 * window, (30 << 20) + 4 * window)
+        if self.level >= 10:
+            return buffers + 8 * window + min(16 << 20, 64 * window)
+        return buffers + (4 << ((14 if self.level < 7 else 15) + self.level - 1))
+    def decompression_memory(self) -> int:
+        return (1 << self.effective_window_log()) * 3 // 2 + (256 << 10)
     def compress(self, data: bytes) -> bytes:
-        return brotli.compress(data, quality=8)
+        return brotli.compress(data, quality=self.level, lgwin=self.window_log or 22)
     def decompress(self, data: bytes) -> bytes:
         return brotli.decompress(data)
+    def _new_stream_compressor(self):
+        return _BrotliStreamCompressor(quality=self.level, lgwin=self.window_log or 22)
+    def _new_stream_decompressor(self):
+        return _BrotliStreamDecompressor()
+
+# zstd'nin en büyük blok boyutu; akış tamponları bu boyuttadır.
+ZSTD_BLOCK_SIZE = 128 * 1024
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_ZSTD_DICT_ID_SIZES = (0, 1, 2, 4)
+_ZSTD_CONTENT_SIZE_SIZES = (0, 2, 4, 8)
+
+class _ZstdStreamDecompressor:
+    """
+    zstandard açma nesnesine (çıktı sınırı olmayan) bz2/lzma'daki max_length/needs_input arayüzünü
+    ekler. Girdi, çerçevenin blok başlıkları izlenerek blok sınırlarından bölünür: her blok en fazla
+    ZSTD_BLOCK_SIZE bayt (ham ve RLE bloklarda başlıktaki boyut kadar) çıktı üretir, böylece bir
+    çağrıya verilen girdinin çıktısı max_length'i (en az bir blok) aşmaz. Çerçeve dışındaki veri
+    (ör. atlanabilir çerçeveler, çerçeve sonrası) bölünmeden verilir.
+    """
+    def __init__(self, stream):
+        self._stream = stream
+        self._pending = memoryview(b"")
+        self._phase = 'frame'
+        self._header = bytearray()
+        self._need = 5                 # sihirli sayı + çerçeve başlığı tanımlayıcısı
+        self._has_checksum = False
+        self._content = 0              # geçerli bloğun kalan girdi baytları
+        self._block_output = 0
+        self._last_block = False
+
+    @property
+    def eof(self) -> bool:
+        return self._stream.eof
+
+    @property
+    def needs_input(self) -> bool:
+        return not self._pending
+
+    def decompress(self, data: bytes, max_length: int = -1) -> bytes:
+        if data:
+            self._pending = memoryview(data)
+        if max_length < 0:
+            end = len(self._pending)
+            self._advance(self._pending, end)
+        else:
+            end = self._split(self._pending, max(max_length, ZSTD_BLOCK_SIZE))
+        piece, self._pending = self._pending[:end], self._pending[end:]
+        return self._stream.decompress(piece)
+
+    def _split(self, view: memoryview, limit: int) -> int:
+        """Çıktısı 'limit'i aşmayan en uzun girdi önekinin boyutu; çözümleyiciyi bu öneke ilerletir."""
+        pos = output = 0
+        while pos < len(view) and self._phase != 'raw':
+            if self._phase != 'content':
+                step = self._need - len(self._header)
+            elif self._content > 1:
+                step = self._content - 1
+            else:
+                # Bloğun son baytı bloğun çıktısını üretir; sığmıyorsa burada bölünür.
+                if output and output + self._block_output > limit:
+                    return pos
+                output += self._block_output
+                step = 1
+            pos = self._advance(view, min(len(view), pos + step), pos)
+        return len(view) if self._phase == 'raw' else pos
+
+    def _advance(self, view: memoryview, end: int, pos: int = 0) -> int:
+        """Çözümleyiciyi view[pos:end] kadar ilerletir; ulaşılan konumu döndürür."""
+        while pos < end and self._phase != 'raw':
+            if self._phase == 'content':
+                take = min(self._content, end - pos)
+                pos += take
+                self._content -= take
+                if not self._content:
+                    self._end_block()
+                continue
+            take = min(self._need - len(self._header), end - pos)
+            self._header += view[pos:pos + take]
+            pos += take
+            if len(self._header) == self._need:
+                self._parse_header()
+        return end
+
+    def _parse_header(self):
+        header, self._header = bytes(self._header), bytearray()
+        if self._phase == 'frame':
+            if header[:4] != _ZSTD_MAGIC:
+                self._phase = 'raw'
+                return
+            descriptor = header[4]
+            single_segment = descriptor & 0x20
+            self._has_checksum = bool(descriptor & 0x04)
+            content_size = _ZSTD_CONTENT_SIZE_SIZES[descriptor >> 6] or (1 if single_segment else 0)
+            rest = (0 if single_segment else 1) + _ZSTD_DICT_ID_SIZES[descriptor & 0x03] + content_size
+            self._phase, self._need = ('frame_rest', rest) if rest else ('block', 3)
+        elif self._phase == 'frame_rest':
+            self._phase, self._need = 'block', 3
+        elif self._phase == 'block':
+            value = int.from_bytes(header, 'little')
+            self._last_block = bool(value & 1)
+            block_type, size = (value >> 1) & 0x03, value >> 3
+            self._content = 1 if block_type == 1 else size
+            self._block_output = ZSTD_BLOCK_SIZE if block_type == 2 else size
+            self._phase = 'content'
+            if not self._content:
+                self._end_block()
+        else:
+            self._phase = 'raw'
+
+    def _end_block(self):
+        if not self._last_block:
+            self._phase, self._need = 'block', 3
+        elif self._has_checksum:
+            self._phase, self._need = 'checksum', 4
+        else:
+            self._phase = 'raw'
 
 class ZstandardCompressor(Compressor):
-    def __init__(self):
+    """
+    dict_id verilirse veri, dictionary_store deposundaki eğitilmiş sözlükle sıkıştırılır;
+    sözlük kimliği başlık parametrelerine yazılır ve açarken aynı sözlük bulunur.
+    Sözlük ve hazırlanmış bağlamlar depoda önbelleklenir (bkz. dictionary_store).
+
+    window_log pencere boyutunu, threads zstd'nin kendi çoklu iş parçacığı desteğini
+    ayarlar (-1: tüm çekirdekler). Sözlüklü sıkıştırmada yalnızca seviye kullanılır.
+    Açarken pencere, başlıktaki window_log'a göre izin verilir.
+    """
+    requires = "zstandard"
+    def __init__(self, level: int = 3, dict_id: int = None, dictionary_store=None,
+                 window_log: int = None, threads: int = 0):
         super().__init__("zstandard")
+        self.level = level
+        self.dict_id = dict_id
+        self.dictionary_store = dictionary_store
+        self.window_log = window_log
+        self.threads = threads
+    def get_params(self) -> dict:
+        return _with_optional({"level": self.level}, dict_id=self.dict_id, window_log=self.window_log,
+                              threads=self.threads or None)
+    def effective_window_log(self) -> int:
+        return self.window_log or zstandard.ZstdCompressionParameters.from_level(self.level).window_log
+    def _thread_count(self) -> int:
+        return (os.cpu_count() or 1) if self.threads < 0 else self.threads
+    def _compression_parameters(self, threads: int = 0) -> "zstandard.ZstdCompressionParameters":
+        window_log = self.effective_window_log()
+        level_params = zstandard.ZstdCompressionParameters.from_level(self.level, window_log=window_log)
+        # Seviyenin eşleşme tabloları pencereden büyükse pencereye kırpılır (zstd bunu yalnızca
+        # kaynak boyutu bilindiğinde kendisi yapar); küçük pencere böylece belleği de küçültür.
+        binary_tree = level_params.strategy >= zstandard.STRATEGY_BTLAZY2
+        return zstandard.ZstdCompressionParameters.from_level(
+            self.level, window_log=window_log, hash_log=min(level_params.hash_log, window_log + 1),
+            chain_log=min(level_params.chain_log, window_log + binary_tree), threads=threads)
+    def compression_memory(self) -> int:
+        context = self._compression_parameters().estimated_compression_context_size()
+        # Akış kipinde pencere kadar girdi tamponu; zstd iş parçacıklarının her biri ayrı bağlam kullanır.
+        return (context + (1 << self.effective_window_log()) + ZSTD_BLOCK_SIZE) * max(1, self._thread_count())
+    def decompression_memory(self) -> int:
+        return (1 << self.effective_window_log()) + 2 * ZSTD_BLOCK_SIZE + zstandard.estimate_decompression_context_size()
+    def _compressor(self) -> "zstandard.ZstdCompressor":
+        if self.dict_id is not None:
+            return self.dictionary_store.compressor(self.dict_id, self.level)
+        if self.window_log is None and not self.threads:
+            return zstandard.ZstdCompressor(level=self.level)
+        if self.window_log is None:
+            compression_params = zstandard.ZstdCompressionParameters.from_level(self.level, threads=self.threads)
+        else:
+            compression_params = self._compression_parameters(self.threads)
+        return zstandard.ZstdCompressor(compression_params=compression_params)
+    def _decompressor(self) -> "zstandard.ZstdDecompressor":
+        if self.dict_id is not None:
+            return self.dictionary_store.decompressor(self.dict_id)
+        if self.window_log is not None:
+            return zstandard.ZstdDecompressor(max_window_size=1 << self.window_log)
+        return zstandard.ZstdDecompressor()
     def compress(self, data: bytes) -> bytes:
-        return zstandard.compress(data, level=3)
+        if self.dict_id is None and self.window_log is None and not self.threads:
+            return zstandard.compress(data, level=self.level)
+        return self._compressor().compress(data)
     def decompress(self, data: bytes) -> bytes:
-        return zstandard.decompress(data)
+        if self.dict_id is None and self.window_log is None:
+            return zstandard.decompress(data)
+        return self._decompressor().decompress(data)
+    def _new_stream_compressor(self):
+        return self._compressor().compressobj()
+    def _new_stream_decompressor(self):
+        return _ZstdStreamDecompressor(self._decompressor().decompressobj())
+
+class _StoredStream:
+    """Veriyi olduğu gibi geçiren akış nesnesi (sıkıştırma ve açma için)."""
+    eof = True
+    def compress(self, data: bytes) -> bytes:
+        return data
+    def decompress(self, data: bytes) -> bytes:
+        return data
+    def flush(self) -> bytes:
+        return b""
+
+class StoredCompressor(Compressor):
+    """
+    Sıkıştırma yapmadan veriyi olduğu gibi saklar. Zaten sıkıştırılmış veya
+    şifrelenmiş (sıkıştırılamaz) veriler disk hızında kopyalanır.
+    """
+    def __init__(self):
+        super().__init__("stored")
+    def compress(self, data: bytes) -> bytes:
+        return bytes(data)
+    def decompress(self, data: bytes) -> bytes:
+        return bytes(data)
+    def _new_stream_compressor(self):
+        return _StoredStream()
+    def _new_stream_decompressor(self):
+        return _StoredStream()
 
 if __name__ == "__main__":
+    import io
+
     print("--- compressors.py Modül Testleri ---")
 
     original_data = b"Bu bir deneme metnidir. Tekrar eden kelimeler icermektedir. Deneme deneme." * 10
@@ -75,7 +583,8 @@ if __name__ == "__main__":
         LzmaCompressor(),
         BZ2Compressor(),
         BrotliCompressor(),
-        ZstandardCompressor()
+        ZstandardCompressor(),
+        StoredCompressor()
     ]
 
     for comp in compressors_to_test:
@@ -93,5 +602,16 @@ if __name__ == "__main__":
             else:
                 print("  HATA: Veri bütünlüğü KORUNAMADI!")
 
+            # Akış (streaming) API'si: küçük parçalarla sıkıştırıp aç
+            compressed_stream = io.BytesIO()
+            comp.compress_stream(io.BytesIO(original_data), compressed_stream, chunk_size=64)
+            compressed_stream.seek(0)
+            restored_stream = io.BytesIO()
+            comp.decompress_stream(compressed_stream, restored_stream, chunk_size=64)
+            if restored_stream.getvalue() == original_data:
+                print("  Akış ile Sıkıştırma ve Açma BAŞARILI.")
+            else:
+                print("  HATA: Akış ile veri bütünlüğü KORUNAMADI!")
+
         except Exception as e:
             print(f"  {comp.get_name()} testi sırasında hata oluştu: {e}")
\ No newline at end of file
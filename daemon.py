@@ -0,0 +1,592 @@
+# akilli_sikistirma/daemon.py
+
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+from .compressor_selector import CompressorSelector, INCOMPRESSIBLE_CHECK_SIZE
+from .compressors import Compressor, ZstandardCompressor
+from .data_analyzer import analyze_bytes
+from .file_format import CONTAINER_STREAM, original_filename, read_header, write_header
+from .filters import decode_frames, encode_frames, filter_from_params
+from .profiles import DEFAULT_PROFILE
+
+# Daemon'un varsayılan Unix soket yolu.
+DEFAULT_SOCKET_PATH = os.path.join(os.path.expanduser("~"), ".cache", "akilli_sikistirma", "daemon.sock")
+
+# Tek bir istekte kabul edilen en büyük veri. Daemon küçük ve orta boyutlu istekler içindir;
+# büyük dosyalar akış modunda doğrudan sıkıştırılmalıdır.
+MAX_PAYLOAD_SIZE = 256 * 1024 * 1024
+_MAX_PARAMS_SIZE = 64 * 1024
+
+# Çerçeve düzeni (küçük-endian), istek ve yanıt için aynıdır:
+#   işlem kodu / durum (1) | parametre uzunluğu (4) | veri uzunluğu (4) | parametreler (JSON) | veri
+_FRAME = struct.Struct("<BII")
+
+OP_PING = 0
+OP_COMPRESS = 1
+OP_DECOMPRESS = 2
+OP_ANALYZE = 3
+OP_STATS = 4
+OP_NAMES = {OP_PING: "ping", OP_COMPRESS: "compress", OP_DECOMPRESS: "decompress",
+            OP_ANALYZE: "analyze", OP_STATS: "stats"}
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+# Daemon başlarken her işçi iş parçacığında önceden oluşturulan (ısıtılan) algoritmalar.
+WARM_CODECS = ("zstandard", "zlib", "brotli")
+
+def _read_exact(src: BinaryIO, size: int) -> bytes:
+    data = src.read(size)
+    if len(data) != size:
+        raise ConnectionError("Bağlantı çerçeve ortasında kapandı.")
+    return data
+
+def read_frame(src: BinaryIO) -> Optional[Tuple[int, Dict[str, Any], bytes]]:
+    """Bir çerçeve okur ve (kod, parametreler, veri) döndürür; bağlantı kapandıysa None."""
+    fixed = src.read(_FRAME.size)
+    if not fixed:
+        return None
+    if len(fixed) != _FRAME.size:
+        raise ConnectionError("Bağlantı çerçeve ortasında kapandı.")
+    code, params_size, payload_size = _FRAME.unpack(fixed)
+    if params_size > _MAX_PARAMS_SIZE or payload_size > MAX_PAYLOAD_SIZE:
+        raise ValueError(f"Çerçeve çok büyük: parametreler {params_size}B, veri {payload_size}B")
+    params = json.loads(_read_exact(src, params_size).decode("utf-8")) if params_size else {}
+    return code, params, _read_exact(src, payload_size)
+
+def encode_frame(code: int, params: Dict[str, Any] = None, payload: bytes = b"") -> bytes:
+    """Çerçevenin başlık ve parametre kısmını döndürür; veri ayrıca gönderilir (kopyalanmaz)."""
+    encoded_params = json.dumps(params, separators=(",", ":")).encode("utf-8") if params else b""
+    return _FRAME.pack(code, len(encoded_params), len(payload)) + encoded_params
+
+class _WarmCodec:
+    """
+    Bir iş parçacığına ait, yeniden kullanılan sıkıştırıcı. zstd bağlamları
+    (ZstdCompressor/ZstdDecompressor) bir kez oluşturulur ve her istekte yeniden kullanılır;
+    bu bağlamlar iş parçacıkları arasında paylaşılamaz. zlib, brotli ve diğerlerinin Python
+    bağlamaları bağlamın sıfırlanıp yeniden kullanılmasına izin vermez; onlarda yapılandırılmış
+    Compressor nesnesi yeniden kullanılır.
+    """
+    def __init__(self, compressor: Compressor):
+        self.compressor = compressor
+        self._zstd_compressor = self._zstd_decompressor = None
+        if isinstance(compressor, ZstandardCompressor):
+            self._zstd_compressor = compressor._compressor()
+            self._zstd_decompressor = compressor._decompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        if self._zstd_compressor is not None:
+            return self._zstd_compressor.compress(data)
+        return self.compressor.compress(data)
+
+    def decompress(self, data: bytes, original_size: Optional[int]) -> bytes:
+        if self._zstd_decompressor is not None:
+            # Akış modunda yazılan zstd çerçevelerinde içerik boyutu yoktur; boyut başlıktan verilir.
+            # Boyut bilinmiyorsa (filtre çerçeveleri) çerçeve akış olarak açılır.
+            if original_size is None:
+                return self._zstd_decompressor.decompressobj().decompress(data)
+            return self._zstd_decompressor.decompress(data, max_output_size=original_size)
+        return self.compressor.decompress(data)
+
+class CodecContextPool:
+    """
+    İş parçacığı başına (threading.local) seçici ve sıcak sıkıştırıcı havuzu.
+    Seçiciler profile, sıkıştırıcılar algoritma ve parametrelere göre önbelleklenir.
+    Daemon istekleri bağlantılardan bağımsız, sabit bir işçi havuzunda işlediğinden (bkz.
+    CompressionDaemon) sıcak bağlamlar bağlantı kapanınca kaybolmaz; her istek için yeni
+    bağlantı açan CLI --daemon çağrıları da aynı bağlamları kullanır.
+    """
+    def __init__(self):
+        self._local = threading.local()
+
+    def _state(self) -> Dict[str, dict]:
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            state = self._local.state = {'selectors': {}, 'codecs': {}}
+        return state
+
+    def selector(self, profile: str = DEFAULT_PROFILE) -> CompressorSelector:
+        selectors = self._state()['selectors']
+        if profile not in selectors:
+            selectors[profile] = CompressorSelector(profile=profile)
+        return selectors[profile]
+
+    def codec(self, compressor: Compressor) -> _WarmCodec:
+        """Sıkıştırıcının bu iş parçacığındaki sıcak karşılığını döndürür."""
+        codecs = self._state()['codecs']
+        key = (compressor.get_name(), json.dumps(compressor.get_params(), sort_keys=True))
+        if key not in codecs:
+            codecs[key] = _WarmCodec(compressor)
+        return codecs[key]
+
+class CompressionDaemon:
+    """
+    Sıkıştırma, açma ve analiz isteklerini işleyen daemon mantığı (soketten bağımsız).
+    Sıkıştırma çıktısı kendini tanımlayan bir .comp verisidir (başlık + tek akış); diske
+    yazıldığında decompress_file ile de açılabilir.
+
+    İstekler 'workers' iş parçacıklı sabit bir havuzda işlenir (bkz. submit); bağlantı iş
+    parçacıkları yalnızca çerçeveleri okuyup yazar. Havuzun iş parçacıkları daemon boyunca
+    yaşadığından sıcak bağlamlar (bkz. CodecContextPool) bağlantılar arasında korunur.
+    """
+    def __init__(self, profile: str = DEFAULT_PROFILE, workers: int = None):
+        self.profile = profile
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = CodecContextPool()
+        self.started = time.time()
+        self.request_counts = {name: 0 for name in OP_NAMES.values()}
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="daemon-worker")
+
+    def warm_up(self):
+        """
+        Havuzun tüm iş parçacıklarını başlatır ve her birinde profilin seçicisini ve WARM_CODECS
+        algoritmalarının sıkıştırıcılarını oluşturur; ilk istekler de sıcak bağlamlarla işlenir.
+        """
+        # Bariyer, görevlerin ayrı iş parçacıklarında çalışmasını (havuzun tamamen dolmasını) sağlar.
+        barrier = threading.Barrier(self.workers)
+
+        def warm():
+            try:
+                selector = self.pool.selector(self.profile)
+                for name in WARM_CODECS:
+                    if name in selector.available_compressors:
+                        compressor = selector.create_compressor(name)
+                        if getattr(compressor, 'threads', 0):
+                            compressor.threads = 0
+                        self.pool.codec(compressor)
+            except BaseException:
+                # Bariyerde bekleyen diğer iş parçacıkları BrokenBarrierError ile serbest kalır.
+                barrier.abort()
+                raise
+            barrier.wait()
+
+        futures = [self._executor.submit(warm) for _ in range(self.workers)]
+        errors = [error for error in (future.exception() for future in futures) if error is not None]
+        if errors:
+            # Asıl hata, bariyeri bozulan diğer iş parçacıklarının hatasından önce bildirilir.
+            raise next((error for error in errors if not isinstance(error, threading.BrokenBarrierError)), errors[0])
+
+    def submit(self, op: int, params: Dict[str, Any], payload: bytes) -> Future:
+        """İsteği işçi havuzuna verir; sonucu handle ile aynı olan bir Future döndürür."""
+        return self._executor.submit(self.handle, op, params, payload)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def handle(self, op: int, params: Dict[str, Any], payload: bytes) -> Tuple[Dict[str, Any], bytes]:
+        """Bir isteği işler ve (yanıt parametreleri, yanıt verisi) döndürür."""
+        if op not in OP_NAMES:
+            raise ValueError(f"Bilinmeyen işlem kodu: {op}")
+        with self._lock:
+            self.request_counts[OP_NAMES[op]] += 1
+        if op == OP_COMPRESS:
+            return self.compress(payload, params)
+        if op == OP_DECOMPRESS:
+            return self.decompress(payload)
+        if op == OP_ANALYZE:
+            return self.analyze(payload, params), b""
+        if op == OP_STATS:
+            return self.stats(), b""
+        return {}, b""
+
+    def _select(self, payload: bytes, params: Dict[str, Any]) -> Tuple[Dict[str, Any], Compressor]:
+        selector = self.pool.selector(params.get('profile') or self.profile)
+        analysis_results = analyze_bytes(payload, params.get('filename', ''))
+        if params.get('codec'):
+            if params['codec'] not in selector.available_compressors:
+                raise ValueError(selector.available_compressors.missing_reason(params['codec']))
+            compressor = selector.create_compressor(params['codec'])
+        else:
+            compressor = selector.select_compressor(analysis_results, sample=payload[:INCOMPRESSIBLE_CHECK_SIZE])
+        if params.get('level') is not None and hasattr(compressor, 'level'):
+            compressor.level = int(params['level'])
+        if getattr(compressor, 'threads', 0):
+            # İstekler zaten paralel işlenir ve küçüktür; zstd'nin kendi iş parçacıkları yalnızca ek yüktür.
+            compressor.threads = 0
+        return analysis_results, compressor
+
+    def compress(self, payload: bytes, params: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
+        analysis_results, compressor = self._select(payload, params)
+        # Filtre, compress_file'daki gibi seçilir ve akış kipindeki çerçevelerle uygulanır;
+        # çıktı, aynı veri için compress_file'ın akış çıktısıyla aynı biçimdedir.
+        data_filter = None
+        if params.get('filter', 'auto') == 'auto':
+            data_filter = self.pool.selector(params.get('profile') or self.profile).select_filter(
+                analysis_results, compressor, payload[:INCOMPRESSIBLE_CHECK_SIZE])
+        header_params = compressor.get_params()
+        data = payload
+        if data_filter is not None:
+            header_params['filter'] = data_filter.to_params()
+            data = encode_frames(payload, data_filter)
+        compressed = self.pool.codec(compressor).compress(data)
+        output = io.BytesIO()
+        write_header(output, compressor.get_name(), CONTAINER_STREAM, header_params,
+                     len(payload), zlib.crc32(payload))
+        output.write(compressed)
+        return {'codec': compressor.get_name(), 'params': header_params}, output.getvalue()
+
+    def decompress(self, payload: bytes) -> Tuple[Dict[str, Any], bytes]:
+        src = io.BytesIO(payload)
+        header = read_header(src)
+        if header is None:
+            raise ValueError("Veri .comp biçiminde değil.")
+        if header['container'] != CONTAINER_STREAM:
+            raise ValueError("Daemon yalnızca akış kapsayıcılı .comp verilerini açar.")
+        compressor = self.pool.selector(self.profile).compressor_from_header(header['codec'], header['params'])
+        data_filter = filter_from_params(header['params'].get('filter'))
+        # Filtrelenmiş veride çerçeve önekleri nedeniyle açılan boyut orijinal boyuttan büyüktür.
+        max_size = header['original_size'] if data_filter is None else None
+        data = self.pool.codec(compressor).decompress(payload[header['header_size']:], max_size)
+        if data_filter is not None:
+            data = decode_frames(data, data_filter)
+        if len(data) != header['original_size'] or zlib.crc32(data) != header['checksum']:
+            raise ValueError("Sağlama (CRC32) veya boyut uyuşmazlığı: veri bozulmuş olabilir.")
+        return {'codec': header['codec']}, data
+
+    def analyze(self, payload: bytes, params: Dict[str, Any]) -> Dict[str, Any]:
+        analysis_results, compressor = self._select(payload, params)
+        return {
+            'file_size': analysis_results['file_size'],
+            'entropy': analysis_results['entropy'],
+            'file_extension': analysis_results['file_extension'],
+            'codec': compressor.get_name(),
+            'params': compressor.get_params()
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'uptime_seconds': time.time() - self.started, 'requests': dict(self.request_counts),
+                    'errors': self.errors}
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Bir bağlantıdaki istekleri, bağlantı kapanana kadar sırayla işler."""
+    def handle(self):
+        daemon = self.server.daemon
+        while True:
+            try:
+                request = read_frame(self.rfile)
+            except (ConnectionError, ValueError) as e:
+                self.wfile.write(encode_frame(STATUS_ERROR, {'error': str(e)}))
+                return
+            if request is None:
+                return
+            op, params, payload = request
+            try:
+                response_params, response_payload = daemon.submit(op, params, payload).result()
+                status = STATUS_OK
+            except Exception as e:
+                with daemon._lock:
+                    daemon.errors += 1
+                status, response_params, response_payload = STATUS_ERROR, {'error': str(e)}, b""
+            self.wfile.write(encode_frame(status, response_params, response_payload))
+            if response_payload:
+                self.wfile.write(response_payload)
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def _remove_stale_socket(socket_path: str):
+    """Önceki bir çalıştırmadan kalan soket dosyasını siler; soket kullanılıyorsa hata verir."""
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.remove(socket_path)
+        return
+    finally:
+        probe.close()
+    raise ValueError(f"Soket zaten kullanımda: '{socket_path}'")
+
+def serve(socket_path: str = DEFAULT_SOCKET_PATH, profile: str = DEFAULT_PROFILE, quiet: bool = True,
+          workers: int = None):
+    """
+    Daemon'u başlatır ve durdurulana (SIGINT/SIGTERM) kadar istekleri işler.
+    Soket yalnızca sahibinin erişebileceği izinlerle (0600) oluşturulur.
+    quiet True ise seçicinin istek başına yazdırdığı bilgiler bastırılır.
+    'workers' istekleri işleyen iş parçacığı sayısıdır (varsayılan: çekirdek sayısı).
+    """
+    import signal
+    import sys
+
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+    _remove_stale_socket(socket_path)
+    old_umask = os.umask(0o177)
+    try:
+        server = _DaemonServer(socket_path, _RequestHandler)
+    finally:
+        os.umask(old_umask)
+    server.daemon = CompressionDaemon(profile, workers)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        with open(os.devnull, 'w') as devnull, \
+                (contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext()):
+            server.daemon.warm_up()
+            print(f"Daemon dinliyor: '{socket_path}' (profil: {profile}, {server.daemon.workers} işçi, "
+                  f"PID {os.getpid()})", file=sys.__stdout__, flush=True)
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.daemon.close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        print("Daemon durduruldu.")
+
+class DaemonClient:
+    """
+    Daemon için ince istemci. Bağlantı ilk istekte açılır ve kapatılana kadar yeniden
+    kullanılır; böylece istekler daemon tarafında aynı sıcak bağlamlarla işlenir.
+    Bir istemci iş parçacıkları arasında paylaşılabilir (istekler sıraya girer); en
+    yüksek verim için iş parçacığı başına bir istemci kullanılmalıdır.
+    Daemon'un bildirdiği hatalar ValueError olarak yükseltilir.
+    """
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = None):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._socket = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._socket is None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(self.timeout)
+            try:
+                self._socket.connect(self.socket_path)
+            except OSError as e:
+                self._socket.close()
+                self._socket = None
+                raise ConnectionError(f"Daemon'a bağlanılamadı ('{self.socket_path}'): {e.strerror or e}") from e
+            self._reader = self._socket.makefile('rb')
+
+    def request(self, op: int, params: Dict[str, Any] = None, payload: bytes = b"") -> Tuple[Dict[str, Any], bytes]:
+        """Bir istek gönderir ve (yanıt parametreleri, yanıt verisi) döndürür."""
+        if len(payload) > MAX_PAYLOAD_SIZE:
+            raise ValueError(f"Veri daemon sınırını aşıyor ({len(payload)}B > {MAX_PAYLOAD_SIZE}B).")
+        with self._lock:
+            self._connect()
+            try:
+                self._socket.sendall(encode_frame(op, params, payload))
+                if payload:
+                    self._socket.sendall(payload)
+                response = read_frame(self._reader)
+            except Exception:
+                self._close()
+                raise
+            if response is None:
+                self._close()
+                raise ConnectionError("Daemon bağlantıyı kapattı.")
+        status, response_params, response_payload = response
+        if status != STATUS_OK:
+            raise ValueError(response_params.get('error', "Daemon hatası"))
+        return response_params, response_payload
+
+    def ping(self) -> bool:
+        self.request(OP_PING)
+        return True
+
+    def compress(self, data: bytes, filename: str = '', codec: str = None, level: int = None,
+                 profile: str = None) -> bytes:
+        """
+        Veriyi sıkıştırır ve .comp biçiminde döndürür. codec verilmezse algoritma veriye
+        ve dosya adının uzantısına göre daemon'da seçilir.
+        """
+        params = {key: value for key, value in (('filename', filename), ('codec', codec), ('level', level),
+                                                ('profile', profile)) if value}
+        return self.request(OP_COMPRESS, params, data)[1]
+
+    def decompress(self, data: bytes) -> bytes:
+        """compress çıktısını (veya akış kapsayıcılı bir .comp dosyasını) açar."""
+        return self.request(OP_DECOMPRESS, None, data)[1]
+
+    def analyze(self, data: bytes, filename: str = '') -> Dict[str, Any]:
+        """Veriyi analiz eder; entropi ve seçilecek algoritmayı döndürür."""
+        return self.request(OP_ANALYZE, {'filename': filename} if filename else None, data)[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return self.request(OP_STATS)[0]
+
+    def _close(self):
+        if self._socket is not None:
+            self._reader.close()
+            self._socket.close()
+            self._socket = self._reader = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def compress_file_via_daemon(client: DaemonClient, filepath: str, output_dir: str = '.',
+                             profile: str = None) -> str or None:
+    """Bir dosyayı daemon'a sıkıştırtır ve .comp çıktısının yolunu döndürür."""
+    print(f"\n--- '{filepath}' dosyası daemon ile sıkıştırılıyor ---")
+    try:
+        with open(filepath, 'rb') as f:
+            data = f.read(MAX_PAYLOAD_SIZE + 1)
+        compressed = client.compress(data, filename=os.path.basename(filepath), profile=profile)
+        header = read_header(io.BytesIO(compressed))
+        compressed_filepath = os.path.join(output_dir, os.path.basename(filepath) + f".{header['codec']}.comp")
+        with open(compressed_filepath, 'wb') as dst:
+            dst.write(compressed)
+        print(f"  Algoritma: {header['codec']} ({header['params']}), Orjinal: {len(data)}B, Sıkıştırılmış: {len(compressed)}B")
+        print(f"  Sıkıştırılmış dosya kaydedildi: '{compressed_filepath}'")
+        return compressed_filepath
+    except Exception as e:
+        print(f"  Daemon ile sıkıştırma sırasında bir hata oluştu: {e}")
+        return None
+
+def decompress_file_via_daemon(client: DaemonClient, filepath: str, output_dir: str = '.') -> str or None:
+    """Akış kapsayıcılı bir .comp dosyasını daemon'a açtırır ve açılan dosyanın yolunu döndürür."""
+    print(f"\n--- '{filepath}' dosyası daemon ile açılıyor ---")
+    try:
+        with open(filepath, 'rb') as f:
+            data = f.read(MAX_PAYLOAD_SIZE + 1)
+        header = read_header(io.BytesIO(data))
+        if header is None:
+            raise ValueError("Dosya .comp biçiminde değil.")
+        decompressed_filepath = os.path.join(output_dir, original_filename(filepath, header['codec']))
+        with open(decompressed_filepath, 'wb') as dst:
+            dst.write(client.decompress(data))
+        print(f"  Açılmış dosya kaydedildi: '{decompressed_filepath}'")
+        return decompressed_filepath
+    except Exception as e:
+        print(f"  Daemon ile açma sırasında bir hata oluştu: {e}")
+        return None
+
+def _bench_payloads(size: int, count: int = 64) -> list:
+    """Yük testi için birbirinden farklı, JSON kayıtlarına benzeyen küçük veriler üretir."""
+    import random
+    rng = random.Random(0)
+    payloads = []
+    for _ in range(count):
+        records = []
+        while sum(map(len, records)) < size:
+            records.append(json.dumps({"id": rng.randint(0, 10 ** 9), "durum": rng.choice(["ok", "hata", "bekliyor"]),
+                                       "sure_ms": round(rng.random() * 1000, 3), "etiket": f"istek-{rng.randint(0, 999)}"}))
+        payloads.append("\n".join(records).encode()[:size])
+    return payloads
+
+def run_load_test(size: int = 4096, requests: int = 5000, threads: int = 4, cli_runs: int = 20,
+                  profile: str = DEFAULT_PROFILE) -> Dict[str, Any]:
+    """
+    Daemon'u ayrı bir süreçte başlatır ve aynı küçük sıkıştırma isteklerini üç yolla ölçer:
+    istemci kitaplığı (iş parçacığı başına kalıcı bağlantı), her istek için CLI süreci
+    başlatmak ve --daemon ile çalışan CLI. İstek/saniye ve gecikme yüzdeliklerini döndürür.
+    """
+    import subprocess
+    import sys
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    package = __package__ or "akilli_sikistirma"
+    package_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    work_dir = tempfile.mkdtemp()
+    socket_path = os.path.join(work_dir, "daemon.sock")
+    payloads = _bench_payloads(size)
+    results = {'size': size, 'threads': threads}
+
+    server = subprocess.Popen([sys.executable, "-m", f"{package}.daemon", "serve", "--socket", socket_path,
+                               "--preset", profile], cwd=package_parent, stdout=subprocess.DEVNULL)
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                DaemonClient(socket_path).ping()
+                break
+            except OSError:
+                if time.time() > deadline or server.poll() is not None:
+                    raise RuntimeError("Daemon başlatılamadı.")
+                time.sleep(0.05)
+
+        def client_worker(count: int) -> list:
+            latencies = []
+            with DaemonClient(socket_path) as client:
+                for i in range(count):
+                    payload = payloads[i % len(payloads)]
+                    start = time.perf_counter()
+                    client.decompress(client.compress(payload, filename="kayit.json"))
+                    latencies.append(time.perf_counter() - start)
+            return latencies
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            latencies = sorted(latency for batch in pool.map(client_worker, [requests // threads] * threads)
+                               for latency in batch)
+        seconds = time.perf_counter() - start
+        results['daemon'] = {'requests': len(latencies), 'requests_per_s': len(latencies) / seconds,
+                             'p50_ms': latencies[len(latencies) // 2] * 1000,
+                             'p99_ms': latencies[int(len(latencies) * 0.99)] * 1000}
+
+        input_path = os.path.join(work_dir, "kayit.json")
+        with open(input_path, 'wb') as f:
+            f.write(payloads[0])
+        for name, extra in (('cli', []), ('cli_daemon', ["--daemon", socket_path])):
+            start = time.perf_counter()
+            for _ in range(cli_runs):
+                subprocess.run([sys.executable, "-m", f"{package}.main", "compress", input_path, "-o", work_dir] + extra,
+                               cwd=package_parent, stdout=subprocess.DEVNULL, check=True)
+            seconds = time.perf_counter() - start
+            results[name] = {'requests': cli_runs, 'requests_per_s': cli_runs / seconds}
+    finally:
+        server.terminate()
+        server.wait()
+    return results
+
+def main():
+    import argparse
+    from .profiles import PROFILE_NAMES
+    from .utils import parse_size
+
+    parser = argparse.ArgumentParser(description="Akıllı Sıkıştırıcı daemon'u (Unix soketi).")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help="Daemon'u başlatır.")
+    serve_parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH, help=f"Soket yolu. Varsayılan: {DEFAULT_SOCKET_PATH}")
+    serve_parser.add_argument('--preset', choices=PROFILE_NAMES, default=DEFAULT_PROFILE, help="Varsayılan profil.")
+    serve_parser.add_argument('--verbose', action='store_true', help="Seçicinin istek başına çıktısını yazdırır.")
+    serve_parser.add_argument('--workers', type=int, default=None, help="İstekleri işleyen iş parçacığı sayısı. Varsayılan: çekirdek sayısı.")
+
+    bench_parser = subparsers.add_parser('bench', help="Daemon ile CLI'yi karşılaştıran yük testi.")
+    bench_parser.add_argument('--size', type=parse_size, default=4096, help="İstek boyutu (ör. 4K). Varsayılan: 4K.")
+    bench_parser.add_argument('--requests', type=int, default=5000, help="Daemon'a gönderilecek istek sayısı.")
+    bench_parser.add_argument('--threads', type=int, default=4, help="Eşzamanlı istemci sayısı.")
+    bench_parser.add_argument('--cli-runs', type=int, default=20, help="CLI'nin kaç kez başlatılacağı.")
+    bench_parser.add_argument('--preset', choices=PROFILE_NAMES, default=DEFAULT_PROFILE, help="Profil.")
+
+    args = parser.parse_args()
+    if args.command == 'serve':
+        serve(args.socket, args.preset, quiet=not args.verbose, workers=args.workers)
+    else:
+        results = run_load_test(args.size, args.requests, args.threads, args.cli_runs, args.preset)
+        print(f"--- Yük Testi ({results['size']}B istekler, sıkıştır + aç) ---")
+        daemon_results = results['daemon']
+        print(f"  Daemon ({results['threads']} istemci): {daemon_results['requests_per_s']:.0f} istek/s "
+              f"(p50 {daemon_results['p50_ms']:.2f} ms, p99 {daemon_results['p99_ms']:.2f} ms)")
+        print(f"  CLI süreci:            {results['cli']['requests_per_s']:.1f} istek/s")
+        print(f"  CLI --daemon:          {results['cli_daemon']['requests_per_s']:.1f} istek/s")
+        print(f"  Hızlanma (daemon / CLI): {daemon_results['requests_per_s'] / results['cli']['requests_per_s']:.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+# akilli_sikistirma/dedup_store.py
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import threading
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple
+
+from .compressors import Compressor
+from .utils import lazy_import
+
+# NumPy yoksa parça sınırları saf Python ile bulunur (aynı sonuç, daha yavaş). İlk kullanımda yüklenir.
+np = lazy_import("numpy")
+
+# Parça deposunun varsayılan SQLite veritabanı.
+DEFAULT_CHUNK_STORE = os.path.join(os.path.expanduser("~"), ".cache", "akilli_sikistirma", "chunks.sqlite3")
+
+# İçerik tanımlı parça boyutları. Ortalama boyut 2'nin kuvveti olmalıdır; beklenen parça
+# boyutu yaklaşık MIN + AVG'dir. Parçalar tek tek sıkıştırıldığı için çok küçük parçalar
+# oranı düşürür, çok büyük parçalar tekrarları yakalamayı zorlaştırır.
+DEFAULT_MIN_CHUNK = 16 * 1024
+DEFAULT_AVG_CHUNK = 64 * 1024
+DEFAULT_MAX_CHUNK = 256 * 1024
+
+# Girdi bu boyutta tamponlarla okunur; sınırlar tampon başına bulunur.
+CHUNKER_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Depoya yazma işlemi bu kadar yeni parçada bir onaylanır; böylece toplu kipte
+# diğer süreçler uzun süre beklemez.
+COMMIT_INTERVAL = 256
+
+# Bildirim (manifest) düzeni (.comp başlığından sonra, bkz. file_format CONTAINER_DEDUP):
+#   Her parça için: parça özeti (BLAKE2b, 32 bayt) | orijinal boyut (4 bayt)
+# Parçaların verisi depoda, özete göre saklanır.
+_MANIFEST_ENTRY = struct.Struct("<32sI")
+_DIGEST_SIZE = 32
+
+# Gear tablosu: her bayt değeri için sabit 64 bitlik rastgele değer. Sürümler arasında
+# değişmemesi için rastgele sayı üreteci yerine bayt değerinin özetinden türetilir.
+_GEAR = [int.from_bytes(hashlib.blake2b(bytes([value]), digest_size=8).digest(), 'little') for value in range(256)]
+_HASH_MASK = (1 << 64) - 1
+
+# Gear özeti her adımda bir bit sola kaydığı için 64 bayttan eski baytlar özetten düşer;
+# özet yalnızca son 64 bayta bağlıdır.
+_GEAR_WINDOW = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    digest BLOB NOT NULL UNIQUE,
+    codec TEXT NOT NULL,
+    params TEXT NOT NULL,
+    raw_size INTEGER NOT NULL,
+    data BLOB NOT NULL
+)
+"""
+
+def _boundary_mask(avg_size: int) -> int:
+    """Ortalama parça boyutuna göre özetin en üst bitlerini seçen maske."""
+    bits = avg_size.bit_length() - 1
+    return ((1 << bits) - 1) << (64 - bits)
+
+@functools.lru_cache(maxsize=None)
+def _gear_numpy():
+    return np.array(_GEAR, dtype=np.uint64)
+
+def _cut_points_numpy(data: bytes, mask: int, min_size: int, max_size: int) -> List[int]:
+    """
+    Tampondaki tüm konumların gear özetini vektörel olarak hesaplar.
+    h[i] = toplam(GEAR[b[i-j]] << j, j < 64) olduğundan pencere ikiye katlanarak
+    6 adımda bulunur: H_2w[i] = H_w[i] + (H_w[i-w] << w).
+    """
+    hashes = _gear_numpy()[np.frombuffer(data, dtype=np.uint8)]
+    width = 1
+    while width < _GEAR_WINDOW:
+        hashes[width:] += hashes[:-width] << np.uint64(width)
+        width *= 2
+    ends = np.flatnonzero((hashes & np.uint64(mask)) == 0) + 1
+
+    cuts = []
+    start = 0
+    length = len(data)
+    while True:
+        index = np.searchsorted(ends, start + min_size)
+        if index < len(ends) and ends[index] - start <= max_size:
+            start = int(ends[index])
+        elif length - start >= max_size:
+            start += max_size
+        else:
+            return cuts
+        cuts.append(start)
+
+def _cut_points_python(data: bytes, mask: int, min_size: int, max_size: int) -> List[int]:
+    """
+    _cut_points_numpy ile aynı sınırları bayt bayt bulur. Parçanın ilk min_size baytında
+    sınır aranmadığı için özet yalnızca aranan bölgenin 64 bayt öncesinden başlatılır.
+    """
+    gear = _GEAR
+    cuts = []
+    start = 0
+    length = len(data)
+    while length - start >= min_size:
+        end = min(start + max_size, length)
+        position = start + min_size - _GEAR_WINDOW
+        hash_value = 0
+        for position in range(position, start + min_size - 1):
+            hash_value = ((hash_value << 1) + gear[data[position]]) & _HASH_MASK
+        cut = None
+        for position in range(start + min_size - 1, end):
+            hash_value = ((hash_value << 1) + gear[data[position]]) & _HASH_MASK
+            if not hash_value & mask:
+                cut = position + 1
+                break
+        if cut is None:
+            if end - start < max_size:
+                break
+            cut = end
+        cuts.append(cut)
+        start = cut
+    return cuts
+
+def iter_chunks(src: BinaryIO, min_size: int = DEFAULT_MIN_CHUNK, avg_size: int = DEFAULT_AVG_CHUNK,
+                max_size: int = DEFAULT_MAX_CHUNK, use_numpy: bool = None) -> Iterator[memoryview]:
+    """
+    Girdiyi gear kayan özetiyle içerik tanımlı parçalara böler.
+    Sınırlar içerikten belirlendiği için dosyanın başına veri eklense de sonraki
+    parçalar aynı kalır ve depoda yeniden kullanılır. Sınırlar tampon boyutundan
+    ve NumPy'nin varlığından bağımsızdır.
+    """
+    if min_size < _GEAR_WINDOW or not min_size < avg_size < max_size or max_size > CHUNKER_BUFFER_SIZE:
+        raise ValueError(f"Geçersiz parça boyutları: {min_size}/{avg_size}/{max_size}")
+    use_numpy = np is not None if use_numpy is None else use_numpy
+    cut_points = _cut_points_numpy if use_numpy else _cut_points_python
+    mask = _boundary_mask(avg_size)
+
+    pending = b""
+    while True:
+        data = src.read(CHUNKER_BUFFER_SIZE)
+        buffer = pending + data if pending else data
+        view = memoryview(buffer)
+        start = 0
+        for cut in cut_points(buffer, mask, min_size, max_size):
+            yield view[start:cut]
+            start = cut
+        if not data:
+            if start < len(buffer):
+                yield view[start:]
+            return
+        pending = bytes(view[start:])
+
+class ChunkStore:
+    """
+    Sıkıştırılmış parçaları özetlerine göre saklayan depo (SQLite, WAL kipi).
+    Depoda bulunan özetler açılışta bellekteki bir kümeye yüklenir; tekrar eden
+    parça aramaları veritabanına gitmez. Toplu sıkıştırmada birden çok süreç aynı
+    depoya yazabilir; aynı parçayı eşzamanlı ekleyen süreçlerden yalnızca biri yazar.
+
+    Sayaçlar (logical_bytes, new_bytes, stored_bytes, chunks, new_chunks) depo
+    açıldığından beri yapılan eklemeleri izler.
+    """
+    def __init__(self, path: str = DEFAULT_CHUNK_STORE):
+        self.path = path
+        self.logical_bytes = 0
+        self.new_bytes = 0
+        self.stored_bytes = 0
+        self.chunks = 0
+        self.new_chunks = 0
+        self._index = None
+        self._connection = None
+        self._uncommitted = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(_SCHEMA)
+            self._index = {row[0] for row in self._connection.execute("SELECT digest FROM chunks")}
+        return self._connection
+
+    def __contains__(self, digest: bytes) -> bool:
+        with self._lock:
+            self._connect()
+            return digest in self._index
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._connect()
+            return len(self._index)
+
+    def add(self, digest: bytes, chunk: bytes, compressor: Compressor) -> bool:
+        """
+        Parçayı depoda yoksa sıkıştırıp ekler. Sıkıştırma kazanç sağlamazsa parça
+        sıkıştırılmadan ('stored') saklanır. Parça yeni eklendiyse True döner.
+        Eklemeler commit() çağrılana kadar (veya COMMIT_INTERVAL parçada bir) onaylanmaz.
+        """
+        with self._lock:
+            connection = self._connect()
+            self.chunks += 1
+            self.logical_bytes += len(chunk)
+            if digest in self._index:
+                return False
+            # Bellekteki küme açılıştan sonra başka süreçlerin eklediği parçaları içermez.
+            if connection.execute("SELECT 1 FROM chunks WHERE digest = ?", (digest,)).fetchone() is not None:
+                self._index.add(digest)
+                return False
+
+            data = compressor.compress(chunk)
+            codec_name, params = compressor.get_name(), compressor.get_params()
+            if len(data) >= len(chunk):
+                data, codec_name, params = bytes(chunk), "stored", {}
+            inserted = connection.execute(
+                "INSERT OR IGNORE INTO chunks (digest, codec, params, raw_size, data) VALUES (?, ?, ?, ?, ?)",
+                (digest, codec_name, json.dumps(params, sort_keys=True), len(chunk), data)).rowcount
+            self._index.add(digest)
+            if not inserted:
+                return False
+            self.new_chunks += 1
+            self.new_bytes += len(chunk)
+            self.stored_bytes += len(data)
+            self._uncommitted += 1
+            if self._uncommitted >= COMMIT_INTERVAL:
+                connection.commit()
+                self._uncommitted = 0
+            return True
+
+    def get(self, digest: bytes) -> Tuple[str, Dict[str, Any], bytes]:
+        """Parçanın (algoritma, parametreler, sıkıştırılmış veri) bilgisini döndürür."""
+        with self._lock:
+            row = self._connect().execute("SELECT codec, params, data FROM chunks WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            raise ValueError(f"Parça depoda bulunamadı: {digest.hex()} ('{self.path}')")
+        return row[0], json.loads(row[1]), row[2]
+
+    def commit(self):
+        """Bekleyen eklemeleri onaylar; bildirim yazılmadan önce çağrılmalıdır."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.commit()
+                self._uncommitted = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Tekilleştirme sayaçlarını döndürür."""
+        return {
+            'chunks': self.chunks,
+            'new_chunks': self.new_chunks,
+            'logical_bytes': self.logical_bytes,
+            'new_bytes': self.new_bytes,
+            'stored_bytes': self.stored_bytes,
+            'dedup_ratio': self.logical_bytes / self.new_bytes if self.new_bytes else float('inf')
+        }
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.commit()
+                self._connection.close()
+                self._connection = None
+
+def compress_chunks(src: BinaryIO, dst: BinaryIO, compressor: Compressor, store: ChunkStore,
+                    min_size: int = DEFAULT_MIN_CHUNK, avg_size: int = DEFAULT_AVG_CHUNK,
+                    max_size: int = DEFAULT_MAX_CHUNK) -> Dict[str, int]:
+    """
+    Girdiyi içerik tanımlı parçalara böler, depoda olmayan parçaları sıkıştırıp depoya
+    ekler ve hedefe yalnızca parça bildirimini yazar (başlık çağıran tarafından yazılır).
+
+    Returns:
+        dict: 'bytes_in', 'bytes_out' (bildirim boyutu), 'chunks', 'new_chunks',
+              'new_bytes' (depoya eklenen orijinal bayt) ve 'stored_bytes' (depoda kapladığı yer).
+    """
+    stats = {'bytes_in': 0, 'bytes_out': 0, 'chunks': 0, 'new_chunks': 0, 'new_bytes': 0, 'stored_bytes': 0}
+    for chunk in iter_chunks(src, min_size, avg_size, max_size):
+        digest = hashlib.blake2b(chunk, digest_size=_DIGEST_SIZE).digest()
+        stored_before = store.stored_bytes
+        if store.add(digest, chunk, compressor):
+            stats['new_chunks'] += 1
+            stats['new_bytes'] += len(chunk)
+            stats['stored_bytes'] += store.stored_bytes - stored_before
+        dst.write(_MANIFEST_ENTRY.pack(digest, len(chunk)))
+        stats['chunks'] += 1
+        stats['bytes_in'] += len(chunk)
+        stats['bytes_out'] += _MANIFEST_ENTRY.size
+    store.commit()
+    return stats
+
+def decompress_chunks(src: BinaryIO, dst: BinaryIO, store: ChunkStore, selector) -> int:
+    """
+    Bildirimdeki parçaları depodan okuyup sırasıyla açarak hedefe yazar.
+    Her parçanın algoritması ve parametreleri depoda saklandığından açıcılar
+    seçici üzerinden oluşturulur (bkz. CompressorSelector.compressor_from_header).
+    Yazılan bayt sayısını döndürür.
+    """
+    decompressors: Dict[Tuple[str, str], Compressor] = {}
+    bytes_out = 0
+    while True:
+        entry = src.read(_MANIFEST_ENTRY.size)
+        if not entry:
+            return bytes_out
+        if len(entry) != _MANIFEST_ENTRY.size:
+            raise ValueError("Parça bildirimi beklenmedik şekilde sona erdi.")
+        digest, raw_size = _MANIFEST_ENTRY.unpack(entry)
+        codec_name, params, data = store.get(digest)
+        if codec_name == "stored":
+            chunk = data
+        else:
+            key = (codec_name, json.dumps(params, sort_keys=True))
+            if key not in decompressors:
+                decompressors[key] = selector.compressor_from_header(codec_name, params)
+            chunk = decompressors[key].decompress(data)
+        if len(chunk) != raw_size:
+            raise ValueError(f"Parça boyutu uyuşmazlığı: beklenen {raw_size}B, açılan {len(chunk)}B")
+        dst.write(chunk)
+        bytes_out += raw_size
+
+if __name__ == "__main__":
+    import io
+    import random
+    import tempfile
+    import time
+    from .compressors import ZstandardCompressor
+
+    print("--- dedup_store.py Modül Testleri ---")
+
+    rng = random.Random(7)
+    base = bytes(rng.getrandbits(8) for _ in range(2 * 1024 * 1024))
+
+    if np is not None:
+        start = time.perf_counter()
+        numpy_chunks = [bytes(chunk) for chunk in iter_chunks(io.BytesIO(base), use_numpy=True)]
+        numpy_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        python_chunks = [bytes(chunk) for chunk in iter_chunks(io.BytesIO(base), use_numpy=False)]
+        python_seconds = time.perf_counter() - start
+        print(f"  NumPy ve Python sınırları aynı: {'BAŞARILI' if numpy_chunks == python_chunks else 'HATA'} "
+              f"({len(numpy_chunks)} parça; NumPy {len(base) / numpy_seconds / 1e6:.1f} MB/s, "
+              f"Python {len(base) / python_seconds / 1e6:.1f} MB/s)")
+
+    # Başa veri eklenmesi yalnızca ilk parçaları etkilemelidir.
+    shifted = b"yeni satir\n" * 100 + base
+    original_chunks = {bytes(chunk) for chunk in iter_chunks(io.BytesIO(base))}
+    shifted_chunks = [bytes(chunk) for chunk in iter_chunks(io.BytesIO(shifted))]
+    reused = sum(chunk in original_chunks for chunk in shifted_chunks)
+    print(f"  Başa ekleme sonrası yeniden kullanılan parçalar: {reused}/{len(shifted_chunks)}")
+
+    store = ChunkStore(os.path.join(tempfile.mkdtemp(), "chunks.sqlite3"))
+    compressor = ZstandardCompressor()
+    for data in (base, shifted):
+        manifest = io.BytesIO()
+        stats = compress_chunks(io.BytesIO(data), manifest, compressor, store)
+        print(f"  {stats['chunks']} parça, {stats['new_chunks']} yeni, depoya eklenen: {stats['stored_bytes']}B")
+
+        from .compressor_selector import CompressorSelector
+        manifest.seek(0)
+        restored = io.BytesIO()
+        decompress_chunks(manifest, restored, store, CompressorSelector())
+        print(f"  Geri açma: {'BAŞARILI' if restored.getvalue() == data else 'HATA'}")
+    print(f"  Tekilleştirme oranı: {store.stats()['dedup_ratio']:.2f}x")
+    store.close()
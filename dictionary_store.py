@@ -0,0 +1,178 @@
+# akilli_sikistirma/dictionary_store.py
+
+import os
+import threading
+from typing import Dict, List, Optional
+
+from .utils import lazy_import
+
+# zstandard yalnızca sözlük eğitilirken veya kullanılırken yüklenir.
+zstandard = lazy_import("zstandard")
+
+# Sözlüklerin varsayılan olarak saklandığı dizin.
+DEFAULT_DICTIONARY_DIR = os.path.join(os.path.expanduser("~"), ".cache", "akilli_sikistirma", "dictionaries")
+
+# Eğitilen sözlüğün varsayılan boyutu (zstd'nin önerdiği ~110 KB).
+DEFAULT_DICTIONARY_SIZE = 112640
+
+# Eğitimde her dosyadan alınacak en fazla bayt; sözlük küçük dosyalar için
+# eğitildiğinden büyük dosyaların yalnızca başı örnek olarak kullanılır.
+TRAINING_SAMPLE_LIMIT = 64 * 1024
+
+_DICTIONARY_SUFFIX = ".zdict"
+_CURRENT_FILE = "CURRENT"
+
+class DictionaryStore:
+    """
+    Eğitilmiş zstd sözlüklerini diskte sürümlü olarak saklar.
+    Her sözlük zstd sözlük kimliğiyle '<kimlik>.zdict' dosyasına yazılır; yeni bir
+    eğitim eskisinin üzerine yazmaz, yalnızca 'CURRENT' dosyasındaki etkin kimliği
+    değiştirir. Böylece eski sözlükle sıkıştırılmış dosyalar açılabilmeye devam eder.
+
+    Yüklenen sözlükler ve bunlardan hazırlanan sıkıştırma/açma bağlamları bellekte
+    tutulur; aynı sözlükle sıkıştırılan her yeni dosya bunları yeniden kullanır.
+    Bağlamlar iş parçacığına özgüdür (zstd bağlamları eşzamanlı kullanılamaz).
+    """
+    def __init__(self, directory: str = DEFAULT_DICTIONARY_DIR):
+        self.directory = directory
+        self._dictionaries: Dict[int, "zstandard.ZstdCompressionDict"] = {}
+        self._precomputed_levels = set()
+        self._lock = threading.Lock()
+        self._contexts = threading.local()
+
+    def _path(self, dict_id: int) -> str:
+        return os.path.join(self.directory, f"{dict_id}{_DICTIONARY_SUFFIX}")
+
+    def train(self, filepaths: List[str], dict_size: int = DEFAULT_DICTIONARY_SIZE) -> int:
+        """
+        Verilen dosyalardan bir sözlük eğitir, depoya yazar ve etkin sözlük yapar.
+        Her dosyanın en fazla TRAINING_SAMPLE_LIMIT baytı örnek olarak kullanılır.
+
+        Returns:
+            int: Yeni sözlüğün kimliği.
+        """
+        if zstandard is None:
+            raise ValueError("Sözlük eğitimi için 'zstandard' paketi gerekir (pip install zstandard).")
+        samples = []
+        for filepath in filepaths:
+            with open(filepath, 'rb') as f:
+                sample = f.read(TRAINING_SAMPLE_LIMIT)
+            if sample:
+                samples.append(sample)
+        if not samples:
+            raise ValueError("Sözlük eğitimi için örnek dosya bulunamadı.")
+
+        try:
+            dictionary = zstandard.train_dictionary(dict_size, samples)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Sözlük eğitilemedi ({len(samples)} örnek): {e}. Daha fazla veya daha büyük örnek gerekebilir.")
+
+        dict_id = dictionary.dict_id()
+        os.makedirs(self.directory, exist_ok=True)
+        # Önce geçici dosyaya yazılıp yeniden adlandırılır; yarım yazılmış sözlük asla görünmez.
+        temporary_path = self._path(dict_id) + ".tmp"
+        with open(temporary_path, 'wb') as f:
+            f.write(dictionary.as_bytes())
+        os.replace(temporary_path, self._path(dict_id))
+        temporary_path = os.path.join(self.directory, _CURRENT_FILE + ".tmp")
+        with open(temporary_path, 'w') as f:
+            f.write(f"{dict_id}\n")
+        os.replace(temporary_path, os.path.join(self.directory, _CURRENT_FILE))
+
+        with self._lock:
+            self._dictionaries[dict_id] = dictionary
+        return dict_id
+
+    def current_id(self) -> Optional[int]:
+        """Etkin sözlüğün kimliğini, depoda sözlük yoksa None döndürür."""
+        try:
+            with open(os.path.join(self.directory, _CURRENT_FILE)) as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def list_ids(self) -> List[int]:
+        """Depodaki tüm sözlük kimliklerini eskiden yeniye sıralı döndürür."""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = [name for name in os.listdir(self.directory) if name.endswith(_DICTIONARY_SUFFIX)]
+        entries.sort(key=lambda name: os.path.getmtime(os.path.join(self.directory, name)))
+        return [int(name[:-len(_DICTIONARY_SUFFIX)]) for name in entries]
+
+    def load(self, dict_id: int) -> "zstandard.ZstdCompressionDict":
+        """Sözlüğü önbellekten, yoksa diskten yükler."""
+        with self._lock:
+            dictionary = self._dictionaries.get(dict_id)
+            if dictionary is None:
+                try:
+                    with open(self._path(dict_id), 'rb') as f:
+                        dictionary = zstandard.ZstdCompressionDict(f.read())
+                except FileNotFoundError:
+                    raise ValueError(f"Sözlük bulunamadı: {dict_id} ('{self.directory}' dizininde).")
+                self._dictionaries[dict_id] = dictionary
+            return dictionary
+
+    def compressor(self, dict_id: int, level: int) -> "zstandard.ZstdCompressor":
+        """
+        Sözlüğü kullanan, önceden hazırlanmış bir sıkıştırma bağlamı döndürür.
+        Sözlük tablosu seviye başına bir kez hesaplanır; bağlam iş parçacığı başına bir kez oluşturulur.
+        """
+        compressors = self._contexts.__dict__.setdefault('compressors', {})
+        context = compressors.get((dict_id, level))
+        if context is None:
+            dictionary = self.load(dict_id)
+            with self._lock:
+                if (dict_id, level) not in self._precomputed_levels:
+                    dictionary.precompute_compress(level=level)
+                    self._precomputed_levels.add((dict_id, level))
+            # Sözlük kimliği .comp başlığında bulunur; çerçeveye ayrıca yazılmaz (küçük dosyada 4 bayt).
+            context = compressors[(dict_id, level)] = zstandard.ZstdCompressor(level=level, dict_data=dictionary,
+                                                                                write_dict_id=False)
+        return context
+
+    def decompressor(self, dict_id: int) -> "zstandard.ZstdDecompressor":
+        """Sözlüğü kullanan ve iş parçacığı başına bir kez oluşturulan açma bağlamını döndürür."""
+        decompressors = self._contexts.__dict__.setdefault('decompressors', {})
+        context = decompressors.get(dict_id)
+        if context is None:
+            context = decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=self.load(dict_id))
+        return context
+
+if __name__ == "__main__":
+    import json
+    import shutil
+    import tempfile
+    import time
+
+    print("--- dictionary_store.py Modül Testleri ---")
+
+    work_dir = tempfile.mkdtemp()
+    records = [json.dumps({"id": i, "kullanici": f"kullanici{i % 97}", "olay": ["giris", "cikis", "hata"][i % 3],
+                           "basarili": i % 7 != 0, "zaman": 1700000000 + i * 13}).encode() for i in range(3000)]
+    sample_paths = []
+    for i, record in enumerate(records[:1000]):
+        path = os.path.join(work_dir, f"kayit_{i}.json")
+        with open(path, 'wb') as f:
+            f.write(record)
+        sample_paths.append(path)
+
+    store = DictionaryStore(os.path.join(work_dir, "sozlukler"))
+    dict_id = store.train(sample_paths, dict_size=16 * 1024)
+    print(f"  Eğitilen sözlük: {dict_id}, etkin: {store.current_id()}, depodaki sürümler: {store.list_ids()}")
+
+    test_records = records[1000:]
+    plain_size = sum(len(zstandard.compress(record, 3)) for record in test_records)
+    start = time.perf_counter()
+    compressed = [store.compressor(dict_id, 3).compress(record) for record in test_records]
+    elapsed = time.perf_counter() - start
+    dict_size = sum(len(data) for data in compressed)
+    restored = [store.decompressor(dict_id).decompress(data) for data in compressed]
+    print(f"  {len(test_records)} kayıt: sözlüksüz {plain_size}B, sözlüklü {dict_size}B "
+          f"({plain_size / dict_size:.2f}x daha küçük), kayıt başına {elapsed / len(test_records) * 1e6:.1f} µs")
+    print(f"  Açma: {'BAŞARILI' if restored == test_records else 'HATA'}")
+
+    # Yeni bir depo örneği sözlüğü diskten yükler.
+    reloaded = DictionaryStore(store.directory)
+    print(f"  Diskten yükleme: {'BAŞARILI' if reloaded.decompressor(dict_id).decompress(compressed[0]) == test_records[0] else 'HATA'}")
+
+    shutil.rmtree(work_dir)
@@ -0,0 +1,126 @@
+# akilli_sikistirma/file_format.py
+
+import json
+import os
+import struct
+from typing import BinaryIO, Dict, Any
+
+# .comp dosya başlığı (küçük-endian):
+#   sihirli baytlar (4) | biçim sürümü (1) | algoritma kimliği (1) | kapsayıcı tipi (1) | ayrılmış (1)
+#   orijinal boyut (8) | orijinal verinin CRC32 sağlaması (4) | parametre uzunluğu (2)
+#   parametreler (JSON, UTF-8; ör. {"level": 3}; parametre yoksa boş)
+# Orijinal boyut ve sağlama, veri akış halinde yazıldıktan sonra başlığa işlenir.
+FORMAT_MAGIC = b"SMCP"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sBBBxQIH")
+_SIZE_AND_CHECKSUM = struct.Struct("<QI")
+_SIZE_OFFSET = 8
+
+# Parametresiz başlığın boyutu (ör. 'stored' akışı): sıkıştırılmış dosyanın girdiye göre en küçük ek yükü.
+MIN_HEADER_SIZE = _HEADER.size
+
+# Kapsayıcı tipleri: sıkıştırılmış verinin başlıktan sonraki düzeni.
+CONTAINER_STREAM = 0  # Tek bir sıkıştırılmış akış
+CONTAINER_BLOCKS = 1  # Bağımsız bloklardan oluşan çerçeveli kapsayıcı (bkz. block_container)
+CONTAINER_DEDUP = 2   # Parça deposundaki içerik tanımlı parçaların bildirimi (bkz. dedup_store)
+
+# Başlıkta ve blok çerçevelerinde algoritma adı yerine saklanan sabit kimlikler.
+CODEC_IDS = {
+    "stored": 0,
+    "zlib": 1,
+    "lzma": 2,
+    "bz2": 3,
+    "brotli": 4,
+    "zstandard": 5
+}
+CODEC_NAMES = {codec_id: name for name, codec_id in CODEC_IDS.items()}
+
+# Sabit kimliği olmayan (entry point ile eklenen) algoritmalar bu kimlikle yazılır;
+# algoritmanın adı parametrelerde 'codec' anahtarıyla saklanır (bkz. codec_registry).
+CODEC_ID_EXTERNAL = 255
+
+def write_header(dst: BinaryIO, codec_name: str, container: int = CONTAINER_STREAM,
+                 params: Dict[str, Any] = None, original_size: int = 0, checksum: int = 0) -> int:
+    """
+    Başlığı hedefe yazar ve yazılan bayt sayısını döndürür.
+    Orijinal boyut ve sağlama bilinmiyorsa sıfır yazılır, sonradan patch_header ile güncellenir.
+    """
+    codec_id = CODEC_IDS.get(codec_name, CODEC_ID_EXTERNAL)
+    if codec_id == CODEC_ID_EXTERNAL:
+        params = dict(params or {}, codec=codec_name)
+    # Parametre yoksa JSON da yazılmaz; read_header boş parametreleri {} olarak okur.
+    encoded_params = json.dumps(params, separators=(",", ":"), sort_keys=True).encode("utf-8") if params else b""
+    dst.write(_HEADER.pack(FORMAT_MAGIC, FORMAT_VERSION, codec_id, container,
+                           original_size, checksum, len(encoded_params)))
+    dst.write(encoded_params)
+    return _HEADER.size + len(encoded_params)
+
+def patch_header(dst: BinaryIO, header_offset: int, original_size: int, checksum: int):
+    """Daha önce yazılmış başlıktaki orijinal boyut ve sağlama alanlarını günceller. Yazma konumu korunur."""
+    position = dst.tell()
+    dst.seek(header_offset + _SIZE_OFFSET)
+    dst.write(_SIZE_AND_CHECKSUM.pack(original_size, checksum))
+    dst.seek(position)
+
+def read_header(src: BinaryIO) -> Dict[str, Any] or None:
+    """
+    Kaynağın başındaki başlığı okur ve okuma konumunu verinin başına getirir.
+    Dosya başlıksızsa (eski biçim) None döndürür ve okuma konumunu değiştirmez.
+
+    Returns:
+        dict or None: 'version', 'codec', 'container', 'original_size', 'checksum',
+                      'params' ve 'header_size' anahtarlarını içeren sözlük.
+    """
+    position = src.tell()
+    fixed = src.read(_HEADER.size)
+    if len(fixed) < _HEADER.size or fixed[:len(FORMAT_MAGIC)] != FORMAT_MAGIC:
+        src.seek(position)
+        return None
+
+    _magic, version, codec_id, container, original_size, checksum, params_size = _HEADER.unpack(fixed)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Desteklenmeyen .comp biçim sürümü: {version}")
+    if codec_id not in CODEC_NAMES and codec_id != CODEC_ID_EXTERNAL:
+        raise ValueError(f"Bilinmeyen algoritma kimliği: {codec_id}")
+
+    encoded_params = src.read(params_size)
+    if len(encoded_params) != params_size:
+        raise ValueError("Başlık beklenmedik şekilde sona erdi.")
+    params = json.loads(encoded_params.decode("utf-8")) if params_size else {}
+    if codec_id == CODEC_ID_EXTERNAL and not isinstance(params.get('codec'), str):
+        raise ValueError("Başlıkta harici algoritmanın adı eksik.")
+
+    return {
+        'version': version,
+        'codec': params.pop('codec') if codec_id == CODEC_ID_EXTERNAL else CODEC_NAMES[codec_id],
+        'container': container,
+        'original_size': original_size,
+        'checksum': checksum,
+        'params': params,
+        'header_size': _HEADER.size + params_size
+    }
+
+def sniff(filepath: str) -> Dict[str, Any] or None:
+    """
+    Bir dosyanın .comp biçiminde olup olmadığını yalnızca ilk baytlarını okuyarak belirler.
+    Biçim tanınırsa başlık bilgilerini, aksi halde None döndürür.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            return read_header(f)
+    except (OSError, ValueError):
+        return None
+
+def original_filename(compressed_filename: str, codec_name: str) -> str:
+    """
+    Sıkıştırılmış dosya adından açılacak dosyanın adını üretir.
+    Örn: 'rapor.txt.zstandard.comp' -> 'rapor.txt', 'yeniden_adlandirildi.comp' -> 'yeniden_adlandirildi'
+    """
+    base_name = os.path.basename(compressed_filename)
+    if base_name.endswith(".comp"):
+        base_name = base_name[:-len(".comp")]
+        if base_name.endswith(f".{codec_name}"):
+            base_name = base_name[:-len(codec_name) - 1]
+        return base_name
+    return base_name + ".out"
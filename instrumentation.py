@@ -0,0 +1,374 @@
+# akilli_sikistirma/instrumentation.py
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .utils import write_vectored
+
+# Ölçülen aşamalar. Okuma ve yazma, akış sırasında dosyaya yapılan çağrıların toplam süresidir;
+# sıkıştırma/açma aşaması akışın kalan süresidir (okuma ve yazma başka iş parçacıklarında
+# yapılıyorsa, ör. 'pipeline' G/Ç motorunda, bunlar aşamayla örtüşür ve ondan düşülmez).
+STAGES = ('analysis', 'selection', 'read', 'compress', 'decompress', 'write')
+
+_STAGE_LABELS = {'analysis': 'analiz', 'selection': 'seçim', 'read': 'okuma', 'compress': 'sıkıştırma',
+                 'decompress': 'açma', 'write': 'yazma'}
+
+METRIC_PREFIX = "akilli_sikistirma"
+
+def peak_rss_bytes() -> Optional[int]:
+    """Sürecin şimdiye kadarki en yüksek bellek kullanımı (RSS); ölçülemiyorsa None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss Linux'ta KB, macOS'ta bayt cinsindendir.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+class _TimedFile:
+    """
+    Dosya çağrılarının (read/readinto, write/writev) süresini ve bayt sayısını biriktiren sarmalayıcı.
+    Sarmalayıcıyı oluşturan iş parçacığında geçen süre ayrıca tutulur; böylece aynı iş parçacığında
+    çalışan sıkıştırma aşamasının süresinden düşülebilir. Diğer öznitelikler (tell, seek, fileno)
+    sarılan dosyaya iletilir.
+    """
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self._owner = threading.get_ident()
+        self.seconds = 0.0
+        self.foreground_seconds = 0.0
+        self.bytes = 0
+
+    def _account(self, start: float, count: int):
+        elapsed = time.perf_counter() - start
+        self.seconds += elapsed
+        if threading.get_ident() == self._owner:
+            self.foreground_seconds += elapsed
+        self.bytes += count
+
+    def read(self, size: int = -1) -> bytes:
+        start = time.perf_counter()
+        data = self._f.read(size)
+        self._account(start, len(data))
+        return data
+
+    def readinto(self, buffer) -> int:
+        start = time.perf_counter()
+        count = self._f.readinto(buffer)
+        self._account(start, count or 0)
+        return count
+
+    def write(self, data) -> int:
+        start = time.perf_counter()
+        written = self._f.write(data)
+        self._account(start, len(data))
+        return written
+
+    def writev(self, pieces: list) -> int:
+        start = time.perf_counter()
+        writev = getattr(self._f, 'writev', None)
+        written = writev(pieces) if writev is not None else write_vectored(self._f, pieces)
+        self._account(start, sum(len(piece) for piece in pieces))
+        return written
+
+    def __getattr__(self, name: str):
+        return getattr(self._f, name)
+
+class Operation:
+    """
+    Tek bir sıkıştırma veya açma işleminin ölçümleri: aşama süreleri (duvar ve CPU), bayt sayıları
+    ve öznitelikler (algoritma, seçim gerekçesi vb.). finish() bir olay sözlüğü üretir ve kayıtlı
+    tüm hedeflere (sink) iletir.
+    """
+    def __init__(self, kind: str, filepath: str, sinks: List[Any]):
+        self.kind = kind
+        self.filepath = filepath
+        self.sinks = sinks
+        self.attributes: Dict[str, Any] = {}
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.finished = False
+        self._start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def add(self, name: str, seconds: float, cpu_seconds: float = 0.0, nbytes: int = 0, overlapped: bool = False):
+        """Bir aşamaya süre ve bayt ekler; aynı aşama birden çok kez eklenirse değerler toplanır."""
+        stage = self.stages.setdefault(name, {'seconds': 0.0, 'cpu_seconds': 0.0, 'bytes': 0, 'overlapped': False})
+        stage['seconds'] += seconds
+        stage['cpu_seconds'] += cpu_seconds
+        stage['bytes'] += nbytes
+        stage['overlapped'] = stage['overlapped'] or overlapped
+
+    @contextmanager
+    def span(self, name: str, nbytes: int = 0):
+        """Bloğun duvar ve CPU süresini 'name' aşamasına ekler."""
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, time.process_time() - cpu_start, nbytes)
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def timed(self, f: BinaryIO) -> _TimedFile:
+        return _TimedFile(f)
+
+    @contextmanager
+    def stream(self, name: str, reader: _TimedFile, writer: _TimedFile):
+        """
+        Akış aşamasını ölçer: okuma ve yazma çağrıları 'read'/'write' aşamalarına, kalan süre
+        'name' (compress/decompress) aşamasına yazılır. CPU süresi tamamen 'name' aşamasına aittir.
+        """
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            foreground = reader.foreground_seconds + writer.foreground_seconds
+            self.add('read', reader.seconds, nbytes=reader.bytes, overlapped=reader.seconds > reader.foreground_seconds)
+            # Aşamanın hızı sıkıştırılmamış veri üzerinden hesaplanır: sıkıştırmada girdi, açmada çıktı.
+            nbytes = writer.bytes if name == 'decompress' else reader.bytes
+            self.add(name, max(elapsed - foreground, 0.0), time.process_time() - cpu_start, nbytes)
+            self.add('write', writer.seconds, nbytes=writer.bytes, overlapped=writer.seconds > writer.foreground_seconds)
+
+    def finish(self, error: Any = None) -> Dict[str, Any]:
+        """İşlemi bitirir ve olayı hedeflere iletir. İkinci çağrı bir şey yapmaz."""
+        if self.finished:
+            return {}
+        self.finished = True
+        duration = time.perf_counter() - self._start
+        original_bytes = self.bytes_out if self.kind == 'decompress' else self.bytes_in
+        stages = {}
+        for name, stage in self.stages.items():
+            stages[name] = dict(stage, mb_s=stage['bytes'] / stage['seconds'] / 1e6 if stage['seconds'] > 0 else None)
+        event = {
+            'event': self.kind,
+            'timestamp': time.time(),
+            'file': self.filepath,
+            'status': 'error' if error is not None else 'ok',
+            'error': str(error) if error is not None else None,
+            'duration_seconds': duration,
+            'cpu_seconds': time.process_time() - self._cpu_start,
+            'peak_rss_bytes': peak_rss_bytes(),
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'throughput_mb_s': original_bytes / duration / 1e6 if duration > 0 else None,
+            'attributes': self.attributes,
+            'stages': stages,
+        }
+        for sink in self.sinks:
+            try:
+                sink.emit(event)
+            except Exception as e:
+                # Ölçüm hedefindeki bir hata (ör. dolu disk) asıl işlemi bozmamalıdır.
+                print(f"  Uyarı: Ölçüm olayı '{type(sink).__name__}' hedefine yazılamadı: {e}")
+        return event
+
+class Instrumentation:
+    """
+    Ölçüm katmanı: her işlem için bir Operation oluşturur ve bitince olayı hedeflere iletir.
+    Hedef, emit(event) metodu olan herhangi bir nesnedir (JsonLinesSink, PrometheusSink,
+    CallbackSink). Hedef verilmezse ölçümler yapılır ancak hiçbir yere yazılmaz.
+    """
+    def __init__(self, sinks: List[Any] = None):
+        self.sinks = list(sinks or [])
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def operation(self, kind: str, filepath: str) -> Operation:
+        return Operation(kind, filepath, self.sinks)
+
+class JsonLinesSink:
+    """Her olayı dosyaya tek satırlık bir JSON olarak ekler (ör. log toplama araçları için)."""
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, event: Dict[str, Any]):
+        line = json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+class PrometheusSink:
+    """
+    Olayları süreç boyunca toplar ve Prometheus metin biçiminde bir dosyaya yazar (node_exporter
+    textfile toplayıcısı için). Dosya her olayda geçici bir dosyaya yazılıp yerine taşınır; okuyucu
+    hiçbir zaman yarım dosya görmez. Dosya zaten varsa sayaçlar oradan devam eder; böylece her
+    CLI çağrısı ayrı bir süreç olsa da toplamlar korunur.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._operations: Dict[tuple, int] = {}
+        self._bytes: Dict[tuple, int] = {}
+        self._stage_seconds: Dict[tuple, float] = {}
+        self._stage_bytes: Dict[tuple, int] = {}
+        self._last_duration: Dict[str, float] = {}
+        self._peak_rss = None
+        self._load()
+
+    def _load(self):
+        """Önceki çalıştırmaların yazdığı sayaçları okur."""
+        targets = {'operations_total': self._operations, 'bytes_total': self._bytes,
+                   'stage_seconds_total': self._stage_seconds, 'stage_bytes_total': self._stage_bytes}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        for line in lines:
+            match = _SAMPLE_PATTERN.match(line)
+            if match is None or match.group(1) not in targets:
+                continue
+            key = tuple(_unescape_label(value) for value in _LABEL_PATTERN.findall(match.group(2)))
+            value = float(match.group(3))
+            targets[match.group(1)][key] = value if 'seconds' in match.group(1) else int(value)
+
+    def emit(self, event: Dict[str, Any]):
+        kind = event['event']
+        codec = event['attributes'].get('codec', '')
+        with self._lock:
+            key = (kind, codec, event['status'])
+            self._operations[key] = self._operations.get(key, 0) + 1
+            for direction in ('in', 'out'):
+                key = (kind, direction)
+                self._bytes[key] = self._bytes.get(key, 0) + event[f'bytes_{direction}']
+            for stage, values in event['stages'].items():
+                key = (kind, stage)
+                self._stage_seconds[key] = self._stage_seconds.get(key, 0.0) + values['seconds']
+                self._stage_bytes[key] = self._stage_bytes.get(key, 0) + values['bytes']
+            self._last_duration[kind] = event['duration_seconds']
+            if event['peak_rss_bytes'] is not None:
+                self._peak_rss = event['peak_rss_bytes']
+            self._write()
+
+    def _write(self):
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: Dict[tuple, Any], labels: tuple):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            for key, value in sorted(samples.items()):
+                label_text = ",".join(f'{label}="{_escape_label(str(part))}"' for label, part in zip(labels, key))
+                lines.append(f"{METRIC_PREFIX}_{name}{{{label_text}}} {value}")
+
+        metric("operations_total", "counter", "Tamamlanan işlem sayısı.", self._operations,
+               ('operation', 'codec', 'status'))
+        metric("bytes_total", "counter", "İşlenen bayt sayısı (in: girdi, out: çıktı).", self._bytes,
+               ('operation', 'direction'))
+        metric("stage_seconds_total", "counter", "Aşamalarda geçen toplam süre.", self._stage_seconds,
+               ('operation', 'stage'))
+        metric("stage_bytes_total", "counter", "Aşamalarda işlenen toplam bayt.", self._stage_bytes,
+               ('operation', 'stage'))
+        metric("last_duration_seconds", "gauge", "Son işlemin süresi.",
+               {(kind,): value for kind, value in self._last_duration.items()}, ('operation',))
+        if self._peak_rss is not None:
+            lines.append(f"# HELP {METRIC_PREFIX}_peak_rss_bytes Sürecin en yüksek bellek kullanımı.")
+            lines.append(f"# TYPE {METRIC_PREFIX}_peak_rss_bytes gauge")
+            lines.append(f"{METRIC_PREFIX}_peak_rss_bytes {self._peak_rss}")
+
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp_path, self.path)
+
+_SAMPLE_PATTERN = re.compile(rf'^{METRIC_PREFIX}_(\w+)\{{(.*)\}} (\S+)$')
+_LABEL_PATTERN = re.compile(r'\w+="((?:[^"\\]|\\.)*)"')
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _unescape_label(value: str) -> str:
+    return re.sub(r'\\(.)', lambda match: "\n" if match.group(1) == "n" else match.group(1), value)
+
+class CallbackSink:
+    """Her olayı süreç içindeki bir fonksiyona iletir (ör. uygulamanın kendi metrik kütüphanesi)."""
+    def __init__(self, callback: Callable[[Dict[str, Any]], None]):
+        self.callback = callback
+
+    def emit(self, event: Dict[str, Any]):
+        self.callback(event)
+
+def format_profile(event: Dict[str, Any]) -> str:
+    """Bir olayın aşama dökümünü (süre, pay, CPU, bayt, MB/s) tablo olarak biçimlendirir."""
+    duration = event['duration_seconds']
+    peak = event['peak_rss_bytes']
+    lines = [f"  --- Profil: {event['event']} '{os.path.basename(event['file'])}' "
+             f"({duration * 1000:.1f} ms, CPU {event['cpu_seconds'] * 1000:.1f} ms"
+             f"{f', tepe bellek {peak / (1024 * 1024):.1f} MB' if peak is not None else ''}) ---",
+             f"  {'Aşama':<12} {'Süre (ms)':>10} {'Pay':>7} {'CPU (ms)':>10} {'Bayt':>12} {'MB/s':>9}"]
+    overlapped = False
+    for name in STAGES:
+        stage = event['stages'].get(name)
+        if stage is None:
+            continue
+        marker = "*" if stage['overlapped'] else ""
+        overlapped = overlapped or stage['overlapped']
+        share = stage['seconds'] / duration * 100 if duration > 0 else 0.0
+        speed = f"{stage['mb_s']:.1f}" if stage['mb_s'] is not None and stage['bytes'] else "-"
+        lines.append(f"  {_STAGE_LABELS.get(name, name) + marker:<12} {stage['seconds'] * 1000:>10.1f} {share:>6.1f}% "
+                     f"{stage['cpu_seconds'] * 1000:>10.1f} {stage['bytes']:>12} {speed:>9}")
+    if overlapped:
+        lines.append("  * Ayrı iş parçacığında, diğer aşamalarla örtüşerek çalıştı.")
+    if event['throughput_mb_s'] is not None:
+        lines.append(f"  Uçtan uca hız: {event['throughput_mb_s']:.1f} MB/s")
+    reason = event['attributes'].get('decision_reason')
+    if reason:
+        lines.append(f"  Seçim gerekçesi: {reason}")
+    return "\n".join(lines)
+
+def print_profile(event: Dict[str, Any]):
+    print(format_profile(event))
+
+if __name__ == "__main__":
+    import io
+    import tempfile
+
+    print("--- instrumentation.py Modül Testleri ---")
+
+    events = []
+    work_dir = tempfile.mkdtemp()
+    jsonl_path = os.path.join(work_dir, "olaylar.jsonl")
+    prom_path = os.path.join(work_dir, "metrikler.prom")
+    instrumentation = Instrumentation([JsonLinesSink(jsonl_path), PrometheusSink(prom_path), CallbackSink(events.append)])
+
+    operation = instrumentation.operation('compress', 'ornek.log')
+    with operation.span('analysis', nbytes=1024):
+        time.sleep(0.01)
+    operation.set(codec='zstandard', decision_reason="Genel metin/kod dosyası (.log).")
+    reader = operation.timed(io.BytesIO(b"x" * 100000))
+    writer = operation.timed(io.BytesIO())
+    with operation.stream('compress', reader, writer):
+        while True:
+            data = reader.read(8192)
+            if not data:
+                break
+            writer.write(data[:100])
+    operation.bytes_in, operation.bytes_out = reader.bytes, writer.bytes
+    operation.finish()
+
+    print(f"  Geri çağırma olayı: {'BAŞARILI' if len(events) == 1 and events[0]['stages']['read']['bytes'] == 100000 else 'HATA'}")
+    with open(jsonl_path, encoding='utf-8') as f:
+        print(f"  JSON satırı: {'BAŞARILI' if json.loads(f.readline())['attributes']['codec'] == 'zstandard' else 'HATA'}")
+    with open(prom_path, encoding='utf-8') as f:
+        prom_text = f.read()
+    expected_line = 'akilli_sikistirma_stage_seconds_total{operation="compress",stage="analysis"}'
+    print(f"  Prometheus dosyası: {'BAŞARILI' if expected_line in prom_text else 'HATA'}")
+    print(format_profile(events[0]))
+    for path in (jsonl_path, prom_path):
+        os.remove(path)
+    os.rmdir(work_dir)
@@ -0,0 +1,275 @@
+# akilli_sikistirma/io_pipeline.py
+
+import os
+import queue
+import threading
+from typing import BinaryIO, Callable, Iterable, Tuple
+
+from .compressors import Compressor
+from .utils import write_vectored
+
+# Okuma tamponlarının boyutu ve sayısı. Aynı anda en fazla PIPELINE_DEPTH tampon
+# okuma, sıkıştırma veya yazma aşamasında bulunur; bellek kullanımı
+# PIPELINE_DEPTH * PIPELINE_BUFFER_SIZE ile (artı yazılmayı bekleyen en fazla PIPELINE_DEPTH
+# çıktı parçası) sınırlıdır.
+PIPELINE_BUFFER_SIZE = 1024 * 1024
+PIPELINE_DEPTH = 4
+
+# Yazıcı, kuyrukta bekleyen en fazla bu kadar parçayı tek bir vektörel yazmada birleştirir.
+_MAX_WRITE_BATCH = 64
+
+_DONE = None
+
+# G/Ç motorları: 'simple' okuma, sıkıştırma ve yazmayı sırayla yapar (Compressor.compress_stream);
+# 'pipeline' üçünü ayrı iş parçacıklarında üst üste bindirir. Disk gecikmesi olan sistemlerde
+# (ağ diskleri, soğuk önbellek) boru hattı tek çekirdekte bile daha hızlıdır; veri tamamen sayfa
+# önbelleğindeyken iş parçacığı geçişlerinin maliyeti nedeniyle 'simple' biraz daha hızlı olabilir.
+# 'auto' motoru algoritmaya ve boyuta göre seçer (bkz. choose_io_engine).
+IO_ENGINES = ('auto', 'pipeline', 'simple')
+DEFAULT_IO_ENGINE = 'auto'
+
+# 'auto' bu boyuttan küçük girdilerde 'simple' kullanır: birkaç tamponluk girdide aşamalar
+# üst üste binecek kadar çalışmaz, iş parçacıklarını başlatmak ise sabit bir maliyettir.
+PIPELINE_MIN_SIZE = 4 * PIPELINE_DEPTH * PIPELINE_BUFFER_SIZE
+
+def choose_io_engine(io_engine: str, compressor: Compressor, size: int) -> str:
+    """
+    'auto' motorunu çözer; diğer motorlar olduğu gibi döner. Modülün ölçümüne göre (bkz.
+    benchmark_engines) boru hattı 'stored'da sayfa önbelleğindeki veride belirgin şekilde yavaştır
+    (sıkıştırma yoktur; üst üste bindirilecek iş yalnızca kopyalamadır), sıkıştıran algoritmalarda
+    önbellekteki veride sıralı döngüyle aynı hızda, yavaş diskte ise çok daha hızlıdır. Bu yüzden
+    'stored' ve PIPELINE_MIN_SIZE'dan küçük girdiler 'simple', diğerleri 'pipeline' ile işlenir.
+    """
+    if io_engine != 'auto':
+        return io_engine
+    if compressor.get_name() == "stored" or size < PIPELINE_MIN_SIZE:
+        return 'simple'
+    return 'pipeline'
+
+def _run_pipeline(src: BinaryIO, dst: BinaryIO, transform: Callable[[memoryview], Iterable[bytes]],
+                  finish: Callable, buffer_size: int, depth: int) -> Tuple[int, int]:
+    """
+    Okuma, dönüştürme ve yazmayı üst üste bindirir:
+      okuyucu iş parçacığı: boş tampona readinto -> dolu kuyruğu
+      çağıran iş parçacığı: transform(memoryview) çıktı parçaları -> yazma kuyruğu (en fazla 'depth' parça)
+      yazıcı iş parçacığı:  çıktıları toplu (vektörel) yazar ve tamponu boş kuyruğa geri verir
+    Tampon, çıktısı yazılana kadar geri verilmez; böylece girdiye işaret eden çıktılar
+    (ör. 'stored' algoritmasında memoryview) kopyalanmadan güvenle yazılır. Sıkıştırma
+    kütüphaneleri GIL'i bıraktığından disk ve CPU aynı anda çalışır.
+
+    Returns:
+        Tuple[int, int]: (okunan bayt sayısı, yazılan bayt sayısı)
+    """
+    free_buffers = queue.Queue()
+    for _ in range(depth):
+        free_buffers.put(bytearray(buffer_size))
+    filled = queue.Queue()
+    outgoing = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    errors = []
+    counts = {'in': 0, 'out': 0}
+    writev = getattr(dst, 'writev', None) or (lambda pieces: write_vectored(dst, pieces))
+
+    def reader():
+        try:
+            while not stop.is_set():
+                buffer = free_buffers.get()
+                if buffer is _DONE:
+                    break
+                count = src.readinto(buffer)
+                if not count:
+                    break
+                counts['in'] += count
+                filled.put((buffer, count))
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            filled.put(_DONE)
+
+    def writer():
+        try:
+            finished = False
+            while not finished:
+                batch = [outgoing.get()]
+                while len(batch) < _MAX_WRITE_BATCH:
+                    try:
+                        batch.append(outgoing.get_nowait())
+                    except queue.Empty:
+                        break
+                if batch[-1] is _DONE:
+                    batch.pop()
+                    finished = True
+                pieces = [data for data, _ in batch if data]
+                if pieces:
+                    counts['out'] += writev(pieces)
+                for _, buffer in batch:
+                    if buffer is not None:
+                        free_buffers.put(buffer)
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+            free_buffers.put(_DONE)
+            # Çağıran iş parçacığı dolu kuyrukta beklemesin diye kuyruk sonuna kadar boşaltılır.
+            while outgoing.get() is not _DONE:
+                pass
+
+    threads = [threading.Thread(target=reader, daemon=True), threading.Thread(target=writer, daemon=True)]
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            item = filled.get()
+            if item is _DONE or errors:
+                break
+            buffer, count = item
+            # Tampon, ondan üretilen son parçayla birlikte geri verilir.
+            previous = None
+            for out in transform(memoryview(buffer)[:count]):
+                if previous is not None:
+                    outgoing.put((previous, None))
+                previous = out
+            outgoing.put((previous, buffer))
+        if not errors:
+            outgoing.put((finish(), None))
+    except BaseException:
+        stop.set()
+        free_buffers.put(_DONE)
+        raise
+    finally:
+        outgoing.put(_DONE)
+        for thread in threads:
+            thread.join()
+    if errors:
+        raise errors[0]
+    return counts['in'], counts['out']
+
+def pipelined_compress(src: BinaryIO, dst: BinaryIO, compressor: Compressor,
+                       buffer_size: int = PIPELINE_BUFFER_SIZE, depth: int = PIPELINE_DEPTH) -> Tuple[int, int]:
+    """
+    Kaynağı, okuma ve yazma sıkıştırmayla üst üste binecek şekilde akış halinde sıkıştırır.
+    Kaynak readinto desteklemelidir (dosyalar, ChecksumReader, PrefixedReader).
+    Çıktı Compressor.compress_stream ile aynıdır.
+
+    Returns:
+        Tuple[int, int]: (okunan bayt sayısı, yazılan bayt sayısı)
+    """
+    stream = compressor._new_stream_compressor()
+    return _run_pipeline(src, dst, lambda chunk: (stream.compress(chunk),), stream.flush, buffer_size, depth)
+
+def pipelined_decompress(src: BinaryIO, dst: BinaryIO, compressor: Compressor,
+                         buffer_size: int = PIPELINE_BUFFER_SIZE, depth: int = PIPELINE_DEPTH) -> Tuple[int, int]:
+    """
+    Sıkıştırılmış kaynağı, okuma ve yazma açmayla üst üste binecek şekilde açar.
+    Hedef writev destekliyorsa (ör. ChecksumWriter) parçalar onunla yazılır. Açılan çıktı
+    buffer_size'lık parçalar halinde yazılır; bellek sıkıştırma oranından bağımsızdır.
+
+    Returns:
+        Tuple[int, int]: (okunan bayt sayısı, yazılan bayt sayısı)
+    """
+    stream = compressor._new_bounded_decompressor(buffer_size)
+    bytes_in, bytes_out = _run_pipeline(src, dst, stream.decompress, lambda: b"", buffer_size, depth)
+    if not stream.eof:
+        raise ValueError(f"{compressor.get_name()}: sıkıştırılmış veri beklenmedik şekilde sona erdi.")
+    return bytes_in, bytes_out
+
+def benchmark_engines(filepath: str, compressor: Compressor, work_dir: str, repeat: int = 3) -> dict:
+    """
+    Aynı dosyayı mevcut sıralı akış döngüsüyle (compress_stream/decompress_stream) ve
+    üst üste binen boru hattıyla sıkıştırıp açar; uçtan uca MB/s değerlerini döndürür
+    (her biri en iyi 'repeat' ölçüm). Çıktılar fsync ile diske yazdırılır.
+    """
+    import time
+
+    size = os.path.getsize(filepath)
+    compressed_path = os.path.join(work_dir, "olcum.comp")
+    restored_path = os.path.join(work_dir, "olcum.out")
+
+    def timed(func, src_path, dst_path) -> float:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+                func(src, dst)
+                dst.flush()
+                os.fsync(dst.fileno())
+            best = min(best, time.perf_counter() - start)
+        return size / best / 1e6
+
+    results = {}
+    for engine, compress, decompress in (
+            ('simple', compressor.compress_stream, compressor.decompress_stream),
+            ('pipeline', lambda s, d: pipelined_compress(s, d, compressor),
+             lambda s, d: pipelined_decompress(s, d, compressor))):
+        results[engine] = {'compress_mb_s': timed(compress, filepath, compressed_path),
+                           'decompress_mb_s': timed(decompress, compressed_path, restored_path)}
+    with open(filepath, 'rb') as original, open(restored_path, 'rb') as restored:
+        results['roundtrip_ok'] = original.read() == restored.read()
+    for path in (compressed_path, restored_path):
+        os.remove(path)
+    return results
+
+if __name__ == "__main__":
+    import io
+    import random
+    import time
+    import tempfile
+    from .compressors import BrotliCompressor, StoredCompressor, ZlibCompressor, ZstandardCompressor
+
+    print("--- io_pipeline.py Modül Testleri ---")
+
+    data = b"".join(f"{i} INFO istek tamamlandi sure={random.random():.5f}\n".encode() for i in range(200000))
+    for compressor in (ZstandardCompressor(), ZlibCompressor(), BrotliCompressor(level=5), StoredCompressor()):
+        expected = io.BytesIO()
+        compressor.compress_stream(io.BytesIO(data), expected, chunk_size=64 * 1024)
+        compressed = io.BytesIO()
+        pipelined_compress(io.BytesIO(data), compressed, compressor, buffer_size=64 * 1024)
+        restored = io.BytesIO()
+        pipelined_decompress(io.BytesIO(compressed.getvalue()), restored, compressor, buffer_size=64 * 1024)
+        same = compressed.getvalue() == expected.getvalue() and restored.getvalue() == data
+        print(f"  {compressor.get_name():<10} akış çıktısıyla aynı ve geri açma: {'BAŞARILI' if same else 'HATA'}")
+
+    work_dir = tempfile.mkdtemp()
+    large_path = os.path.join(work_dir, "buyuk.log")
+    with open(large_path, 'wb') as f:
+        for _ in range(10):
+            f.write(data)
+    print(f"\n  Uçtan uca ölçüm ({os.path.getsize(large_path) / 1e6:.0f} MB, MB/s):")
+    for compressor in (ZstandardCompressor(), ZlibCompressor(level=1), StoredCompressor()):
+        results = benchmark_engines(large_path, compressor, work_dir)
+        print(f"  {compressor.get_name():<10} sıkıştırma: sıralı {results['simple']['compress_mb_s']:7.1f}, "
+              f"boru hattı {results['pipeline']['compress_mb_s']:7.1f} | açma: sıralı "
+              f"{results['simple']['decompress_mb_s']:7.1f}, boru hattı {results['pipeline']['decompress_mb_s']:7.1f}"
+              f"{'' if results['roundtrip_ok'] else '  HATA'}")
+    os.remove(large_path)
+    os.rmdir(work_dir)
+
+    # Bu makinenin diski sayfa önbelleğinden çalıştığında G/Ç süresi ihmal edilebilir; gecikmesi olan
+    # bir disk (ör. ağ diski) 'time.sleep' ile taklit edilerek üst üste bindirmenin etkisi gösterilir.
+    class _SlowDisk:
+        def __init__(self, f, mb_per_s: float):
+            self._f = f
+            self._seconds_per_byte = 1 / (mb_per_s * 1e6)
+
+        def read(self, size=-1):
+            data = self._f.read(size)
+            time.sleep(len(data) * self._seconds_per_byte)
+            return data
+
+        def readinto(self, buffer):
+            count = self._f.readinto(buffer)
+            time.sleep(count * self._seconds_per_byte)
+            return count
+
+        def write(self, data):
+            time.sleep(len(data) * self._seconds_per_byte)
+            return self._f.write(data)
+
+    print(f"\n  200 MB/s diski taklit eden ölçüm ({len(data) * 2 / 1e6:.0f} MB, MB/s, işlemci sayısı: {os.cpu_count()}):")
+    for compressor in (ZstandardCompressor(), ZlibCompressor(level=1)):
+        speeds = {}
+        for engine, func in (('sıralı', compressor.compress_stream),
+                             ('boru hattı', lambda s, d: pipelined_compress(s, d, compressor))):
+            start = time.perf_counter()
+            func(_SlowDisk(io.BytesIO(data * 2), 200), _SlowDisk(io.BytesIO(), 200))
+            speeds[engine] = len(data) * 2 / (time.perf_counter() - start) / 1e6
+        print(f"  {compressor.get_name():<10} " + ", ".join(f"{engine} {speed:7.1f}" for engine, speed in speeds.items()))
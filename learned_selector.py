@@ -0,0 +1,220 @@
+# akilli_sikistirma/learned_selector.py
+
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .compressor_selector import (CompressorSelector, DICTIONARY_FILE_SIZE_LIMIT, INCOMPRESSIBLE_CHECK_SIZE,
+                                  TRIAL_OBJECTIVES)
+from .compressors import Compressor
+from .profiles import DEFAULT_PROFILE
+
+# Sıkıştırma sonuçlarının saklandığı varsayılan SQLite veritabanı.
+DEFAULT_OUTCOME_DB = os.path.join(os.path.expanduser("~"), ".cache", "akilli_sikistirma", "outcomes.sqlite3")
+
+# Bir kovada bir algoritmanın tahmine katılması için gereken en az sonuç sayısı.
+MIN_BUCKET_SAMPLES = 3
+
+# Model yeterli veri olsa da bu olasılıkla deneme sıkıştırması yapılır; böylece
+# iş yükü değiştiğinde model eski kararlarına takılı kalmaz.
+EXPLORATION_RATE = 0.05
+
+# Keşifte deneme sıkıştırmasının yapıldığı örnek boyutu.
+LEARNING_TRIAL_SIZE = 256 * 1024
+
+# Bu kadar yeni sonuç kaydedildikten sonra model bir sonraki sorguda yeniden yüklenir.
+MODEL_REFRESH_INTERVAL = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outcomes (
+    id INTEGER PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    extension TEXT NOT NULL,
+    size_bucket INTEGER NOT NULL,
+    entropy_bucket REAL NOT NULL,
+    profile TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    source TEXT NOT NULL,
+    original_size INTEGER NOT NULL,
+    compressed_size INTEGER NOT NULL,
+    cpu_seconds REAL NOT NULL
+)
+"""
+
+def feature_buckets(analysis_results: Dict[str, Any]) -> Tuple[str, int, float]:
+    """
+    Analiz sonuçlarını kova anahtarına dönüştürür: (uzantı, log2 boyut, 0.5 bit genişliğinde entropi).
+    """
+    size_bucket = int(math.log2(analysis_results.get('file_size', 0) + 1))
+    entropy_bucket = math.floor(analysis_results.get('entropy', 0.0) * 2) / 2
+    return analysis_results.get('file_extension', ''), size_bucket, entropy_bucket
+
+class OutcomeStore:
+    """
+    Sıkıştırma sonuçlarını yerel bir SQLite veritabanında saklar.
+    Toplu sıkıştırmada birden çok süreç aynı veritabanına yazabilir (WAL kipi).
+    """
+    def __init__(self, path: str = DEFAULT_OUTCOME_DB):
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(_SCHEMA)
+        return self._connection
+
+    def record(self, analysis_results: Dict[str, Any], profile: str, outcomes: List[Tuple[str, int, int, float]],
+               source: str):
+        """
+        Aynı dosyaya ait sonuçları tek işlemde kaydeder.
+        outcomes: (algoritma, orijinal boyut, sıkıştırılmış boyut, CPU saniyesi) dörtlüleri.
+        source: 'file' (tüm dosyanın gerçek sıkıştırması) veya 'trial' (örnek üzerinde deneme).
+        """
+        extension, size_bucket, entropy_bucket = feature_buckets(analysis_results)
+        now = time.time()
+        rows = [(now, extension, size_bucket, entropy_bucket, profile, codec, source,
+                 original_size, compressed_size, cpu_seconds)
+                for codec, original_size, compressed_size, cpu_seconds in outcomes]
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT INTO outcomes (recorded_at, extension, size_bucket, entropy_bucket, profile, codec, source, "
+                    "original_size, compressed_size, cpu_seconds) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def bucket_statistics(self, profile: str) -> List[Tuple]:
+        """
+        Kova ve algoritma başına toplanmış istatistikleri döndürür:
+        (uzantı, boyut kovası, entropi kovası, algoritma, oran toplamı, MB/s toplamı, sonuç sayısı).
+        """
+        with self._lock:
+            return self._connect().execute(
+                "SELECT extension, size_bucket, entropy_bucket, codec, "
+                "SUM(CAST(original_size AS REAL) / MAX(compressed_size, 1)), "
+                "SUM(original_size / MAX(cpu_seconds, 1e-9) / 1e6), COUNT(*) "
+                "FROM outcomes WHERE profile = ? AND original_size > 0 "
+                "GROUP BY extension, size_bucket, entropy_bucket, codec", (profile,)).fetchall()
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+class BucketModel:
+    """
+    Kova başına istatistiklerden oluşan hafif maliyet modeli.
+    Her algoritma için kovadaki ortalama oran ve hız tutulur. Tam kovada yeterli veri
+    yoksa giderek kabalaşan kovalara geri çekilinir:
+    (uzantı, boyut, entropi) -> (uzantı, entropi) -> (boyut, entropi) -> (entropi).
+    Sorgu yalnızca birkaç sözlük aramasıdır.
+    """
+    _LEVELS = (
+        lambda extension, size, entropy: (extension, size, entropy),
+        lambda extension, size, entropy: (extension, entropy),
+        lambda extension, size, entropy: (size, entropy),
+        lambda extension, size, entropy: (entropy,)
+    )
+
+    def __init__(self, rows: List[Tuple]):
+        # stats[seviye][anahtar][algoritma] = [oran toplamı, MB/s toplamı, sayı]
+        self.stats: List[Dict[tuple, Dict[str, List[float]]]] = [{} for _ in self._LEVELS]
+        for extension, size, entropy, codec, ratio_sum, speed_sum, count in rows:
+            for level, key_of in enumerate(self._LEVELS):
+                entry = self.stats[level].setdefault(key_of(extension, size, entropy), {}).setdefault(codec, [0.0, 0.0, 0])
+                entry[0] += ratio_sum
+                entry[1] += speed_sum
+                entry[2] += count
+
+    def predict(self, features: Tuple[str, int, float], objective: str) -> Optional[Tuple[str, float, int]]:
+        """
+        Hedefe göre en iyi algoritmayı tahmin eder.
+
+        Returns:
+            (algoritma, skor, kova seviyesi) veya en az iki algoritmayı karşılaştıracak veri yoksa None.
+            'ratio_per_cpu' skoru oran ile hızın çarpımıdır (MB başına CPU süresine bölünmüş oran ile orantılı).
+        """
+        for level, key_of in enumerate(self._LEVELS):
+            codecs = self.stats[level].get(key_of(*features))
+            if not codecs:
+                continue
+            candidates = {codec: entry for codec, entry in codecs.items()
+                          if entry[2] >= MIN_BUCKET_SAMPLES and codec != "stored"}
+            if len(candidates) < 2:
+                continue
+            scores = {}
+            for codec, (ratio_sum, speed_sum, count) in candidates.items():
+                ratio, speed = ratio_sum / count, speed_sum / count
+                scores[codec] = {'ratio': ratio, 'speed': speed, 'ratio_per_cpu': ratio * speed}[objective]
+            best = max(scores, key=scores.get)
+            return best, scores[best], level
+        return None
+
+class LearnedSelector(CompressorSelector):
+    """
+    Kaydedilen sıkıştırma sonuçlarından öğrenen seçici.
+    Her sıkıştırmanın sonucu (analiz özellikleri, algoritma, oran, CPU süresi) OutcomeStore'a
+    yazılır; seçim, bu sonuçlardan kurulan kova modeline (BucketModel) göre yapılır.
+    Kovada karşılaştırma için yeterli veri yoksa (veya keşif sırasında) örnek üzerinde
+    deneme sıkıştırması yapılır ve tüm algoritmaların sonuçları kaydedilir; böylece model
+    zamanla kendi iş yükümüzdeki verilerle dolar. Model ilk seçimde tembel olarak yüklenir.
+    """
+    def __init__(self, objective: str = 'ratio', store: OutcomeStore = None,
+                 exploration_rate: float = EXPLORATION_RATE, dictionary_store=None,
+                 profile: str = DEFAULT_PROFILE, codec_overrides: Dict[str, Dict[str, int]] = None):
+        super().__init__(dictionary_store, profile, codec_overrides)
+        if objective not in TRIAL_OBJECTIVES:
+            raise ValueError(f"Bilinmeyen hedef '{objective}'. Geçerli hedefler: {', '.join(TRIAL_OBJECTIVES)}")
+        self.objective = objective
+        self.store = store or OutcomeStore()
+        self.exploration_rate = exploration_rate
+        self._model: Optional[BucketModel] = None
+        self._records_since_load = 0
+
+    @property
+    def model(self) -> BucketModel:
+        if self._model is None or self._records_since_load >= MODEL_REFRESH_INTERVAL:
+            self._model = BucketModel(self.store.bucket_statistics(self.profile))
+            self._records_since_load = 0
+        return self._model
+
+    def select_compressor(self, analysis_results: Dict[str, Any], sample: Optional[bytes] = None) -> Compressor:
+        file_size = analysis_results.get('file_size', 0)
+        entropy = analysis_results.get('entropy', 0.0)
+
+        # Sözlük ve sıkıştırılamaz veri kararları kurallarla verilir; bunlar öğrenilecek seçimler değildir.
+        if (sample is None or file_size < 1000 or (entropy > 7.5 and self.is_incompressible(sample))
+                or (self.dict_id is not None and file_size <= DICTIONARY_FILE_SIZE_LIMIT and entropy <= 7.5)):
+            return super().select_compressor(analysis_results, sample)
+
+        features = feature_buckets(analysis_results)
+        prediction = self.model.predict(features, self.objective)
+        if prediction is not None and random.random() >= self.exploration_rate:
+            codec, score, level = prediction
+            self._report_decision(f"Öğrenilmiş model ({self.objective}, kova seviyesi {level}) {codec} seçti (skor {score:.2f}).")
+            return self.create_compressor(codec)
+
+        reason = "keşif" if prediction is not None else "bu kova için yeterli veri yok"
+        self._report_decision(f"Öğrenilmiş model: {reason}; örnek üzerinde deneme sıkıştırması yapılıyor.")
+        trial_sample = sample[:min(LEARNING_TRIAL_SIZE, INCOMPRESSIBLE_CHECK_SIZE)]
+        compressor, trial_results = self.select_compressor_by_trial([trial_sample], self.objective)
+        self.store.record(analysis_results, self.profile,
+                          [(result['name'], result['original_size'], result['compressed_size'], result['cpu_time'])
+                           for result in trial_results], source='trial')
+        self.last_decision_reason = f"Öğrenilmiş model: {reason}; {self.last_decision_reason}"
+        self._records_since_load += len(trial_results)
+        return compressor
+
+    def record_outcome(self, analysis_results: Dict[str, Any], codec_name: str, original_size: int,
+                       compressed_size: int, cpu_seconds: float):
+        self.store.record(analysis_results, self.profile,
+                          [(codec_name, original_size, compressed_size, cpu_seconds)], source='file')
+        self._records_since_load += 1
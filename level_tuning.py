@@ -0,0 +1,294 @@
+# akilli_sikistirma/level_tuning.py
+
+import copy
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from .compressors import Compressor
+
+# Hedefli seviye ayarında (bkz. CompressorSelector.select_compressor_for_target) örnek üzerinde
+# denenen algoritma seviyeleri; her algoritma için en hızlıdan en güçlüye. zstd'nin negatif
+# seviyeleri oran karşılığında çok yüksek hız sağlar.
+CALIBRATION_LEVELS: Dict[str, tuple] = {
+    'zstandard': (-5, -1, 1, 3, 6, 9, 12, 15, 19),
+    'zlib': (1, 3, 6, 9),
+    'brotli': (1, 3, 5, 8, 11),
+    'lzma': (0, 3, 6, 9),
+    'bz2': (1, 9),
+}
+
+# Kalibrasyonda kullanılan en fazla örnek boyutu; kalibrasyonun maliyeti dosya boyutundan bağımsızdır.
+CALIBRATION_SAMPLE_SIZE = 512 * 1024
+
+# Bir algoritmanın seviyeleri sırayla denenir; tahmini hız hedefin bu oranının altına düşünce
+# daha yüksek (daha yavaş) seviyeler denenmez.
+CALIBRATION_CUTOFF = 0.25
+
+# Kalibrasyona ayrılan süre: hedef hızda tüm dosyanın sıkıştırılma süresinin bu payı, en az ve en
+# çok CALIBRATION_MIN_SECONDS/CALIBRATION_MAX_SECONDS. Bir seviyenin denemesi bir öncekinin
+# CALIBRATION_GROWTH katı süreceği varsayılır; süreyi aşacak seviyeler denenmez.
+CALIBRATION_SHARE = 0.05
+CALIBRATION_MIN_SECONDS = 0.5
+CALIBRATION_MAX_SECONDS = 5.0
+CALIBRATION_GROWTH = 2.0
+
+# Örnekte ölçülen tek çekirdek hızından dosyanın blok kipindeki hızı tahmin edilirken paralel
+# çalışmanın verimi (okuma, yazma ve iş parçacığı eşgüdümünün payı).
+PARALLEL_EFFICIENCY = 0.8
+
+# Başlangıç seçiminde tahmini hız hedefi en az bu oranda aşmalıdır (kalibrasyon hatasına pay).
+TARGET_HEADROOM = 1.1
+
+# Ölçülen hız gereken hızdan bu göreli oranda saparsa seviye değiştirilir (salınımı önler).
+DRIFT_TOLERANCE = 0.1
+
+# Ölçülen hızın değerlendirildiği en kısa süre (saniye).
+CONTROL_INTERVAL = 0.5
+
+# Son tarih hedefinde sürenin bu payı, ölçümün gecikmesine ve son blokların bitişine pay olarak ayrılır.
+DEADLINE_RESERVE = 0.05
+
+class ThroughputTarget:
+    """
+    Sıkıştırma hedefi: sabit bir hız (target_mb_s, MB/s) veya oluşturulduğu andan itibaren
+    verilen süre (deadline, saniye) içinde total_bytes baytın sıkıştırılması.
+    Son tarih hedefinde gereken hız, kalan bayt ve kalan süreden (DEADLINE_RESERVE payı düşülerek)
+    her seferinde yeniden hesaplanır; geride kalınırsa gereken hız artar.
+    """
+    def __init__(self, total_bytes: int, target_mb_s: float = None, deadline: float = None):
+        if (target_mb_s is None) == (deadline is None):
+            raise ValueError("Hedef olarak hız (MB/s) veya son tarih (saniye) verilmelidir; ikisi birden değil.")
+        if (target_mb_s is not None and target_mb_s <= 0) or (deadline is not None and deadline <= 0):
+            raise ValueError("Hedef hız ve son tarih pozitif olmalıdır.")
+        self.total_bytes = total_bytes
+        self.target_mb_s = target_mb_s
+        self.deadline = deadline
+        self.start = time.perf_counter()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def required_mb_s(self, done_bytes: int = 0) -> float:
+        """Hedefi tutturmak için bundan sonra gereken hız (MB/s); son tarih geçtiyse sonsuz."""
+        if self.target_mb_s is not None:
+            return self.target_mb_s
+        remaining_seconds = self.deadline * (1 - DEADLINE_RESERVE) - self.elapsed()
+        if remaining_seconds <= 0:
+            return float("inf")
+        return max(self.total_bytes - done_bytes, 0) / remaining_seconds / 1e6
+
+    def calibration_seconds(self) -> float:
+        """Kalibrasyona ayrılabilecek süre (bkz. CALIBRATION_SHARE)."""
+        required = self.required_mb_s()
+        expected = self.total_bytes / required / 1e6 if required > 0 else 0.0
+        return min(max(expected * CALIBRATION_SHARE, CALIBRATION_MIN_SECONDS), CALIBRATION_MAX_SECONDS)
+
+    def describe(self) -> str:
+        if self.target_mb_s is not None:
+            return f"{self.target_mb_s:.1f} MB/s"
+        return f"{self.total_bytes}B için {self.deadline:.1f} s"
+
+def setting_label(result: Dict[str, Any]) -> str:
+    """Kalibrasyon sonucunun 'algoritma:seviye' biçiminde adı."""
+    return result['name'] if result.get('level') is None else f"{result['name']}:{result['level']}"
+
+def build_ladder(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Kalibrasyon sonuçlarından en hızlıdan en güçlüye sıralı ayar merdivenini çıkarır: bir ayar
+    ancak kendisinden hızlı tüm ayarlardan daha iyi oran veriyorsa merdivene girer (Pareto sınırı).
+    """
+    ladder = []
+    for result in sorted(results, key=lambda result: result['throughput_mb_s'], reverse=True):
+        if not ladder or result['ratio'] > ladder[-1]['ratio']:
+            ladder.append(result)
+    return ladder
+
+class LevelController:
+    """
+    Blok kipinde sıkıştırma sürerken ölçülen hıza göre seviyeyi ayarlar (bkz.
+    block_container.compress_blocks). Ayarlar, kalibrasyonun merdivenidir (build_ladder); her
+    bloğun algoritması çerçevesine yazıldığı ve seviye açmayı etkilemediği için bloklar farklı
+    ayarlarla sıkıştırılabilir.
+
+    Her CONTROL_INTERVAL saniyede bir, tamamlanan blokların duvar saati hızı gereken hızla
+    karşılaştırılır: hız DRIFT_TOLERANCE'tan fazla düşükse gereken hızı karşılayacağı tahmin
+    edilen en güçlü ayara inilir, fazla yüksekse bir üst ayar hızı karşılayacaksa ona çıkılır.
+    Diğer ayarların hızı, ölçülen hız ile geçerli ayarın tahmini arasındaki farktan temkinli
+    tahmin edilir (bkz. expected_mb_s).
+    Değişiklikten önce kuyruğa girmiş bloklar bitene kadar yeni ölçüm yapılmaz.
+
+    next_compressor ve record aynı iş parçacığından çağrılmalıdır.
+    """
+    def __init__(self, selector, ladder: List[Dict[str, Any]], index: int, target: ThroughputTarget,
+                 parallelism: int = 1, calibration: List[Dict[str, Any]] = None):
+        self.selector = selector
+        self.ladder = ladder
+        self.index = index
+        self.target = target
+        self.parallelism = parallelism
+        self.calibration = calibration or ladder
+        self.changes: List[Dict[str, Any]] = []
+        self.block_counts: Counter = Counter()
+        self.measured_mb_s: Optional[float] = None
+        self._compressors: Dict[int, Compressor] = {}
+        self._submitted = 0
+        self._completed = 0
+        self._done_bytes = 0
+        self._settle_block = 0
+        self._window_start: Optional[float] = None
+        self._window_bytes = 0
+
+    def predicted_mb_s(self, index: int) -> float:
+        """Ayarın, örnekteki tek çekirdek hızından tahmin edilen blok kipi hızı."""
+        return self.ladder[index]['throughput_mb_s'] * self.parallelism * PARALLEL_EFFICIENCY
+
+    def expected_mb_s(self, index: int, measured_mb_s: float) -> float:
+        """
+        Geçerli ayarda measured_mb_s ölçüldüğüne göre 'index' ayarının beklenen hızı. Tahminden sapma
+        bayt başına sabit bir ek süreden (okuma, yazma, filtre) veya makinenin diğer yükünün tüm
+        ayarları aynı oranda yavaşlatmasından kaynaklanabilir; iki açıklamanın verdiği hızlardan
+        düşük olanı kullanılır. 'stored' sıkıştırma yapmadığından ölçülen süresi tamamen ek süredir.
+        """
+        current = max(self.predicted_mb_s(self.index), 1e-9)
+        measured_mb_s = max(measured_mb_s, 1e-9)
+        overhead = max(1 / measured_mb_s - 1 / current, 0.0)
+        additive = 1 / (1 / max(self.predicted_mb_s(index), 1e-9) + overhead)
+        if self.ladder[self.index]['name'] == "stored":
+            return additive
+        return min(additive, self.predicted_mb_s(index) * measured_mb_s / current)
+
+    def label(self, index: int = None) -> str:
+        return setting_label(self.ladder[self.index if index is None else index])
+
+    def compressor(self, index: int = None) -> Compressor:
+        """
+        Geçerli (veya 'index') ayarın sıkıştırıcısı. Aynı algoritmanın başka bir ayarı daha önce
+        oluşturulduysa (ör. select_filter'ın eklediği lzma BCJ filtresiyle) onun kopyası yalnızca
+        seviyesi değiştirilerek kullanılır.
+        """
+        index = self.index if index is None else index
+        compressor = self._compressors.get(index)
+        if compressor is None:
+            entry = self.ladder[index]
+            same_codec = [existing for existing in self._compressors.values() if existing.get_name() == entry['name']]
+            compressor = copy.copy(same_codec[0]) if same_codec else self.selector.create_compressor(entry['name'])
+            if entry.get('level') is not None:
+                compressor.level = entry['level']
+                compressor = self.selector.fit_memory(compressor)
+            if getattr(compressor, 'threads', 0):
+                # Blok kipinde bloklar zaten paralel sıkıştırılır.
+                compressor.threads = 0
+            self._compressors[index] = compressor
+        return compressor
+
+    def compressors(self) -> List[Compressor]:
+        """Merdivendeki tüm ayarların sıkıştırıcıları (ör. başlığa yazılan bellek kaydı için)."""
+        return [self.compressor(index) for index in range(len(self.ladder))]
+
+    def next_compressor(self) -> Compressor:
+        """Sıradaki bloğun sıkıştırıcısı."""
+        if self._window_start is None:
+            self._window_start = time.perf_counter()
+        self._submitted += 1
+        self.block_counts[self.label()] += 1
+        return self.compressor()
+
+    def record(self, raw_size: int):
+        """Bir bloğun sıkıştırılıp yazıldığını bildirir; gerekirse seviyeyi değiştirir."""
+        now = time.perf_counter()
+        self._completed += 1
+        self._done_bytes += raw_size
+        if self._completed <= self._settle_block:
+            # Önceki ayarla kuyruğa girmiş bloklar: ölçüm yeni ayarın blokları başlayınca başlar.
+            if self._completed == self._settle_block:
+                self._window_start, self._window_bytes = now, 0
+            return
+        self._window_bytes += raw_size
+        elapsed = now - self._window_start
+        if elapsed < CONTROL_INTERVAL:
+            return
+
+        measured = self._window_bytes / elapsed / 1e6
+        self.measured_mb_s = measured
+        self._window_start, self._window_bytes = now, 0
+        required = self.target.required_mb_s(self._done_bytes)
+
+        new_index = self.index
+        if measured < required * (1 - DRIFT_TOLERANCE) and self.index > 0:
+            new_index = next((index for index in range(self.index - 1, -1, -1)
+                              if self.expected_mb_s(index, measured) >= required), 0)
+        elif (measured > required * (1 + DRIFT_TOLERANCE) and self.index + 1 < len(self.ladder)
+              and self.expected_mb_s(self.index + 1, measured) >= required * (1 + DRIFT_TOLERANCE)):
+            new_index = self.index + 1
+        if new_index == self.index:
+            return
+
+        change = {'block': self._completed, 'from': self.label(), 'to': self.label(new_index),
+                  'measured_mb_s': measured, 'required_mb_s': required}
+        self.changes.append(change)
+        print(f"  [Seviye]: Blok {change['block']}: ölçülen {measured:.1f} MB/s, gereken {required:.1f} MB/s. "
+              f"{change['from']} -> {change['to']}")
+        self.index = new_index
+        self._settle_block = self._submitted
+
+    def summary(self) -> Dict[str, Any]:
+        """Ölçüm olayına (bkz. instrumentation) eklenen ayar özeti."""
+        return {
+            'target': self.target.describe(),
+            'parallelism': self.parallelism,
+            'calibration': [{'setting': setting_label(result), 'ratio': result['ratio'],
+                             'throughput_mb_s': result['throughput_mb_s']} for result in self.calibration],
+            'ladder': [setting_label(result) for result in self.ladder],
+            'final': self.label(),
+            'changes': self.changes,
+            'blocks': dict(self.block_counts),
+        }
+
+if __name__ == "__main__":
+    import io
+    import random
+    import threading
+    from .block_container import compress_blocks, decompress_blocks
+    from .compressor_selector import CompressorSelector
+
+    print("--- level_tuning.py Modül Testleri ---")
+
+    rng = random.Random(5)
+    lines = [f"2024-05-01T12:{i // 60 % 60:02d}:{i % 60:02d} {rng.choice(('INFO', 'WARN', 'ERROR'))} "
+             f"istek={rng.randint(1, 10 ** 6)} sure={rng.random():.4f} yol=/api/v1/{rng.choice(('a', 'b', 'c'))}\n"
+             for i in range(200000)]
+    data = "".join(lines).encode() * 8
+    block_size = 1024 * 1024
+    selector = CompressorSelector()
+
+    for description, options in (("Hız hedefi", {'target_mb_s': 120}), ("Son tarih", {'deadline': 5.0})):
+        target = ThroughputTarget(len(data), **options)
+        print(f"\n  {description}: {target.describe()}")
+        samples = [data[offset:offset + 128 * 1024] for offset in range(0, len(data), len(data) // 8)][:8]
+        compressor, controller = selector.select_compressor_for_target(samples, target)
+        print(f"  Merdiven: {' < '.join(setting_label(result) for result in controller.ladder)}")
+
+        # Sıkıştırmanın ortasında GIL'i tutan bir iş parçacığı hızı düşürür; denetleyici seviyeyi indirmelidir.
+        stop = threading.Event()
+        def busy():
+            stop.wait(0.2)
+            while not stop.is_set():
+                sum(range(1000))
+        loads = [threading.Thread(target=busy) for _ in range(2)]
+        for load in loads:
+            load.start()
+        compressed = io.BytesIO()
+        try:
+            compress_blocks(io.BytesIO(data), compressed, compressor, block_size, workers=1, level_controller=controller)
+        finally:
+            stop.set()
+            for load in loads:
+                load.join()
+        compressed.seek(0)
+        restored = io.BytesIO()
+        decompress_blocks(compressed, restored)
+        elapsed = target.elapsed()
+        print(f"  {len(data)}B -> {len(compressed.getvalue())}B, {elapsed:.2f} s ({len(data) / elapsed / 1e6:.1f} MB/s), "
+              f"{len(controller.changes)} değişiklik, bloklar: {dict(controller.block_counts)}")
+        print(f"  Açma: {'BAŞARILI' if restored.getvalue() == data else 'HATA'}")
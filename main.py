@@ -3,13 +3,39 @@
 import os
 import sys
 import argparse
+import contextlib
+import json
+import time
+import zlib
+from collections import Counter
 from datetime import datetime
+from typing import Any, Generator, Optional
 
 # Projenin diğer modüllerini içe aktarıyoruz
 # Not: main.py bir paket içinde çalıştığı için bu göreceli içe aktarmalar doğru çalışır.
-from .data_analyzer import analyze_file_properties
-from .compressor_selector import CompressorSelector
-from .compressors import Compressor # Tip ipucu için (bir sınıf türü, örnek değil)
+from .data_analyzer import analyze_file_properties, analyze_prefix, analyze_sample, read_sample_blocks
+from .compressor_selector import CompressorSelector, INCOMPRESSIBLE_CHECK_SIZE, TRIAL_OBJECTIVES, TRIAL_SAMPLE_BLOCKS
+from .compressors import Compressor, DEFAULT_CHUNK_SIZE # Tip ipucu için (bir sınıf türü, örnek değil)
+from .codec_registry import print_availability_report
+from .block_container import DEFAULT_BLOCK_SIZE, compress_blocks, decompress_blocks
+from .analysis_cache import DEFAULT_ANALYSIS_CACHE, DEFAULT_MAX_ENTRIES, AnalysisCache
+from .dedup_store import DEFAULT_CHUNK_STORE, ChunkStore, compress_chunks, decompress_chunks
+from .instrumentation import CallbackSink, Instrumentation, JsonLinesSink, PrometheusSink, print_profile
+from .level_tuning import PARALLEL_EFFICIENCY, ThroughputTarget, setting_label
+from .memory_budget import format_memory, memory_record, plan_blocks, plan_decompression, stream_budget
+from .io_pipeline import DEFAULT_IO_ENGINE, IO_ENGINES, choose_io_engine, pipelined_compress, pipelined_decompress
+from .filters import FILTER_MODES, DefilteringWriter, FilteringReader, filter_from_params
+from .dictionary_store import DEFAULT_DICTIONARY_DIR, DEFAULT_DICTIONARY_SIZE, DictionaryStore
+from .learned_selector import DEFAULT_OUTCOME_DB, LearnedSelector, OutcomeStore
+from .profiles import DEFAULT_PROFILE, PROFILE_NAMES, parse_codec_overrides
+from .file_format import (CONTAINER_BLOCKS, CONTAINER_DEDUP, CONTAINER_STREAM, MIN_HEADER_SIZE, original_filename,
+                          patch_header, read_header, sniff, write_header)
+from .seekable_reader import SeekableReader
+from .utils import ChecksumReader, ChecksumWriter, PrefixedReader, parse_size, preallocate
+
+# Bu boyuta kadar olan dosyalarda sıkıştırılmış çıktı (başlık dahil) sıkıştırılmadan saklamaktan
+# büyük çıkarsa dosya 'stored' olarak yeniden yazılır (ör. sözlükle sıkıştırılan çok küçük kayıtlar).
+STORED_FALLBACK_SIZE = 64 * 1024
 
 def get_timestamp_filename(original_filepath: str, suffix: str = "") -> str:
     """
@@ -20,109 +46,641 @@ def get_timestamp_filename(original_filepath: str, suffix: str = "") -> str:
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     return f"{base_name}_{timestamp}{suffix}{ext}"
 
-def compress_file(filepath: str, output_dir: str = '.') -> str or None:
+def create_selector(strategy: str = 'rules', objective: str = 'ratio', dictionary_store: DictionaryStore = None,
+                    profile: str = DEFAULT_PROFILE, codec_overrides: dict = None,
+                    learning_db: str = None) -> CompressorSelector:
+    """Strateji için uygun seçiciyi oluşturur; 'learned' stratejisi sonuçları learning_db'ye kaydeder."""
+    if strategy == 'learned':
+        return LearnedSelector(objective, OutcomeStore(learning_db or DEFAULT_OUTCOME_DB),
+                               dictionary_store=dictionary_store, profile=profile, codec_overrides=codec_overrides)
+    return CompressorSelector(dictionary_store, profile, codec_overrides)
+
+def _decision_context(selector: CompressorSelector, strategy: str, objective: str, filter_mode: str) -> str:
+    """Önbellekteki seçici kararının geçerli olduğu bağlam: aynı dosya farklı ayarlarda farklı karar alabilir."""
+    overrides = json.dumps(selector.codec_overrides, sort_keys=True)
+    context = f"{strategy}|{objective}|{selector.profile}|{overrides}|{selector.dict_id}|{filter_mode}"
+    if selector.memory_limit is not None:
+        context += f"|bellek={selector.memory_limit}/{selector.memory_data_size}"
+    return context
+
+def compress_file(filepath: str, output_dir: str = '.', analysis_mode: str = 'prefix',
+                  strategy: str = 'rules', objective: str = 'ratio', block_mode: bool = False,
+                  block_size: int = DEFAULT_BLOCK_SIZE, workers: int = None,
+                  selector: CompressorSelector = None, adaptive: bool = False,
+                  dictionary_store: DictionaryStore = None, profile: str = DEFAULT_PROFILE,
+                  codec_overrides: dict = None, learning_db: str = None,
+                  analysis_cache: AnalysisCache = None, chunk_store: ChunkStore = None,
+                  io_engine: str = DEFAULT_IO_ENGINE, instrumentation: Instrumentation = None,
+                  filter_mode: str = 'auto', deadline: float = None,
+                  target_throughput: float = None, memory_limit: int = None) -> str or None:
     """
     Bir dosyayı analiz eder, en uygun algoritmayı seçer ve sıkıştırır.
     Sıkıştırılmış dosyanın yolunu döndürür.
+
+    analysis_mode:
+        'prefix': Tek geçiş. Dosyanın başı analiz edilir ve aynı baytlar
+                  sıkıştırıcıya yeniden verilir; dosya diskten bir kez okunur.
+        'sample': Dosyanın başından, sonundan ve ortasından birkaç blok okunur;
+                  analiz süresi dosya boyutundan bağımsızdır.
+        'full':   Tüm dosya önce analiz edilir, ardından yeniden okunup sıkıştırılır.
+
+    strategy:
+        'rules': Analiz sonuçlarına göre kural tabanlı seçim.
+        'trial': Örnek bloklar tüm algoritmalarla denenir; 'objective' hedefine
+                 ('ratio', 'speed', 'ratio_per_cpu') göre en iyisi seçilir.
+        'learned': Önceki sıkıştırmaların sonuçlarından öğrenilen modele göre 'objective'
+                   hedefinde en iyi algoritma seçilir; sonuç learning_db'ye kaydedilir
+                   (bkz. learned_selector).
+
+    block_mode: True ise girdi 'block_size' boyutlu bloklara bölünür ve bloklar
+                'workers' iş parçacığıyla paralel sıkıştırılır (bkz. block_container).
+
+    adaptive:   True ise blok kipinde algoritma her blok için ayrıca seçilir; sıkıştırılamaz
+                bloklar 'stored' olarak saklanır. block_mode'u da etkinleştirir.
+
+    selector: Verilirse bu seçici kullanılır; toplu işlemde her işçi tek bir seçiciyi yeniden kullanır.
+
+    dictionary_store: Verilirse ve etkin bir sözlük varsa küçük dosyalar bu sözlükle sıkıştırılır
+                      (selector verilmediğinde kullanılır).
+
+    profile:    'fast', 'balanced' veya 'max'; seçilen algoritmanın seviye, pencere ve iş parçacığı
+                ayarları. codec_overrides algoritma başına bu ayarları geçersiz kılar (bkz. profiles).
+                selector verilmediğinde kullanılır. Seçilen parametreler başlığa yazılır.
+
+    analysis_cache: Verilirse değişmemiş dosyaların analiz sonuçları ve seçici kararı önbellekten
+                    alınır; dosya analiz için okunmaz (bkz. analysis_cache).
+
+    chunk_store: Verilirse tekilleştirme kipi: girdi içerik tanımlı parçalara bölünür, yalnızca
+                 depoda olmayan parçalar sıkıştırılıp depoya eklenir ve .comp dosyasına parça
+                 bildirimi yazılır (bkz. dedup_store). block_mode ile birlikte kullanılamaz.
+
+    io_engine:  Akış kapsayıcısında 'pipeline' okuma, sıkıştırma ve yazmayı ayrı iş parçacıklarında
+                üst üste bindirir; 'simple' sırayla yapar (bkz. io_pipeline). 'auto' (varsayılan)
+                'stored' ve küçük dosyalarda 'simple', diğerlerinde 'pipeline' kullanır. Çıktı aynıdır.
+
+    instrumentation: Verilirse analiz, seçim, okuma, sıkıştırma ve yazma aşamalarının süreleri,
+                     bayt sayıları, tepe bellek ve seçim gerekçesi işlem sonunda hedeflerine
+                     (JSON satırları, Prometheus, geri çağırma) iletilir (bkz. instrumentation).
+
+    filter_mode: 'auto' ise analizin bulduğu yapıya göre sıkıştırmadan önce bir filtre uygulanır
+                 (sayısal dizilere delta, CSV/TSV'ye sütun dönüşümü, çalıştırılabilir dosyalara BCJ;
+                 bkz. filters ve CompressorSelector.select_filter). Filtre başlığa yazılır ve açarken
+                 ters yönde uygulanır. 'none' filtre uygulamaz. Tekilleştirme kipinde filtre kullanılmaz.
+
+    deadline, target_throughput: Biri verilirse hedefli seviye ayarı: dosyanın 'deadline' saniyede
+                 (çağrıdan itibaren) sıkıştırılması veya 'target_throughput' MB/s hızın korunması hedeflenir.
+                 Algoritma ve seviye örnek üzerinde kalibre edilerek seçilir ('strategy' yerine) ve
+                 sıkıştırma sırasında ölçülen hıza göre blok blok ayarlanır (bkz. level_tuning).
+                 Blok kipini etkinleştirir; tekilleştirme kipiyle kullanılamaz. Seçici kararı önbelleğe
+                 alınmaz; kalibrasyon makinenin o anki yüküne bağlıdır.
+
+    memory_limit: Verilirse (bayt) sıkıştırmanın bellek sınırı. Akış kipinde G/Ç tamponları düşülür;
+                 blok kipinde kalan bellek iş parçacıklarına bölünür (gerekirse iş parçacığı sayısı ve
+                 blok boyutu düşürülür). Seçicinin oluşturduğu sıkıştırıcının seviyesi, penceresi ve
+                 sözlük boyutu bütçeye sığacak şekilde ayarlanır (bkz. memory_budget). Kullanılan pencere
+                 ve tahmini açma belleği başlığa yazılır (hedefli ayarda ve uyarlamalı kipte kullanılabilecek
+                 sıkıştırıcıların en büyüğü).
+
+    İşlem compress_steps ile yürütülür; hatalar yazdırılır ve None döndürülür.
     """
     print(f"\n--- '{filepath}' dosyası sıkıştırılıyor ---")
 
-    # 1. Dosya özelliklerini analiz et
-    analysis_results = analyze_file_properties(filepath)
-    if not analysis_results:
+    if not os.path.exists(filepath):
+        print(f"Hata: Dosya bulunamadı - '{filepath}'")
         print("Dosya analizi başarısız oldu. Sıkıştırma iptal edildi.")
         return None
 
-    print(f"  Analiz Sonuçları: Boyut={analysis_results['file_size']}B, Entropi={analysis_results['entropy']:.2f}, Uzantı='{analysis_results['file_extension']}'")
+    try:
+        return run_steps(compress_steps(
+            filepath, output_dir, analysis_mode=analysis_mode, strategy=strategy, objective=objective,
+            block_mode=block_mode, block_size=block_size, workers=workers, selector=selector, adaptive=adaptive,
+            dictionary_store=dictionary_store, profile=profile, codec_overrides=codec_overrides,
+            learning_db=learning_db, analysis_cache=analysis_cache, chunk_store=chunk_store, io_engine=io_engine,
+            instrumentation=instrumentation, filter_mode=filter_mode, deadline=deadline,
+            target_throughput=target_throughput, memory_limit=memory_limit))
+    except Exception as e:
+        print(f"  Sıkıştırma işlemi sırasında bir hata oluştu: {e}")
+        return None
 
-    # 2. Sıkıştırıcıyı seç
-    selector = CompressorSelector()
-    selected_compressor: Compressor = selector.select_compressor(analysis_results)
-    
-    print(f"  Seçilen Sıkıştırma Algoritması: {selected_compressor.get_name()}")
+def run_steps(steps: Generator[None, None, Any]) -> Any:
+    """Adım adım çalışan bir işlemi (bkz. compress_steps) sonuna kadar yürütür ve sonucunu döndürür."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
 
+def compress_steps(filepath: str, output_dir: str = '.', analysis_mode: str = 'prefix',
+                   strategy: str = 'rules', objective: str = 'ratio', block_mode: bool = False,
+                   block_size: int = DEFAULT_BLOCK_SIZE, workers: int = None,
+                   selector: CompressorSelector = None, adaptive: bool = False,
+                   dictionary_store: DictionaryStore = None, profile: str = DEFAULT_PROFILE,
+                   codec_overrides: dict = None, learning_db: str = None,
+                   analysis_cache: AnalysisCache = None, chunk_store: ChunkStore = None,
+                   io_engine: str = DEFAULT_IO_ENGINE, instrumentation: Instrumentation = None,
+                   filter_mode: str = 'auto', deadline: float = None,
+                   target_throughput: float = None, memory_limit: int = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Generator[None, None, str]:
+    """
+    compress_file'ın adım adım çalışan gövdesi; parametreler compress_file ile aynıdır. Üreteç her
+    yield'de durur ve çağıran (ör. async_api) adımlar arasında iş parçacığını bırakabilir: ilk adım
+    analiz, seçim ve başlığı yazar; akış kapsayıcısında basit ('simple') G/Ç motoruyla sonraki her adım
+    bir parçayı (chunk_size) sıkıştırır. Blok ve tekilleştirme kipinde ve 'pipeline' motorunda
+    sıkıştırma tek adımdır. Sıkıştırılmış dosyanın yolu StopIteration değeri olarak döner (bkz. run_steps).
+    Hatalar istisna olarak yükseltilir; hata veya close() ile iptal durumunda yarım kalan çıktı silinir.
+    """
+    operation = (instrumentation or Instrumentation()).operation('compress', filepath)
+    compressed_filepath = None
     try:
-        # Orijinal içeriği oku
-        with open(filepath, 'rb') as f:
-            original_data = f.read()
-
-        # 3. Veriyi sıkıştır
-        print(f"  {selected_compressor.get_name()} ile sıkıştırma başlatılıyor...")
-        compressed_data = selected_compressor.compress(original_data)
-        print(f"  Sıkıştırma tamamlandı. Orjinal: {len(original_data)}B, Sıkıştırılmış: {len(compressed_data)}B")
-        print(f"  Sıkıştırma Oranı: {len(original_data) / len(compressed_data):.2f}x")
-
-        # 4. Sıkıştırılmış veriyi diske yaz
-        # Sıkıştırılmış dosya adı için algoritma adını da ekleyelim.
-        # Örneğin: original.txt -> original_timestamp_zlib.txt.compressed
-        # Veya sadece uzantısı değişebilir: original.txt -> original.gz
-        # Şimdilik basitçe orijinal uzantısını koruyup sonuna .compressed ve algoritma adını ekleyelim.
-        output_filename = os.path.basename(filepath) + f".{selected_compressor.get_name()}.comp"
-        compressed_filepath = os.path.join(output_dir, output_filename)
-
-        with open(compressed_filepath, 'wb') as f:
-            f.write(compressed_data)
-        
+        # Son tarih bu andan itibaren sayılır: analiz ve kalibrasyon da süreye dahildir.
+        target = level_controller = None
+        if deadline is not None or target_throughput is not None:
+            target = ThroughputTarget(os.path.getsize(filepath), target_throughput, deadline)
+            if chunk_store is not None:
+                raise ValueError("Hedefli seviye ayarı tekilleştirme kipiyle birlikte kullanılamaz.")
+            if not (block_mode or adaptive):
+                print("  Hedefli seviye ayarı blok kipinde çalışır; blok kipi etkinleştirildi.")
+                block_mode = True
+        selector = selector or create_selector(strategy, objective, dictionary_store, profile,
+                                               codec_overrides, learning_db)
+        if memory_limit is not None:
+            if block_mode or adaptive:
+                requested = (block_size, workers or os.cpu_count() or 1)
+                codec_budget, block_size, workers = plan_blocks(memory_limit, block_size, requested[1])
+                if (block_size, workers) != requested:
+                    print(f"  Bellek sınırı için blok boyutu {block_size}B, iş parçacığı sayısı {workers} yapıldı.")
+                selector.set_memory_budget(codec_budget, block_size)
+            else:
+                selector.set_memory_budget(stream_budget(memory_limit), os.path.getsize(filepath))
+            print(f"  Bellek sınırı: {format_memory(memory_limit)} (algoritma bütçesi: {format_memory(selector.memory_limit)}"
+                  f"{' / iş parçacığı' if block_mode or adaptive else ''})")
+        cache_key = cached = decision = None
+        if analysis_cache is not None:
+            cache_key = analysis_cache.file_key(filepath)
+            cached = analysis_cache.get(filepath, cache_key)
+            decision_context = _decision_context(selector, strategy, objective, filter_mode)
+            if target is None:
+                decision = cached['decisions'].get(decision_context) if cached is not None else None
+            else:
+                decision_context += "|hedefli"
+
+        with open(filepath, 'rb') as src:
+            with operation.span('selection'):
+                # Deneme stratejisi için örnek bloklar analizden önce okunur.
+                if (strategy == 'trial' or target is not None) and decision is None:
+                    trial_samples = read_sample_blocks(src, TRIAL_SAMPLE_BLOCKS)
+                    src.seek(0)
+
+            # 1. Dosya özelliklerini analiz et
+            # Analizde okunan baytlar, sıkıştırılamazlık kontrolü için örnek olarak da kullanılır.
+            with operation.span('analysis'):
+                if cached is not None:
+                    # Değişmemiş dosya: analiz sonuçları önbellekten alınır, dosya analiz için okunmaz.
+                    analysis_results = cached['analysis']
+                    sample = None
+                    reader = src
+                    print("  Analiz sonuçları önbellekten alındı.")
+                elif analysis_mode == 'full':
+                    analysis_results = analyze_file_properties(filepath)
+                    sample = src.read(INCOMPRESSIBLE_CHECK_SIZE)
+                    src.seek(0)
+                    reader = src
+                elif analysis_mode == 'sample':
+                    analysis_results, sample_blocks = analyze_sample(src, filepath)
+                    sample = b"".join(sample_blocks)
+                    src.seek(0)
+                    reader = src
+                else:
+                    analysis_results, sample = analyze_prefix(src, filepath)
+                    reader = PrefixedReader(sample, src)
+            if cached is None and analysis_results:
+                operation.add('analysis', 0.0, nbytes=analysis_results['analyzed_size'])
+
+            if not analysis_results:
+                raise ValueError("Dosya analizi başarısız oldu.")
+
+            print(f"  Analiz Sonuçları: Boyut={analysis_results['file_size']}B, Entropi={analysis_results['entropy']:.2f}, Uzantı='{analysis_results['file_extension']}' (analiz edilen: {analysis_results['analyzed_size']}B)")
+            if analysis_results.get('sampled'):
+                print(f"  Örnekleme Güveni: entropi ±{analysis_results['entropy_ci95']:.2f} bit/bayt (%95)")
+
+            # 2. Sıkıştırıcıyı seç
+            with operation.span('selection'):
+                data_filter = None
+                if decision is not None:
+                    selected_compressor: Compressor = selector.compressor_from_header(decision['codec'], decision['params'])
+                    data_filter = filter_from_params(decision.get('filter'))
+                    decision_reason = f"Önbellekteki karar kullanıldı ({decision['codec']})."
+                    print(f"  [Seçim]: {decision_reason}")
+                else:
+                    if sample is None:
+                        # Analiz önbellekte fakat bu bağlamda karar yok: seçim için yalnızca örnek okunur.
+                        sample = src.read(INCOMPRESSIBLE_CHECK_SIZE)
+                        src.seek(0)
+                    if target is not None:
+                        workers_count = workers or os.cpu_count() or 1
+                        block_count = max(1, -(-analysis_results['file_size'] // block_size))
+                        parallelism = max(1, min(workers_count, os.cpu_count() or 1, block_count))
+                        selected_compressor, level_controller = selector.select_compressor_for_target(
+                            trial_samples, target, parallelism)
+                        ladder = {id(result) for result in level_controller.ladder}
+                        for result in level_controller.calibration:
+                            print(f"    {setting_label(result):<13} oran={result['ratio']:.2f}x "
+                                  f"hız={result['throughput_mb_s']:.1f} MB/s{' *' if id(result) in ladder else ''}")
+                    elif strategy == 'trial':
+                        selected_compressor, trial_results = selector.select_compressor_by_trial(trial_samples, objective)
+                        for result in trial_results:
+                            print(f"    {result['name']:<10} oran={result['ratio']:.2f}x "
+                                  f"hız={result['throughput_mb_s']:.1f} MB/s CPU={result['cpu_time'] * 1000:.1f} ms")
+                    else:
+                        selected_compressor: Compressor = selector.select_compressor(analysis_results, sample=sample)
+                    decision_reason = selector.last_decision_reason
+                    if filter_mode == 'auto' and chunk_store is None:
+                        # Hedefli ayarda filtre, iş parçacığı başına gereken hızdan yavaşsa uygulanmaz.
+                        min_filter_mb_s = (target.required_mb_s() / (parallelism * PARALLEL_EFFICIENCY)
+                                           if target is not None else None)
+                        data_filter = selector.select_filter(analysis_results, selected_compressor, sample, min_filter_mb_s)
+                    if analysis_cache is not None:
+                        analysis_cache.put(filepath, analysis_results, decision_context,
+                                           {'codec': selected_compressor.get_name(), 'params': selected_compressor.get_params(),
+                                            'filter': data_filter.to_params() if data_filter is not None else None},
+                                           key=cache_key)
+
+            block_mode = block_mode or adaptive
+            if block_mode and chunk_store is not None:
+                raise ValueError("Tekilleştirme kipi blok kipiyle birlikte kullanılamaz.")
+            if (block_mode or chunk_store is not None) and getattr(selected_compressor, 'threads', 0):
+                # Blok kipinde bloklar zaten paralel sıkıştırılır, tekilleştirme kipindeki parçalar ise
+                # küçüktür; algoritmanın kendi iş parçacıkları çekirdekleri yalnızca aşırı yükler.
+                selected_compressor.threads = 0
+            io_engine = choose_io_engine(io_engine, selected_compressor, analysis_results['file_size'])
+            print(f"  Seçilen Sıkıştırma Algoritması: {selected_compressor.get_name()} "
+                  f"(profil: {selector.profile}, parametreler: {selected_compressor.get_params()})")
+            if data_filter is not None:
+                print(f"  Filtre: {data_filter.describe()}")
+
+            # 3. Dosyayı parça parça okuyup sıkıştırarak diske yaz (akış modu).
+            # Böylece çok büyük dosyalarda bile bellek kullanımı sınırlı kalır.
+            # Sıkıştırılmış dosya adı için algoritma adını da ekleyelim.
+            # Örneğin: original.txt -> original.txt.zlib.comp
+            output_filename = os.path.basename(filepath) + f".{selected_compressor.get_name()}.comp"
+            compressed_filepath = os.path.join(output_dir, output_filename)
+
+            print(f"  {selected_compressor.get_name()} ile sıkıştırma başlatılıyor...")
+            with open(compressed_filepath, 'wb') as dst:
+                # Dosya kendini tanımlayan bir başlıkla başlar; orijinal boyut ve
+                # sağlama, veri akış halinde sıkıştırıldıktan sonra başlığa işlenir.
+                params = selected_compressor.get_params()
+                if params.get('dict_id') is not None:
+                    # Sözlüklü küçük dosyalarda başlık çıktının büyük kısmıdır; seviye açmada gerekmez.
+                    del params['level']
+                container = CONTAINER_STREAM
+                if block_mode:
+                    params['block_size'] = block_size
+                    container = CONTAINER_BLOCKS
+                if adaptive:
+                    params['adaptive'] = True
+                if data_filter is not None:
+                    params['filter'] = data_filter.to_params()
+                if chunk_store is not None:
+                    # Depo yolu başlığa yazılır; açarken depo kendiliğinden bulunur.
+                    params['dedup_store'] = os.path.abspath(chunk_store.path)
+                    container = CONTAINER_DEDUP
+                elif memory_limit is not None:
+                    # Pencere ve açma belleği, dosya açılmadan önce bilinsin diye başlığa yazılır. Kayıt,
+                    # bellek sınırına sığdırılmış ve gerçekte kullanılacak sıkıştırıcılardan hesaplanır:
+                    # hedefli ayarda merdivenin tüm ayarları, uyarlamalı kipte blok başına seçilebilen Zstandard.
+                    # Başlıktaki parametrelerden aynı değerler tahmin ediliyorsa (tek algoritma; sığdırılan
+                    # pencere parametrelere yazılır, 'stored') kayıt yazılmaz (bkz. plan_decompression).
+                    used = level_controller.compressors() if level_controller is not None else [selected_compressor]
+                    if adaptive:
+                        used.append(selector.create_compressor("zstandard"))
+                    record = memory_record(used)
+                    if record != memory_record([selector.compressor_from_header(selected_compressor.get_name(), params)]):
+                        params['memory'] = record
+                    window_log = record['window_log']
+                    print(f"  Bellek: sıkıştırma ~{format_memory(max(c.compression_memory() for c in used))}, "
+                          f"açma ~{format_memory(record['decompression_bytes'])}"
+                          f"{' / iş parçacığı' if block_mode else ''}"
+                          f"{f', pencere 2^{window_log}' if window_log is not None else ''}")
+                header_size = write_header(dst, selected_compressor.get_name(), container, params)
+                yield
+
+                timed_reader, timed_dst = operation.timed(reader), operation.timed(dst)
+                checked_reader = ChecksumReader(timed_reader)
+                block_stats = Counter()
+                cpu_start = time.process_time()
+                with operation.stream('compress', timed_reader, timed_dst):
+                    if chunk_store is not None:
+                        dedup_stats = compress_chunks(checked_reader, timed_dst, selected_compressor, chunk_store)
+                        payload_size = dedup_stats['bytes_out']
+                    elif block_mode:
+                        _, payload_size = compress_blocks(checked_reader, timed_dst, selected_compressor, block_size,
+                                                          workers, adaptive=adaptive, block_stats=block_stats,
+                                                          data_filter=data_filter, level_controller=level_controller,
+                                                          selector=selector)
+                    else:
+                        # Filtre, okunan veriyi algoritmaya verilmeden önce çerçeveler halinde dönüştürür;
+                        # sağlama ve orijinal boyut filtrelenmemiş veri üzerinden hesaplanır.
+                        stream_reader = (FilteringReader(checked_reader, data_filter) if data_filter is not None
+                                         else checked_reader)
+                        if io_engine == 'pipeline':
+                            _, payload_size = pipelined_compress(stream_reader, timed_dst, selected_compressor)
+                        else:
+                            # Basit motorda her parçadan sonra adım bırakılır (bkz. compress_steps).
+                            stream = selected_compressor._new_stream_compressor()
+                            payload_size = 0
+                            while True:
+                                chunk = stream_reader.read(chunk_size)
+                                out = stream.compress(chunk) if chunk else stream.flush()
+                                if out:
+                                    timed_dst.write(out)
+                                    payload_size += len(out)
+                                if not chunk:
+                                    break
+                                yield
+
+                cpu_seconds = time.process_time() - cpu_start
+                original_size = checked_reader.bytes_read
+                compressed_size = header_size + payload_size
+                patch_header(dst, 0, original_size, checked_reader.crc)
+
+        if chunk_store is None:
+            # Tekilleştirme kipindeki boyutlar algoritmanın değil depodaki tekrarların sonucudur;
+            # öğrenen seçicinin modeline katılmaz.
+            selector.record_outcome(analysis_results, selected_compressor.get_name(), original_size, payload_size, cpu_seconds)
+            if (container == CONTAINER_STREAM and selected_compressor.get_name() != "stored"
+                    and original_size <= STORED_FALLBACK_SIZE and compressed_size > original_size + MIN_HEADER_SIZE):
+                stored_filepath = _store_small_file(filepath, output_dir, original_size, checked_reader.crc)
+                if stored_filepath is not None:
+                    print(f"  Sıkıştırılmış çıktı ({compressed_size}B) saklamadan büyük; 'stored' olarak yeniden yazıldı.")
+                    if stored_filepath != compressed_filepath:
+                        os.remove(compressed_filepath)
+                    compressed_filepath = stored_filepath
+                    selected_compressor = selector.available_compressors["stored"]()
+                    params, data_filter = {}, None
+                    compressed_size = original_size + MIN_HEADER_SIZE
+        else:
+            # Dosyanın gerçek maliyeti: bildirim ve depoya eklenen yeni parçalar.
+            compressed_size += dedup_stats['stored_bytes']
+
+        print(f"  Sıkıştırma tamamlandı. Orjinal: {original_size}B, Sıkıştırılmış: {compressed_size}B")
+        if chunk_store is not None:
+            print(f"  Parçalar: {dedup_stats['chunks']}, yeni: {dedup_stats['new_chunks']} "
+                  f"({dedup_stats['new_bytes']}B, depoda {dedup_stats['stored_bytes']}B)")
+            if dedup_stats['new_bytes'] > 0:
+                print(f"  Tekilleştirme Oranı: {original_size / dedup_stats['new_bytes']:.2f}x, "
+                      f"Yeni Parçaların Sıkıştırma Oranı: {dedup_stats['new_bytes'] / dedup_stats['stored_bytes']:.2f}x")
+            else:
+                print("  Tekilleştirme: Tüm parçalar depoda zaten mevcut.")
+        if level_controller is not None:
+            print(f"  Seviye ayarı: {len(level_controller.changes)} değişiklik, son ayar {level_controller.label()}; "
+                  f"bloklar: {', '.join(f'{label}={count}' for label, count in level_controller.block_counts.most_common()) or 'yok'}")
+            elapsed = target.elapsed()
+            if target.deadline is not None:
+                status = "karşılandı" if elapsed <= target.deadline else "AŞILDI"
+                print(f"  Son tarih: {target.deadline:.1f} s, geçen süre: {elapsed:.1f} s ({status})")
+            else:
+                print(f"  Hedef hız: {target.target_mb_s:.1f} MB/s, gerçekleşen: {original_size / max(elapsed, 1e-9) / 1e6:.1f} MB/s "
+                      f"(analiz ve kalibrasyon dahil)")
+        if adaptive:
+            print(f"  Blok başına seçilen algoritmalar: {', '.join(f'{name}={count}' for name, count in block_stats.most_common())}")
+        if compressed_size > 0:
+            print(f"  Sıkıştırma Oranı: {original_size / compressed_size:.2f}x")
+
         print(f"  Sıkıştırılmış dosya kaydedildi: '{compressed_filepath}'")
+        operation.bytes_in, operation.bytes_out = original_size, compressed_size
+        operation.set(codec=selected_compressor.get_name(), params=selected_compressor.get_params(),
+                      profile=selector.profile, strategy=strategy, decision_reason=decision_reason,
+                      container=container, io_engine=io_engine,
+                      filter=data_filter.describe() if data_filter is not None else None,
+                      filter_reason=selector.last_filter_reason if decision is None else None,
+                      tuning=level_controller.summary() if level_controller is not None else None,
+                      memory_limit=memory_limit, memory=params.get('memory'),
+                      ratio=original_size / compressed_size if compressed_size > 0 else None)
+        operation.finish()
         return compressed_filepath
 
-    except Exception as e:
-        print(f"  Sıkıştırma işlemi sırasında bir hata oluştu: {e}")
+    except BaseException as e:
+        # Hata veya iptal (close): yarım kalan çıktı silinir.
+        operation.finish(error=e if isinstance(e, Exception) else "İşlem iptal edildi.")
+        if compressed_filepath is not None:
+            with contextlib.suppress(OSError):
+                os.remove(compressed_filepath)
+        raise
+
+def _store_small_file(filepath: str, output_dir: str, original_size: int, checksum: int) -> Optional[str]:
+    """
+    Küçük bir dosyayı 'stored' olarak (parametresiz başlık + veri) yazar ve yolunu döndürür.
+    Dosya sıkıştırıldıktan sonra değiştiyse (boyut veya sağlama farklıysa) yazmaz ve None döndürür.
+    Çıktı önce geçici bir ada yazılıp yerine taşınır; yarım kalan yazma var olan bir çıktıyı bozmaz.
+    """
+    with open(filepath, 'rb') as src:
+        data = src.read(original_size + 1)
+    if len(data) != original_size or zlib.crc32(data) != checksum:
         return None
+    stored_filepath = os.path.join(output_dir, os.path.basename(filepath) + ".stored.comp")
+    temp_filepath = stored_filepath + ".tmp"
+    try:
+        with open(temp_filepath, 'wb') as dst:
+            write_header(dst, "stored", CONTAINER_STREAM, None, original_size, checksum)
+            dst.write(data)
+        os.replace(temp_filepath, stored_filepath)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_filepath)
+        raise
+    return stored_filepath
 
-def decompress_file(filepath: str, output_dir: str = '.') -> str or None:
+def decompress_file(filepath: str, output_dir: str = '.', workers: int = None,
+                    dictionary_store: DictionaryStore = None, chunk_store: ChunkStore = None,
+                    io_engine: str = DEFAULT_IO_ENGINE, instrumentation: Instrumentation = None,
+                    memory_limit: int = None) -> str or None:
     """
-    Sıkıştırılmış bir dosyayı açar. Hangi algoritmayla sıkıştırıldığını dosya adından varsayar.
-    Açılmış dosyanın yolunu döndürür.
+    Sıkıştırılmış bir dosyayı açar. Algoritma ve kapsayıcı tipi dosyanın başlığından
+    okunur (bkz. file_format); başlıksız eski dosyalarda dosya adından varsayılır.
+    Başlıkta bir sözlük kimliği varsa sözlük 'dictionary_store' deposundan
+    (verilmezse varsayılan depodan) yüklenir. Tekilleştirme kipindeki dosyaların parçaları
+    'chunk_store' deposundan (verilmezse başlıktaki depo yolundan) okunur. Akış kapsayıcısı
+    'io_engine' ile açılır (bkz. compress_file). Açılmış dosyanın yolunu döndürür.
+    'instrumentation' verilirse okuma, açma ve yazma aşamalarının ölçümleri ona iletilir.
+    'memory_limit' verilirse (bayt) gereken bellek açmaya başlamadan başlıktaki bellek kaydından
+    hesaplanır: blok kapsayıcıda iş parçacığı sayısı sınıra göre düşürülür, tek akış bile sığmıyorsa
+    dosya açılmaz.
     """
     print(f"\n--- '{filepath}' dosyası açılıyor ---")
 
-    # Dosya adından sıkıştırıcı bilgisini çıkar
-    parts = os.path.basename(filepath).split('.')
-    if len(parts) < 3 or parts[-1] != 'comp':
-        print(f"Hata: Geçersiz sıkıştırılmış dosya adı formatı. '{filepath}'")
-        print("Beklenen format: 'orjinal_dosya_adi.algoritma_adi.comp'")
-        return None
-    
-    # Algoritma adını al
-    # Örn: 'my_file.txt.zlib.comp' -> 'zlib'
-    compressor_name = parts[-2] 
+    operation = (instrumentation or Instrumentation()).operation('decompress', filepath)
+    temp_filepath = None
+    try:
+        with open(filepath, 'rb') as src:
+            header = read_header(src)
 
-    # Seçiciyi kullanarak uygun sıkıştırıcıyı bul
-    selector = CompressorSelector()
-    selected_compressor_class = selector.available_compressors.get(compressor_name)
+            if header is None:
+                # Eski (başlıksız) biçim: algoritma adı dosya adından çıkarılır.
+                # Örn: 'my_file.txt.zlib.comp' -> 'zlib'
+                parts = os.path.basename(filepath).split('.')
+                if len(parts) < 3 or parts[-1] != 'comp':
+                    print(f"Hata: Dosya .comp biçiminde değil ve adından algoritma çıkarılamadı. '{filepath}'")
+                    print("Beklenen format: 'orjinal_dosya_adi.algoritma_adi.comp'")
+                    return None
+                compressor_name = parts[-2]
+                original_base_name = ".".join(parts[:-2]) # 'my_file.txt' kısmı
+            else:
+                compressor_name = header['codec']
+                original_base_name = original_filename(filepath, compressor_name)
 
-    if not selected_compressor_class:
-        print(f"Hata: Bilinmeyen sıkıştırma algoritması adı '{compressor_name}'. Açma iptal edildi.")
-        return None
-    
-    selected_compressor: Compressor = selected_compressor_class()
-    print(f"  Açma için seçilen algoritma: {selected_compressor.get_name()}")
+            # Seçiciyi kullanarak uygun sıkıştırıcıyı bul
+            selector = CompressorSelector(dictionary_store)
+            if compressor_name not in selector.available_compressors:
+                print(f"Hata: {selector.available_compressors.missing_reason(compressor_name)} Açma iptal edildi.")
+                return None
 
-    try:
-        # Sıkıştırılmış içeriği oku
-        with open(filepath, 'rb') as f:
-            compressed_data = f.read()
+            # Başlıktaki parametreler (pencere boyutu, sözlük kimliği vb.) açma için de kullanılır.
+            params = header['params'] if header is not None else {}
+            selected_compressor: Compressor = selector.compressor_from_header(compressor_name, params)
+            data_filter = filter_from_params(params.get('filter'))
+            if params.get('dict_id') is not None:
+                print(f"  Sözlük: {params['dict_id']}")
+            if data_filter is not None:
+                print(f"  Filtre: {data_filter.describe()}")
+            print(f"  Açma için seçilen algoritma: {selected_compressor.get_name()}")
+            if header is not None and params.get('memory') is not None:
+                window_log = params['memory']['window_log']
+                print(f"  Açma belleği (başlıktan): ~{format_memory(params['memory']['decompression_bytes'])}"
+                      f"{f', pencere 2^{window_log}' if window_log is not None else ''}")
+            if memory_limit is not None and header is not None and header['container'] != CONTAINER_DEDUP:
+                # Gereken bellek, çıktı dosyası oluşturulmadan önce denetlenir.
+                required, workers = plan_decompression(header, selected_compressor, memory_limit,
+                                                       workers or os.cpu_count() or 1,
+                                                       header['container'] == CONTAINER_BLOCKS)
+                print(f"  Bellek sınırı: {format_memory(memory_limit)}, tahmini kullanım: {format_memory(required)}"
+                      f"{f' ({workers} iş parçacığı)' if header['container'] == CONTAINER_BLOCKS else ''}")
 
-        # Veriyi aç
-        print(f"  {selected_compressor.get_name()} ile açma başlatılıyor...")
-        decompressed_data = selected_compressor.decompress(compressed_data)
-        print("  Açma tamamlandı.")
+            # Açılmış veriyi diske yaz (orijinal uzantısını geri alarak)
+            # Örn: my_file.txt.zlib.comp -> my_file.txt
+            # Veri önce geçici bir dosyaya açılır ve boyut ile sağlama doğrulandıktan sonra yerine
+            # taşınır; bozuk veya yarım kalan çıktı var olan bir dosyanın üzerine yazılmaz.
+            decompressed_filepath = os.path.join(output_dir, original_base_name)
+            temp_filepath = decompressed_filepath + ".tmp"
 
-        # Açılmış veriyi diske yaz (orijinal uzantısını geri alarak)
-        # Örn: my_file.txt.zlib.comp -> my_file.txt
-        original_base_name = ".".join(parts[:-2]) # 'my_file.txt' kısmı
-        decompressed_filepath = os.path.join(output_dir, original_base_name)
+            # Veriyi parça parça aç (akış modu)
+            io_engine = choose_io_engine(io_engine, selected_compressor,
+                                         header['original_size'] if header is not None else os.path.getsize(filepath))
+            print(f"  {selected_compressor.get_name()} ile açma başlatılıyor...")
+            with open(temp_filepath, 'wb') as dst:
+                if header is not None:
+                    # Orijinal boyut başlıkta bilindiği için çıktı yeri tek seferde ayrılır.
+                    preallocate(dst, header['original_size'])
+                timed_src, timed_dst = operation.timed(src), operation.timed(dst)
+                checked_writer = ChecksumWriter(timed_dst)
+                with operation.stream('decompress', timed_src, timed_dst):
+                    # Blok kapsayıcıdaki dosyalar bloklar halinde paralel açılır.
+                    if header is not None and header['container'] == CONTAINER_BLOCKS:
+                        decompress_blocks(timed_src, checked_writer, workers, compressor=selected_compressor,
+                                          data_filter=data_filter)
+                    elif header is not None and header['container'] == CONTAINER_DEDUP:
+                        store = chunk_store or ChunkStore(params['dedup_store'])
+                        print(f"  Parça deposu: '{store.path}'")
+                        decompress_chunks(timed_src, checked_writer, store, selector)
+                    else:
+                        stream_writer = (DefilteringWriter(checked_writer, data_filter) if data_filter is not None
+                                         else checked_writer)
+                        if io_engine == 'pipeline':
+                            pipelined_decompress(timed_src, stream_writer, selected_compressor)
+                        else:
+                            selected_compressor.decompress_stream(timed_src, stream_writer)
+                        if data_filter is not None:
+                            stream_writer.finish()
+
+        if header is not None:
+            if checked_writer.bytes_written != header['original_size']:
+                raise ValueError(f"Boyut uyuşmazlığı: beklenen {header['original_size']}B, açılan {checked_writer.bytes_written}B")
+            if checked_writer.crc != header['checksum']:
+                raise ValueError("Sağlama (CRC32) uyuşmazlığı: dosya bozulmuş olabilir.")
+        os.replace(temp_filepath, decompressed_filepath)
+        temp_filepath = None
+        print("  Açma tamamlandı.")
 
-        with open(decompressed_filepath, 'wb') as f:
-            f.write(decompressed_data)
-        
         print(f"  Açılmış dosya kaydedildi: '{decompressed_filepath}'")
+        operation.bytes_in, operation.bytes_out = timed_src.bytes, checked_writer.bytes_written
+        operation.set(codec=selected_compressor.get_name(), params=params, io_engine=io_engine,
+                      filter=data_filter.describe() if data_filter is not None else None,
+                      container=header['container'] if header is not None else CONTAINER_STREAM)
+        operation.finish()
         return decompressed_filepath
 
     except Exception as e:
         print(f"  Açma işlemi sırasında bir hata oluştu: {e}")
+        operation.finish(error=e)
         return None
+    finally:
+        if temp_filepath is not None:
+            with contextlib.suppress(OSError):
+                os.remove(temp_filepath)
+
+def extract_range(filepath: str, offset: int, length: int, output_dir: str = '.',
+                  dictionary_store: DictionaryStore = None) -> str or None:
+    """
+    Blok kapsayıcılı bir .comp dosyasından orijinal verinin yalnızca
+    [offset, offset + length) aralığını açıp ayrı bir dosyaya yazar.
+    Yalnızca aralığı kapsayan bloklar okunur (bkz. seekable_reader).
+    Yazılan dosyanın yolunu döndürür.
+    """
+    print(f"\n--- '{filepath}' dosyasından aralık çıkarılıyor ---")
+
+    try:
+        header = sniff(filepath)
+        with SeekableReader(filepath, dictionary_store) as reader:
+            end = min(offset + length, reader.size)
+            base_name = original_filename(filepath, header['codec'])
+            range_filepath = os.path.join(output_dir, f"{base_name}.{offset}-{end}")
+
+            reader.seek(offset)
+            remaining = max(0, end - offset)
+            with open(range_filepath, 'wb') as dst:
+                while remaining > 0:
+                    chunk = reader.read(min(remaining, DEFAULT_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    remaining -= len(chunk)
+
+        print(f"  Aralık [{offset}, {end}) kaydedildi: '{range_filepath}'")
+        return range_filepath
+
+    except Exception as e:
+        print(f"  Aralık çıkarılırken bir hata oluştu: {e}")
+        return None
+
+def train_dictionary(paths: list, dictionary_store: DictionaryStore, dict_size: int = DEFAULT_DICTIONARY_SIZE,
+                     recursive: bool = False) -> int or None:
+    """
+    Verilen dosya, dizin ve glob ifadelerindeki dosyalardan bir zstd sözlüğü eğitir
+    ve depoda etkin sözlük yapar. Yeni sözlüğün kimliğini döndürür.
+    """
+    # batch modülü main'i içe aktardığı için burada içe aktarılır.
+    from .batch import collect_files
+
+    print(f"\n--- Sözlük eğitiliyor ---")
+    try:
+        filepaths = [filepath for filepath, _ in collect_files(paths, recursive) if os.path.isfile(filepath)]
+        print(f"  Örnek dosya sayısı: {len(filepaths)}")
+        dict_id = dictionary_store.train(filepaths, dict_size)
+        print(f"  Sözlük {dict_id} kaydedildi ve etkin sözlük yapıldı: '{dictionary_store.directory}'")
+        return dict_id
+    except Exception as e:
+        print(f"  Sözlük eğitilirken bir hata oluştu: {e}")
+        return None
+
+class _ListCodecsAction(argparse.Action):
+    """--list-codecs: kullanılabilir algoritmaları yazdırıp çıkar (--version gibi, dosya argümanı gerektirmez)."""
+    def __init__(self, option_strings, dest, **kwargs):
+        super().__init__(option_strings, dest, nargs=0, default=argparse.SUPPRESS, **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        print("Sıkıştırma algoritmaları:")
+        print_availability_report()
+        parser.exit()
 
 def main():
     parser = argparse.ArgumentParser(
@@ -130,24 +688,181 @@ def main():
         formatter_class=argparse.RawTextHelpFormatter # Açıklamaların satır atlaması için
     )
     
-    parser.add_argument('action', choices=['compress', 'decompress'], 
-                        help="Yapılacak işlem: 'compress' (sıkıştır) veya 'decompress' (aç).")
-    parser.add_argument('filepath', type=str, 
-                        help="İşlem yapılacak dosyanın yolu.")
+    parser.add_argument('--list-codecs', action=_ListCodecsAction,
+                        help="Kullanılabilir sıkıştırma algoritmalarını, sürümlerini ve eksik kütüphaneleri listeler.")
+    parser.add_argument('action', choices=['compress', 'decompress', 'extract', 'train-dict'], 
+                        help="Yapılacak işlem: 'compress' (sıkıştır), 'decompress' (aç),\n"
+                             "'extract' (blok kapsayıcılı dosyadan --offset/--length aralığını aç) veya\n"
+                             "'train-dict' (verilen dosyalardan küçük dosyalar için zstd sözlüğü eğit).")
+    parser.add_argument('filepath', type=str, nargs='+',
+                        help="İşlem yapılacak dosyanın yolu. 'compress' birden çok dosya,\n"
+                             "dizin veya glob ifadesi (ör. 'loglar/*.log') alabilir (toplu kip).")
     parser.add_argument('-o', '--output', type=str, default='.',
                         help="Çıktı dosyasının kaydedileceği dizin. Varsayılan: Mevcut dizin.")
+    parser.add_argument('--analysis', choices=['prefix', 'sample', 'full'], default='prefix',
+                        help="Analiz kipi:\n"
+                             "  prefix: Dosyanın başı analiz edilir, dosya diskten tek kez okunur (varsayılan).\n"
+                             "  sample: Dosyanın başından, sonundan ve ortasından bloklar örneklenir.\n"
+                             "  full:   Tüm dosya analiz edilir, ardından sıkıştırma için yeniden okunur.")
+    parser.add_argument('--strategy', choices=['rules', 'trial', 'learned'], default='rules',
+                        help="Algoritma seçim stratejisi:\n"
+                             "  rules:   Analiz sonuçlarına göre kural tabanlı seçim (varsayılan).\n"
+                             "  trial:   Örnek bloklar tüm algoritmalarla paralel denenir.\n"
+                             "  learned: Önceki sıkıştırma sonuçlarından öğrenilen modelle seçim.")
+    parser.add_argument('--objective', choices=TRIAL_OBJECTIVES, default='ratio',
+                        help="'trial' ve 'learned' stratejilerinde kazananı belirleyen hedef:\n"
+                             "  ratio: En iyi oran, speed: En yüksek hız,\n"
+                             "  ratio_per_cpu: CPU saniyesi başına oran. Varsayılan: ratio.")
+    parser.add_argument('--learning-db', type=str, default=DEFAULT_OUTCOME_DB,
+                        help=f"'learned' stratejisinin sonuç veritabanı. Varsayılan: {DEFAULT_OUTCOME_DB}")
+    parser.add_argument('--cache', action='store_true',
+                        help="Analiz sonuçlarını ve seçici kararlarını diskte önbellekler; değişmemiş\n"
+                             "dosyalar yeniden analiz edilmez.")
+    parser.add_argument('--cache-path', type=str, default=DEFAULT_ANALYSIS_CACHE,
+                        help=f"Analiz önbelleği veritabanı. Varsayılan: {DEFAULT_ANALYSIS_CACHE}")
+    parser.add_argument('--cache-hash', action='store_true',
+                        help="Önbellek anahtarı olarak dosya kimliği (inode, boyut, mtime) yerine içerik özetini kullanır.")
+    parser.add_argument('--cache-max-entries', type=int, default=DEFAULT_MAX_ENTRIES,
+                        help="Önbellekteki en fazla kayıt; aşılınca en uzun süredir kullanılmayanlar silinir.")
+    parser.add_argument('--daemon', nargs='?', const='', default=None, metavar='SOKET',
+                        help="Tek dosyayı çalışan daemon'a sıkıştırtır/açtırır (bkz. 'python -m akilli_sikistirma.daemon serve').\n"
+                             "Soket verilmezse ~/.cache/akilli_sikistirma/daemon.sock kullanılır.")
+    parser.add_argument('--dedup', action='store_true',
+                        help="Tekilleştirme kipi: girdi içerik tanımlı parçalara bölünür; yalnızca parça deposunda\n"
+                             "olmayan parçalar sıkıştırılıp saklanır (ör. dönen loglar, günlük dökümler).")
+    parser.add_argument('--dedup-store', type=str, default=None,
+                        help=f"Parça deposu veritabanı. Varsayılan: {DEFAULT_CHUNK_STORE}\n"
+                             "Açarken verilmezse .comp başlığındaki depo kullanılır.")
+    parser.add_argument('--blocks', action='store_true',
+                        help="Girdiyi bloklara bölüp tüm çekirdeklerde paralel sıkıştırır.")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="Blok kipinde algoritmayı her blok için ayrıca seçer; karışık içerikli\n"
+                             "dosyalarda sıkıştırılamaz bloklar sıkıştırılmadan saklanır (--blocks içerir).")
+    parser.add_argument('--block-size', type=parse_size, default=DEFAULT_BLOCK_SIZE,
+                        help="--blocks kipinde blok boyutu (ör. 1M, 4M). Varsayılan: 4M.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Paralel sıkıştırma/açma için iş parçacığı sayısı. Varsayılan: çekirdek sayısı.")
+    parser.add_argument('--io-engine', choices=IO_ENGINES, default=DEFAULT_IO_ENGINE,
+                        help="Akış kipinde G/Ç motoru: pipeline (okuma, sıkıştırma ve yazma üst üste biner),\n"
+                             "simple (sırayla) veya auto (varsayılan; stored ve 16 MB'tan küçük dosyalarda simple).")
+    parser.add_argument('--filter', choices=FILTER_MODES, default='auto',
+                        help="Sıkıştırma öncesi filtre: auto (analiz sayısal dizilere delta, CSV/TSV'ye sütun\n"
+                             "dönüşümü, çalıştırılabilir dosyalara BCJ uygular; varsayılan) veya none.")
+    parser.add_argument('--deadline', type=float, default=None, metavar='SANİYE',
+                        help="Dosyanın bu sürede sıkıştırılması hedeflenir: algoritma ve seviye örnek üzerinde\n"
+                             "kalibre edilerek seçilir ve ölçülen hıza göre blok blok ayarlanır (blok kipini içerir).")
+    parser.add_argument('--target-throughput', type=float, default=None, metavar='MB/s',
+                        help="--deadline gibi, fakat sabit bir sıkıştırma hızı (MB/s) hedeflenir.")
+    parser.add_argument('--memory-limit', type=parse_size, default=None, metavar='BOYUT',
+                        help="Sıkıştırma/açma için bellek sınırı (ör. 512M, 2G). Algoritmanın seviyesi, penceresi\n"
+                             "ve sözlük boyutu sınıra sığacak şekilde seçilir; blok kipinde sınır iş parçacıklarına,\n"
+                             "toplu kipte eşzamanlı işlere bölünür. Açarken gereken bellek başlıktan denetlenir.")
+    parser.add_argument('--profile', action='store_true',
+                        help="İşlem sonunda aşama dökümünü yazdırır: analiz, seçim, okuma, sıkıştırma/açma ve\n"
+                             "yazma süreleri, CPU, MB/s, tepe bellek ve seçim gerekçesi.")
+    parser.add_argument('--metrics-log', type=str, default=None, metavar='DOSYA',
+                        help="Her işlemin ölçüm olayını bu dosyaya JSON satırı olarak ekler.")
+    parser.add_argument('--metrics-prom', type=str, default=None, metavar='DOSYA',
+                        help="Ölçümleri Prometheus metin biçiminde bu dosyaya yazar (node_exporter textfile).")
+    parser.add_argument('--offset', type=int, default=0,
+                        help="'extract' işleminde aralığın orijinal veri içindeki başlangıcı (bayt).")
+    parser.add_argument('--length', type=parse_size, default=None,
+                        help="'extract' işleminde aralığın uzunluğu (ör. 100M). Varsayılan: dosya sonuna kadar.")
+    parser.add_argument('-r', '--recursive', action='store_true',
+                        help="Toplu kipte dizinlere ve '**' glob ifadelerine alt dizinleriyle birlikte iner.")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="Toplu kipte paralel çalışan süreç sayısı. Varsayılan: çekirdek sayısı.")
+    parser.add_argument('--force', action='store_true',
+                        help="Toplu kipte güncel .comp çıktısı olan dosyaları da yeniden sıkıştırır.")
+    parser.add_argument('--preset', choices=PROFILE_NAMES, default=DEFAULT_PROFILE,
+                        help="Hız/oran profili: fast (en hızlı), balanced (varsayılan) veya max (en iyi oran).\n"
+                             "Seçilen algoritmanın seviye, pencere ve iş parçacığı sayısını belirler.")
+    parser.add_argument('--codec-option', action='append', default=[], metavar='ALGORITMA.PARAMETRE=DEĞER',
+                        help="Profili algoritma başına geçersiz kılar; birden çok kez verilebilir.\n"
+                             "Parametreler: level, window_log, threads (ör. --codec-option zstandard.level=12).")
+    parser.add_argument('--use-dict', action='store_true',
+                        help="Küçük dosyaları depodaki etkin sözlükle sıkıştırır (bkz. 'train-dict').")
+    parser.add_argument('--dict-dir', type=str, default=DEFAULT_DICTIONARY_DIR,
+                        help=f"Sözlük deposu dizini. Varsayılan: {DEFAULT_DICTIONARY_DIR}")
+    parser.add_argument('--dict-size', type=parse_size, default=DEFAULT_DICTIONARY_SIZE,
+                        help="'train-dict' işleminde sözlük boyutu (ör. 64K). Varsayılan: 110K.")
     
     args = parser.parse_args()
+    try:
+        codec_overrides = parse_codec_overrides(args.codec_option)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.dedup and (args.blocks or args.adaptive):
+        parser.error("--dedup, --blocks ve --adaptive ile birlikte kullanılamaz.")
+    if args.deadline is not None and args.target_throughput is not None:
+        parser.error("--deadline ve --target-throughput birlikte kullanılamaz.")
+    if args.dedup and (args.deadline is not None or args.target_throughput is not None):
+        parser.error("--deadline ve --target-throughput, --dedup ile birlikte kullanılamaz.")
+    sinks = []
+    if args.profile:
+        sinks.append(CallbackSink(print_profile))
+    if args.metrics_log:
+        sinks.append(JsonLinesSink(args.metrics_log))
+    if args.metrics_prom:
+        sinks.append(PrometheusSink(args.metrics_prom))
+    instrumentation = Instrumentation(sinks) if sinks else None
 
     # Çıktı dizininin var olduğundan emin ol
     if not os.path.isdir(args.output):
         os.makedirs(args.output)
         print(f"Çıktı dizini oluşturuldu: '{args.output}'")
 
-    if args.action == 'compress':
-        compress_file(args.filepath, args.output)
+    compress_options = dict(analysis_mode=args.analysis, strategy=args.strategy, objective=args.objective,
+                            block_mode=args.blocks, block_size=args.block_size, workers=args.workers,
+                            adaptive=args.adaptive, profile=args.preset, codec_overrides=codec_overrides,
+                            learning_db=args.learning_db, io_engine=args.io_engine, filter_mode=args.filter,
+                            deadline=args.deadline, target_throughput=args.target_throughput,
+                            memory_limit=args.memory_limit)
+    dictionary_store = DictionaryStore(args.dict_dir)
+    cache_options = dict(path=args.cache_path, max_entries=args.cache_max_entries,
+                         content_hash=args.cache_hash) if args.cache else None
+    batch_mode = (len(args.filepath) > 1 or os.path.isdir(args.filepath[0])
+                  or any(char in args.filepath[0] for char in "*?["))
+
+    if args.action == 'compress' and batch_mode:
+        if instrumentation is not None:
+            parser.error("--profile, --metrics-log ve --metrics-prom yalnızca tek dosyalık işlemlerde kullanılabilir.")
+        # batch modülü main'i içe aktardığı için burada içe aktarılır.
+        from .batch import compress_batch, print_batch_report
+        report = compress_batch(args.filepath, args.output, recursive=args.recursive, jobs=args.jobs,
+                                force=args.force, dictionary_dir=args.dict_dir if args.use_dict else None,
+                                cache_options=cache_options,
+                                chunk_store_path=(args.dedup_store or DEFAULT_CHUNK_STORE) if args.dedup else None,
+                                **compress_options)
+        print_batch_report(report)
+    elif args.action == 'train-dict':
+        train_dictionary(args.filepath, dictionary_store, args.dict_size, args.recursive)
+    elif len(args.filepath) > 1:
+        parser.error(f"'{args.action}' işlemi tek bir dosya alır.")
+    elif args.daemon is not None and args.action in ('compress', 'decompress'):
+        # Unix soketleri her platformda bulunmadığından daemon modülü yalnızca gerektiğinde içe aktarılır.
+        from .daemon import DEFAULT_SOCKET_PATH, DaemonClient, compress_file_via_daemon, decompress_file_via_daemon
+        with DaemonClient(args.daemon or DEFAULT_SOCKET_PATH) as client:
+            if args.action == 'compress':
+                compress_file_via_daemon(client, args.filepath[0], args.output, profile=args.preset)
+            else:
+                decompress_file_via_daemon(client, args.filepath[0], args.output)
+    elif args.action == 'compress':
+        analysis_cache = AnalysisCache(**cache_options) if cache_options else None
+        chunk_store = ChunkStore(args.dedup_store or DEFAULT_CHUNK_STORE) if args.dedup else None
+        compress_file(args.filepath[0], args.output, dictionary_store=dictionary_store if args.use_dict else None,
+                      analysis_cache=analysis_cache, chunk_store=chunk_store, instrumentation=instrumentation,
+                      **compress_options)
+        if analysis_cache is not None:
+            cache_stats = analysis_cache.stats()
+            print(f"  Analiz önbelleği: {cache_stats['hits']} isabet, {cache_stats['misses']} ıska")
     elif args.action == 'decompress':
-        decompress_file(args.filepath, args.output)
+        decompress_file(args.filepath[0], args.output, workers=args.workers, dictionary_store=dictionary_store,
+                        chunk_store=ChunkStore(args.dedup_store) if args.dedup_store else None,
+                        io_engine=args.io_engine, instrumentation=instrumentation, memory_limit=args.memory_limit)
+    elif args.action == 'extract':
+        length = args.length if args.length is not None else sys.maxsize
+        extract_range(args.filepath[0], args.offset, length, args.output, dictionary_store=dictionary_store)
 
     print("\nİşlem tamamlandı.")
 
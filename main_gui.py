@@ -6,19 +6,20 @@ import os
 import threading # Uzun süren işlemleri arayüzü dondurmadan yapmak için
 
 # Diğer modüllerimizi içe aktarıyoruz
-from .data_analyzer import analyze_file_properties
-from .compressor_selector import CompressorSelector
-from .compressors import Compressor # Tip ipucu için
+from .main import compress_file, decompress_file
+from .file_format import sniff
+from .profiles import DEFAULT_PROFILE, PROFILE_NAMES
 
 class SmartCompressorApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Akıllı Sıkıştırma Uygulaması")
-        self.root.geometry("600x400")
+        self.root.geometry("600x480")
         self.root.resizable(False, False)
 
         self.input_filepath = tk.StringVar()
         self.output_dir = tk.StringVar(value=os.getcwd()) # Varsayılan çıktı dizini
+        self.profile = tk.StringVar(value=DEFAULT_PROFILE) # Hız/oran profili
         self.last_compressed_filepath = None # Yeni eklenen değişken
 
         self._create_widgets()
@@ -43,6 +44,13 @@ class SmartCompressorApp:
         ttk.Button(output_frame, text="Gözat...", command=self._browse_output_dir).grid(row=0, column=2, padx=5, pady=5)
         output_frame.columnconfigure(1, weight=1)
 
+        options_frame = ttk.LabelFrame(main_frame, text="Seçenekler", padding="10")
+        options_frame.pack(pady=10, fill=tk.X)
+
+        ttk.Label(options_frame, text="Profil:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        ttk.Combobox(options_frame, textvariable=self.profile, values=PROFILE_NAMES, state="readonly", width=12).grid(row=0, column=1, padx=5, pady=5, sticky="w")
+        ttk.Label(options_frame, text="fast: en hızlı, balanced: dengeli, max: en iyi oran").grid(row=0, column=2, padx=5, pady=5, sticky="w")
+
         button_frame = ttk.Frame(main_frame, padding="10")
         button_frame.pack(pady=10)
 
@@ -94,35 +102,23 @@ class SmartCompressorApp:
         self.progress_bar.start()
         self._update_status("Sıkıştırma başlatılıyor...")
 
-        thread = threading.Thread(target=self._run_compress, args=(filepath, output_dir))
+        thread = threading.Thread(target=self._run_compress, args=(filepath, output_dir, self.profile.get()))
         thread.start()
 
-    def _run_compress(self, filepath: str, output_dir: str):
+    def _run_compress(self, filepath: str, output_dir: str, profile: str = DEFAULT_PROFILE):
         try:
-            analysis_results = analyze_file_properties(filepath)
-            if not analysis_results:
-                raise Exception("Dosya analizi başarısız oldu.")
-
-            selector = CompressorSelector()
-            selected_compressor: Compressor = selector.select_compressor(analysis_results)
-            
-            self._update_status(f"Seçilen algoritma: {selected_compressor.get_name()}. Sıkıştırma başlatılıyor...")
-
-            with open(filepath, 'rb') as f:
-                original_data = f.read()
-
-            compressed_data = selected_compressor.compress(original_data)
-            
-            output_filename = os.path.basename(filepath) + f".{selected_compressor.get_name()}.comp"
-            compressed_filepath = os.path.join(output_dir, output_filename)
-
             os.makedirs(output_dir, exist_ok=True)
 
-            with open(compressed_filepath, 'wb') as f:
-                f.write(compressed_data)
-            
-            original_size = len(original_data)
-            compressed_size = len(compressed_data)
+            # Analiz, seçim ve sıkıştırma komut satırıyla aynı yoldan yapılır
+            # (tek geçişli analiz, akış halinde sıkıştırma, .comp başlığı).
+            compressed_filepath = compress_file(filepath, output_dir, profile=profile)
+            if not compressed_filepath:
+                raise Exception("Sıkıştırma tamamlanamadı; ayrıntılar konsol çıktısındadır.")
+
+            # Algoritma ve orijinal boyut dosyanın başlığından okunur.
+            header = sniff(compressed_filepath)
+            original_size = header['original_size']
+            compressed_size = os.path.getsize(compressed_filepath)
             compression_ratio = original_size / compressed_size if compressed_size > 0 else 0
             
             # Sıkıştırma tamamlandığında son sıkıştırılan dosya yolunu kaydet
@@ -131,7 +127,7 @@ class SmartCompressorApp:
             messagebox.showinfo(
                 "Sıkıştırma Başarılı",
                 f"Dosya başarıyla sıkıştırıldı!\n"
-                f"Algoritma: {selected_compressor.get_name()}\n"
+                f"Algoritma: {header['codec']} ({profile})\n"
                 f"Orijinal Boyut: {original_size} B\n"
                 f"Sıkıştırılmış Boyut: {compressed_size} B\n"
                 f"Sıkıştırma Oranı: {compression_ratio:.2f}x\n"
@@ -185,38 +181,25 @@ class SmartCompressorApp:
 
     def _run_decompress(self, filepath: str, output_dir: str):
         try:
-            parts = os.path.basename(filepath).split('.')
-            if len(parts) < 3 or parts[-1] != 'comp':
-                raise ValueError("Geçersiz sıkıştırılmış dosya adı formatı. Beklenen format: 'orjinal_dosya_adi.algoritma_adi.comp'")
-            
-            compressor_name = parts[-2] 
-
-            selector = CompressorSelector()
-            selected_compressor_class = selector.available_compressors.get(compressor_name)
-
-            if not selected_compressor_class:
-                raise ValueError(f"Bilinmeyen sıkıştırma algoritması adı: '{compressor_name}'.")
-            
-            selected_compressor: Compressor = selected_compressor_class()
-            self._update_status(f"Açma için seçilen algoritma: {selected_compressor.get_name()}.")
-
-            with open(filepath, 'rb') as f:
-                compressed_data = f.read()
-
-            decompressed_data = selected_compressor.decompress(compressed_data)
-
-            original_base_name = ".".join(parts[:-2])
-            decompressed_filepath = os.path.join(output_dir, original_base_name)
+            # Algoritma dosyanın başlığından okunur; başlıksız eski dosyalarda dosya adından çıkarılır.
+            header = sniff(filepath)
+            if header:
+                compressor_name = header['codec']
+            else:
+                parts = os.path.basename(filepath).split('.')
+                compressor_name = parts[-2] if len(parts) >= 3 else "bilinmiyor"
+            self._update_status(f"Açma için seçilen algoritma: {compressor_name}.")
 
             os.makedirs(output_dir, exist_ok=True)
 
-            with open(decompressed_filepath, 'wb') as f:
-                f.write(decompressed_data)
+            decompressed_filepath = decompress_file(filepath, output_dir)
+            if not decompressed_filepath:
+                raise ValueError("Dosya açılamadı; ayrıntılar konsol çıktısındadır.")
             
             messagebox.showinfo(
                 "Açma Başarılı",
                 f"Dosya başarıyla açıldı!\n"
-                f"Algoritma: {selected_compressor.get_name()}\n"
+                f"Algoritma: {compressor_name}\n"
                 f"Kaydedildi: '{decompressed_filepath}'"
             )
             self._update_status("Açma tamamlandı.")
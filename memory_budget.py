@@ -0,0 +1,183 @@
+# akilli_sikistirma/memory_budget.py
+
+import copy
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .compressors import DEFAULT_CHUNK_SIZE, Compressor
+from .filters import DEFAULT_FRAME_SIZE
+from .io_pipeline import PIPELINE_BUFFER_SIZE, PIPELINE_DEPTH
+
+# Bellek sınırına sığdırmada pencere önce bu değere (1 MiB) kadar küçültülür; sığmazsa seviye düşürülür,
+# yine sığmazsa pencere algoritmanın en küçük değerine kadar küçültülür. Bunun altındaki
+# pencereler oranı seviyeden daha çok düşürür.
+MEMORY_WINDOW_FLOOR = 20
+
+# Algoritmaların kabul ettiği en küçük pencere ve sığdırmada inilecek en düşük seviye.
+MIN_WINDOW_LOG = {'zlib': 9, 'lzma': 12, 'brotli': 10, 'zstandard': 10}
+MIN_LEVEL = {'zlib': 1, 'lzma': 0, 'bz2': 1, 'brotli': 0, 'zstandard': 1}
+
+# Seçilen algoritma en küçük ayarlarıyla da sığmıyorsa sırayla denenen yedekler.
+MEMORY_FALLBACK = ('zstandard', 'zlib', 'stored')
+
+# Akış kipinde algoritmanın dışındaki tamponlar: G/Ç boru hattının okuma tamponları, okunan ve
+# yazılan parçalar ve filtrenin çerçeveleri.
+STREAM_BUFFER_MEMORY = PIPELINE_DEPTH * PIPELINE_BUFFER_SIZE + 2 * DEFAULT_CHUNK_SIZE + 2 * DEFAULT_FRAME_SIZE
+
+# Blok kipinde iş parçacığı başına bellekte bulunan blok sayısı: bekleyen en fazla iki blok
+# (bkz. block_container) ve sıkıştırılmış/açılmış çıktıları.
+BLOCK_BUFFERS_PER_WORKER = 4
+
+# Bir sıkıştırma akışına en az bu kadar bellek kalmalıdır; daha azında iş parçacığı sayısı,
+# o da yetmezse blok boyutu (en az MIN_BLOCK_SIZE) düşürülür.
+MIN_STREAM_MEMORY = 4 * 1024 * 1024
+MIN_BLOCK_SIZE = 64 * 1024
+
+def format_memory(size: int) -> str:
+    """Bayt sayısını MB olarak biçimlendirir (ör. '94.0 MB')."""
+    return f"{size / (1024 * 1024):.1f} MB"
+
+def _fits(compressor: Compressor, limit: int) -> bool:
+    # Dosya aynı sınırla açılabilmelidir: açma belleği de sınırı aşmamalıdır.
+    return max(compressor.compression_memory(), compressor.decompression_memory()) <= limit
+
+def _largest_window(compressor: Compressor, limit: int, low: int, high: int) -> Optional[int]:
+    """[low, high] aralığında sığan en büyük pencere; hiçbiri sığmıyorsa None. Sıkıştırıcının penceresini ayarlar."""
+    for window_log in range(high, low - 1, -1):
+        compressor.window_log = window_log
+        if _fits(compressor, limit):
+            return window_log
+    return None
+
+def fit_compressor(compressor: Compressor, limit: int, data_size: Optional[int] = None) -> Optional[Compressor]:
+    """
+    Sıkıştırıcının bir kopyasını, tahmini sıkıştırma ve açma belleği (bkz. Compressor.compression_memory)
+    'limit' bayta sığacak şekilde ayarlar. Sırasıyla: pencere veri boyutuna kırpılır (data_size
+    verilirse; oran kaybı olmaz), zstd iş parçacıkları azaltılır, pencere MEMORY_WINDOW_FLOOR'a kadar
+    küçültülür, seviye düşürülür, son olarak pencere algoritmanın en küçük değerine iner.
+    Pencereli algoritmalarda pencere açıkça ayarlanır; böylece başlığa yazılır ve açma belleği bilinir.
+    Algoritma en küçük ayarlarıyla da sığmıyorsa None döndürür. Belleği bilinmeyen algoritmalar
+    (ör. 'stored', harici algoritmalar) olduğu gibi döner.
+    """
+    fitted = copy.copy(compressor)
+    name = fitted.get_name()
+    window_log = fitted.effective_window_log()
+    # Sözlüklü zstd'de pencere ayarlanamaz; yalnızca seviye düşürülür.
+    has_window = window_log is not None and name in MIN_WINDOW_LOG and getattr(fitted, 'dict_id', None) is None
+    if has_window:
+        if data_size:
+            window_log = min(window_log, max(MIN_WINDOW_LOG[name], (data_size - 1).bit_length()))
+        fitted.window_log = window_log
+    if _fits(fitted, limit):
+        return fitted
+
+    threads = fitted._thread_count() if getattr(fitted, 'threads', 0) else 0
+    while threads > 1:
+        threads //= 2
+        fitted.threads = threads if threads > 1 else 0
+        if _fits(fitted, limit):
+            return fitted
+
+    levels = [fitted.level] if hasattr(fitted, 'level') else []
+    if levels and name in MIN_LEVEL:
+        levels += range(fitted.level - 1, MIN_LEVEL[name] - 1, -1)
+    for level in levels:
+        fitted.level = level
+        if not has_window:
+            if _fits(fitted, limit):
+                return fitted
+        elif _largest_window(fitted, limit, min(MEMORY_WINDOW_FLOOR, window_log), window_log) is not None:
+            return fitted
+    if has_window and levels and _largest_window(fitted, limit, MIN_WINDOW_LOG[name], window_log) is not None:
+        return fitted
+    return None
+
+def stream_budget(memory_limit: int) -> int:
+    """Akış kipinde algoritmaya kalan bellek: sınırdan tamponlar düşülür."""
+    budget = memory_limit - STREAM_BUFFER_MEMORY
+    if budget < MIN_STREAM_MEMORY:
+        raise ValueError(f"Bellek sınırı ({format_memory(memory_limit)}) çok düşük; akış kipinde en az "
+                         f"{format_memory(STREAM_BUFFER_MEMORY + MIN_STREAM_MEMORY)} gerekir.")
+    return budget
+
+def plan_blocks(memory_limit: int, block_size: int, workers: int) -> Tuple[int, int, int]:
+    """
+    Blok kipinde belleği iş parçacıklarına böler. Her iş parçacığına blok tamponlarından
+    (BLOCK_BUFFERS_PER_WORKER x block_size) sonra en az MIN_STREAM_MEMORY kalmalıdır; kalmıyorsa
+    iş parçacığı sayısı, tek iş parçacığında da kalmıyorsa blok boyutu düşürülür.
+
+    Returns:
+        Tuple[int, int, int]: (iş parçacığı başına algoritma bütçesi, blok boyutu, iş parçacığı sayısı)
+    """
+    workers = max(1, workers)
+    while workers > 1 and memory_limit // workers - BLOCK_BUFFERS_PER_WORKER * block_size < MIN_STREAM_MEMORY:
+        workers -= 1
+    while block_size > MIN_BLOCK_SIZE and memory_limit - BLOCK_BUFFERS_PER_WORKER * block_size < MIN_STREAM_MEMORY:
+        block_size = max(MIN_BLOCK_SIZE, block_size // 2)
+    budget = memory_limit // workers - BLOCK_BUFFERS_PER_WORKER * block_size
+    if budget < MIN_STREAM_MEMORY:
+        raise ValueError(f"Bellek sınırı ({format_memory(memory_limit)}) çok düşük; blok kipinde en az "
+                         f"{format_memory(BLOCK_BUFFERS_PER_WORKER * MIN_BLOCK_SIZE + MIN_STREAM_MEMORY)} gerekir.")
+    return budget, block_size, workers
+
+def memory_record(compressors: Iterable[Compressor]) -> Dict[str, Any]:
+    """
+    .comp başlığına yazılan bellek kaydı: kullanılan pencere ve bir açma akışının tahmini belleği.
+    Dosyada birden fazla sıkıştırıcı kullanılıyorsa (hedefli seviye ayarının merdiveni, uyarlamalı
+    blok kipi) en büyük pencere ve açma belleği yazılır. Değerler sıkıştırıcıların gerçekte
+    kullandığı ayarlardan hesaplanır; kaydın doğru olması için sıkıştırıcılar bellek sınırına
+    sığdırılmış (bkz. fit_compressor) olanlar olmalıdır.
+    """
+    windows = [compressor.effective_window_log() for compressor in compressors]
+    windows = [window_log for window_log in windows if window_log is not None]
+    return {'window_log': max(windows) if windows else None,
+            'decompression_bytes': max(compressor.decompression_memory() for compressor in compressors)}
+
+def plan_decompression(header: Dict[str, Any], compressor: Compressor, memory_limit: int,
+                       workers: int, container_blocks: bool) -> Tuple[int, int]:
+    """
+    Açmaya başlamadan önce gereken belleği başlıktan (bellek kaydı yoksa parametrelerden tahminle)
+    hesaplar. Blok kapsayıcıda iş parçacığı sayısı sınıra göre düşürülür; tek akış bile sığmıyorsa
+    ValueError fırlatır.
+
+    Returns:
+        Tuple[int, int]: (toplam tahmini açma belleği, iş parçacığı sayısı)
+    """
+    params = header['params']
+    record = params.get('memory') or memory_record([compressor])
+    per_stream = record['decompression_bytes']
+    if container_blocks:
+        per_stream += BLOCK_BUFFERS_PER_WORKER * params.get('block_size', 0)
+        workers = max(1, min(workers, memory_limit // max(per_stream, 1)))
+        required = per_stream * workers
+    else:
+        required = per_stream + STREAM_BUFFER_MEMORY
+        workers = 1
+    if required > memory_limit:
+        window = f", pencere 2^{record['window_log']}" if record.get('window_log') is not None else ""
+        raise ValueError(f"Dosyayı açmak için yaklaşık {format_memory(required)} bellek gerekir{window}; "
+                         f"bellek sınırı {format_memory(memory_limit)}.")
+    return required, workers
+
+if __name__ == "__main__":
+    from .codec_registry import default_registry
+
+    print("--- memory_budget.py Modül Testleri ---")
+
+    for limit in (1024 * 1024 * 1024, 64 * 1024 * 1024, 16 * 1024 * 1024, 2 * 1024 * 1024):
+        print(f"\nSınır: {format_memory(limit)}")
+        for name, params in [('lzma', {'level': 9}), ('lzma', {'level': 6}), ('brotli', {'level': 11, 'window_log': 24}),
+                             ('zstandard', {'level': 19, 'window_log': 27, 'threads': -1}), ('bz2', {'level': 9}),
+                             ('zlib', {'level': 9})]:
+            if name not in default_registry:
+                continue
+            original = default_registry[name].from_params(params)
+            fitted = fit_compressor(original, limit)
+            if fitted is None:
+                print(f"  {name:<10} {params} -> sığmıyor ({format_memory(original.compression_memory())})")
+                continue
+            print(f"  {name:<10} {original.get_params()} ({format_memory(original.compression_memory())}) -> "
+                  f"{fitted.get_params()} ({format_memory(fitted.compression_memory())}, "
+                  f"açma {format_memory(fitted.decompression_memory())})")
+
+    print("\nBlok kipi planı (256 MB, 4 MB blok, 16 iş parçacığı):", plan_blocks(256 * 1024 * 1024, 4 * 1024 * 1024, 16))
+    print("Blok kipi planı (8 MB, 4 MB blok, 4 iş parçacığı):", plan_blocks(8 * 1024 * 1024, 4 * 1024 * 1024, 4))
@@ -0,0 +1,72 @@
+# akilli_sikistirma/profiles.py
+
+from typing import Dict, List
+
+# Hız/oran profilleri: her algoritma için seviye, pencere ve iş parçacığı sayısı.
+#   level:      Algoritmanın sıkıştırma seviyesi (brotli'de quality, lzma'da preset).
+#   window_log: Pencere boyutunun 2 tabanında logaritması (zlib'de wbits, brotli'de lgwin,
+#               lzma'da sözlük boyutu, zstd'de window_log). Verilmezse kütüphane varsayılanı.
+#   threads:    Algoritmanın kendi çoklu iş parçacığı desteği; yalnızca zstd'de vardır.
+#               -1 tüm çekirdekleri kullanır. Blok kipinde bloklar zaten paralel sıkıştırıldığı
+#               için yok sayılır.
+# 'balanced' önceki sabit varsayılanlarla aynıdır.
+PROFILES: Dict[str, Dict[str, Dict[str, int]]] = {
+    'fast': {
+        'zlib': {'level': 1},
+        'lzma': {'level': 0},
+        'bz2': {'level': 1},
+        'brotli': {'level': 1},
+        'zstandard': {'level': 1, 'threads': -1}
+    },
+    'balanced': {
+        'zlib': {'level': 6},
+        'lzma': {'level': 6},
+        'bz2': {'level': 9},
+        'brotli': {'level': 8},
+        'zstandard': {'level': 3}
+    },
+    'max': {
+        'zlib': {'level': 9, 'window_log': 15},
+        'lzma': {'level': 9, 'window_log': 26},
+        'bz2': {'level': 9},
+        'brotli': {'level': 11, 'window_log': 24},
+        'zstandard': {'level': 19, 'window_log': 27, 'threads': -1}
+    }
+}
+PROFILE_NAMES = tuple(PROFILES)
+DEFAULT_PROFILE = 'balanced'
+
+# Profilde ayarlanabilen parametreler.
+PROFILE_PARAMS = ('level', 'window_log', 'threads')
+
+def codec_params(profile: str, codec_name: str, overrides: Dict[str, Dict[str, int]] = None) -> Dict[str, int]:
+    """
+    Profilin bir algoritma için parametrelerini, varsa o algoritmaya özel
+    geçersiz kılmalarla birleştirerek döndürür. Profilde olmayan algoritmalar
+    (ör. 'stored') için boş sözlük döner.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Bilinmeyen profil '{profile}'. Geçerli profiller: {', '.join(PROFILE_NAMES)}")
+    params = dict(PROFILES[profile].get(codec_name, {}))
+    params.update((overrides or {}).get(codec_name, {}))
+    return params
+
+def parse_codec_overrides(options: List[str]) -> Dict[str, Dict[str, int]]:
+    """
+    'algoritma.parametre=değer' biçimindeki geçersiz kılmaları ayrıştırır.
+    Örn: ['zstandard.level=12', 'zstandard.threads=4'] -> {'zstandard': {'level': 12, 'threads': 4}}
+    """
+    overrides: Dict[str, Dict[str, int]] = {}
+    for option in options or []:
+        try:
+            key, value = option.split("=", 1)
+            codec_name, param = key.split(".", 1)
+            value = int(value)
+        except ValueError:
+            raise ValueError(f"Geçersiz algoritma ayarı '{option}'. Beklenen biçim: algoritma.parametre=sayı (ör. zstandard.level=12)")
+        if codec_name not in PROFILES[DEFAULT_PROFILE]:
+            raise ValueError(f"Bilinmeyen algoritma '{codec_name}'. Geçerli algoritmalar: {', '.join(PROFILES[DEFAULT_PROFILE])}")
+        if param not in PROFILE_PARAMS:
+            raise ValueError(f"Bilinmeyen parametre '{param}'. Geçerli parametreler: {', '.join(PROFILE_PARAMS)}")
+        overrides.setdefault(codec_name, {})[param] = value
+    return overrides
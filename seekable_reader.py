@@ -0,0 +1,132 @@
+# akilli_sikistirma/seekable_reader.py
+
+import bisect
+import io
+import os
+
+from .block_container import read_block, read_index
+from .compressor_selector import CompressorSelector
+from .dictionary_store import DictionaryStore
+from .file_format import CODEC_IDS, CONTAINER_BLOCKS, read_header
+from .filters import filter_from_params
+
+class SeekableReader(io.RawIOBase):
+    """
+    Blok kapsayıcılı bir .comp dosyasını açılmış dosya gibi okumayı sağlar.
+    seek() ile istenen konuma gidilir; read() yalnızca ilgili blokları açar.
+    Böylece bir bayt aralığını okumanın maliyeti dosyanın değil aralığın boyutuyla orantılıdır.
+    Son açılan blok bellekte tutulur; ardışık küçük okumalar aynı bloğu tekrar açmaz.
+    Dosyanın algoritması başlıktaki parametrelerle (pencere, sözlük) yapılandırılır; başlıkta bir
+    filtre varsa her blok açıldıktan sonra filtresi çözülür.
+    """
+    def __init__(self, filepath: str, dictionary_store: DictionaryStore = None):
+        super().__init__()
+        self._f = open(filepath, 'rb')
+        try:
+            header = read_header(self._f)
+            if header is None or header['container'] != CONTAINER_BLOCKS:
+                raise ValueError("Rastgele erişim yalnızca blok kapsayıcılı (--blocks) .comp dosyalarında desteklenir.")
+            self._index = read_index(self._f)
+        except Exception:
+            self._f.close()
+            raise
+        self._raw_offsets = [entry[0] for entry in self._index]
+        self._size = header['original_size']
+        self._position = 0
+        self._compressors = {CODEC_IDS[header['codec']]: CompressorSelector(dictionary_store).compressor_from_header(
+            header['codec'], header['params'])}
+        self._filter = filter_from_params(header['params'].get('filter'))
+        self._cached_block = None
+        self._cached_data = b""
+
+    @property
+    def size(self) -> int:
+        """Orijinal (açılmış) verinin boyutu."""
+        return self._size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_SET:
+            position = offset
+        elif whence == os.SEEK_CUR:
+            position = self._position + offset
+        elif whence == os.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"Geçersiz whence değeri: {whence}")
+        if position < 0:
+            raise ValueError("Negatif konuma gidilemez.")
+        self._position = position
+        return position
+
+    def _block_data(self, block_number: int) -> bytes:
+        if self._cached_block != block_number:
+            self._cached_data = read_block(self._f, self._index[block_number], self._compressors, self._filter)
+            self._cached_block = block_number
+        return self._cached_data
+
+    def readinto(self, buffer) -> int:
+        if self._position >= self._size:
+            return 0
+        view = memoryview(buffer).cast("B")
+        written = 0
+        while written < len(view) and self._position < self._size:
+            block_number = bisect.bisect_right(self._raw_offsets, self._position) - 1
+            data = self._block_data(block_number)
+            start = self._position - self._raw_offsets[block_number]
+            count = min(len(data) - start, len(view) - written)
+            view[written:written + count] = data[start:start + count]
+            written += count
+            self._position += count
+        return written
+
+    def close(self):
+        if not self.closed:
+            self._f.close()
+            self._cached_data = b""
+        super().close()
+
+def read_range(filepath: str, offset: int, length: int) -> bytes:
+    """
+    Blok kapsayıcılı bir .comp dosyasından orijinal verinin [offset, offset + length)
+    aralığını döndürür. Yalnızca aralığı kapsayan bloklar okunup açılır.
+    Aralık dosya sonunu aşarsa dosya sonuna kadar olan kısım döner.
+    """
+    with SeekableReader(filepath) as reader:
+        reader.seek(offset)
+        buffer = bytearray(max(0, min(length, reader.size - offset)))
+        read = reader.readinto(buffer)
+        return bytes(buffer[:read])
+
+if __name__ == "__main__":
+    import time
+    from .block_container import compress_blocks
+    from .compressors import ZstandardCompressor
+    from .file_format import write_header, patch_header
+
+    print("--- seekable_reader.py Modül Testleri ---")
+
+    original_data = b"".join(f"{i:08d} log satiri: islem tamamlandi\n".encode() for i in range(500000))
+    test_path = "test_seekable.comp"
+    compressor = ZstandardCompressor()
+    with open(test_path, 'wb') as dst:
+        write_header(dst, compressor.get_name(), CONTAINER_BLOCKS, {"block_size": 256 * 1024})
+        compress_blocks(io.BytesIO(original_data), dst, compressor, block_size=256 * 1024)
+        patch_header(dst, 0, len(original_data), 0)
+
+    for offset, length in [(0, 100), (12345678, 5000), (len(original_data) - 50, 1000), (300000, 1024 * 1024)]:
+        start = time.perf_counter()
+        data = read_range(test_path, offset, length)
+        elapsed = time.perf_counter() - start
+        status = "BAŞARILI" if data == original_data[offset:offset + length] else "HATA"
+        print(f"  Aralık [{offset}, +{length}): {len(data)}B, {elapsed * 1000:.2f} ms - {status}")
+
+    os.remove(test_path)
@@ -0,0 +1,200 @@
+# akilli_sikistirma/utils.py
+
+import importlib
+import importlib.util
+import os
+import sys
+import zlib
+from typing import BinaryIO, Optional
+
+class _LazyModule:
+    """
+    Modülü ilk öznitelik erişiminde içe aktaran vekil. Yüklendikten sonra modülün öznitelikleri
+    vekile kopyalanır; sonraki erişimler normal öznitelik aramasıdır, ek maliyeti yoktur.
+    """
+    def __init__(self, name: str):
+        self._lazy_name = name
+
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self._lazy_name)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+    def __repr__(self) -> str:
+        return f"<tembel modül '{self._lazy_name}'>"
+
+def lazy_import(name: str) -> Optional[object]:
+    """
+    İsteğe bağlı bir modülü tembel olarak içe aktarır: modül kuruluysa ilk kullanımda yüklenecek
+    bir vekil, kurulu değilse None döner (bulunup bulunmadığı içe aktarmadan kontrol edilir).
+    Zaten yüklenmiş modüller doğrudan döner.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        spec = None
+    return _LazyModule(name) if spec is not None else None
+
+class PrefixedReader:
+    """
+    Önceden okunmuş bir önek (prefix) ile dosyanın geri kalanını tek bir
+    okunabilir akış gibi sunar. Analiz için okunan baytlar bu sayede
+    diskten tekrar okunmadan sıkıştırıcıya verilir.
+    """
+    def __init__(self, prefix: bytes, f: BinaryIO):
+        self._prefix = memoryview(prefix)
+        self._f = f
+
+    def read(self, size: int = -1) -> bytes:
+        if self._prefix:
+            if size is None or size < 0:
+                data = bytes(self._prefix) + self._f.read()
+                self._prefix = memoryview(b"")
+                return data
+            data = bytes(self._prefix[:size])
+            self._prefix = self._prefix[size:]
+            # Önek istenenden kısaysa kalan kısım dosyadan tamamlanır; böylece
+            # sabit boyutlu okumalar (ör. blok kipinde) önek sınırında bölünmez.
+            if len(data) < size:
+                data += self._f.read(size - len(data))
+            return data
+        return self._f.read(size)
+
+    def readinto(self, buffer) -> int:
+        """Önek bitene kadar önekten, sonra doğrudan dosyadan tampona okur (ara kopya yok)."""
+        view = memoryview(buffer).cast('B')
+        if self._prefix:
+            count = min(len(view), len(self._prefix))
+            view[:count] = self._prefix[:count]
+            self._prefix = self._prefix[count:]
+            if count < len(view):
+                count += _readinto(self._f, view[count:])
+            return count
+        return _readinto(self._f, view)
+
+def _readinto(f: BinaryIO, view: memoryview) -> int:
+    """Tamponu dolana veya dosya bitene kadar okur; readinto yoksa read ile okur."""
+    readinto = getattr(f, 'readinto', None)
+    total = 0
+    while total < len(view):
+        if readinto is not None:
+            count = readinto(view[total:])
+        else:
+            data = f.read(len(view) - total)
+            count = len(data)
+            view[total:total + count] = data
+        if not count:
+            break
+        total += count
+    return total
+
+# Tek bir writev çağrısındaki en fazla parça sayısı (sistemden okunamazsa POSIX alt sınırı).
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 16
+
+def write_vectored(f: BinaryIO, pieces: list) -> int:
+    """
+    Parçaları tek bir vektörel yazmayla (os.writev) yazar ve yazılan bayt sayısını döndürür.
+    Gerçek bir dosya değilse veya platform desteklemiyorsa parçalar sırayla yazılır.
+    """
+    total = sum(len(piece) for piece in pieces)
+    fd = None
+    if len(pieces) > 1 and hasattr(os, 'writev'):
+        try:
+            fd = f.fileno()
+        except (AttributeError, OSError, ValueError):
+            fd = None
+    if fd is None:
+        for piece in pieces:
+            f.write(piece)
+        return total
+
+    # Tamponlu dosyanın bekleyen verisi önce yazılır; sonra dosya konumu işletim sistemininkiyle eşitlenir.
+    f.flush()
+    views = [memoryview(piece).cast('B') for piece in pieces if len(piece)]
+    while views:
+        written = os.writev(fd, views[:_IOV_MAX])
+        while views and written >= len(views[0]):
+            written -= len(views[0])
+            views.pop(0)
+        if views and written:
+            views[0] = views[0][written:]
+    f.seek(os.lseek(fd, 0, os.SEEK_CUR))
+    return total
+
+_SIZE_SUFFIXES = {'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+
+def parse_size(text: str) -> int:
+    """
+    '4M', '512k', '1G' veya '65536' gibi boyut ifadelerini bayta çevirir.
+    argparse 'type' parametresi olarak kullanılabilir.
+    """
+    text = text.strip().lower().rstrip('b')
+    multiplier = 1
+    if text and text[-1] in _SIZE_SUFFIXES:
+        multiplier = _SIZE_SUFFIXES[text[-1]]
+        text = text[:-1]
+    try:
+        size = int(float(text) * multiplier)
+    except ValueError:
+        raise ValueError(f"Geçersiz boyut ifadesi: '{text}'")
+    if size <= 0:
+        raise ValueError(f"Boyut pozitif olmalıdır: '{text}'")
+    return size
+
+class ChecksumReader:
+    """Okunan baytların sayısını ve CRC32 sağlamasını tutan okuma sarmalayıcısı."""
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self.bytes_read = 0
+        self.crc = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        self.bytes_read += len(data)
+        self.crc = zlib.crc32(data, self.crc)
+        return data
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast('B')
+        count = _readinto(self._f, view)
+        self.bytes_read += count
+        self.crc = zlib.crc32(view[:count], self.crc)
+        return count
+
+class ChecksumWriter:
+    """Yazılan baytların sayısını ve CRC32 sağlamasını tutan yazma sarmalayıcısı."""
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self.bytes_written = 0
+        self.crc = 0
+
+    def write(self, data: bytes) -> int:
+        self.bytes_written += len(data)
+        self.crc = zlib.crc32(data, self.crc)
+        return self._f.write(data)
+
+    def writev(self, pieces: list) -> int:
+        """Parçaların sağlamasını günceller ve hepsini tek bir vektörel yazmayla yazar (bkz. write_vectored)."""
+        for piece in pieces:
+            self.bytes_written += len(piece)
+            self.crc = zlib.crc32(piece, self.crc)
+        writev = getattr(self._f, 'writev', None)
+        return writev(pieces) if writev is not None else write_vectored(self._f, pieces)
+
+def preallocate(f: BinaryIO, size: int):
+    """
+    Çıktı dosyası için diskte 'size' bayt yeri tek seferde ayırır.
+    Desteklenmeyen platform veya dosya sistemlerinde sessizce atlanır.
+    """
+    if size <= 0 or not hasattr(os, 'posix_fallocate'):
+        return
+    try:
+        os.posix_fallocate(f.fileno(), 0, size)
+    except OSError:
+        pass